@@ -0,0 +1,78 @@
+"""
+In-process fake of the Runway API for benchmarks
+Served through httpx.MockTransport, so no sockets are opened and no credits are spent.
+Unlike the time-based simulator in runway_mcp_server.simulator, tasks finish after a fixed
+number of polls, which keeps the work per operation identical from run to run
+"""
+
+import json
+import random
+import asyncio
+import itertools
+from typing import Dict, Any
+
+import httpx
+
+from runway_mcp_server.simulator import CREATE_ENDPOINTS
+
+
+class FakeRunwayAPI:
+    """
+    Minimal Runway API: creates tasks and reports them SUCCEEDED after a set number of polls.
+
+    `latency` seconds (plus up to `jitter` more) are slept before every response,
+    standing in for the network round trip and Runway's own processing time.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, polls_to_finish: int = 1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.polls_to_finish = polls_to_finish
+        self.requests = 0
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._rng = random.Random(seed)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client whose requests are answered by this fake"""
+        return httpx.AsyncClient(transport=self.transport(), base_url="https://fake.runway")
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        path = request.url.path.removeprefix("/v1")
+        if request.method == "POST" and path in CREATE_ENDPOINTS:
+            task_id = f"task-{next(self._ids)}"
+            self._tasks[task_id] = {"id": task_id, "polls": 0, "body": json.loads(request.content or b"{}")}
+            return httpx.Response(200, json={"id": task_id})
+
+        if path.startswith("/tasks/"):
+            task_id = path.split("/")[2]
+            task = self._tasks.get(task_id)
+            if task is None:
+                return httpx.Response(404, json={"error": "Task not found"})
+            if request.method in ("DELETE", "POST"):
+                task["cancelled"] = True
+                return httpx.Response(204)
+            task["polls"] += 1
+            if task.get("cancelled"):
+                return httpx.Response(200, json={"id": task_id, "status": "CANCELLED"})
+            if task["polls"] >= self.polls_to_finish:
+                return httpx.Response(200, json={
+                    "id": task_id,
+                    "status": "SUCCEEDED",
+                    "output": [f"https://fake.runway/outputs/{task_id}.mp4"],
+                })
+            return httpx.Response(200, json={
+                "id": task_id,
+                "status": "RUNNING",
+                "progress": round(task["polls"] / self.polls_to_finish, 3),
+            })
+
+        return httpx.Response(404, json={"error": f"Unknown endpoint {request.method} {path}"})
@@ -0,0 +1,274 @@
+"""
+Microbenchmarks for RunwayAPIClient and the MCP tool functions
+Runs every scenario against the in-process fake API at several concurrency levels and
+compares throughput and tail latency with the saved baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py                 # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --save          # run and overwrite the baseline
+    python benchmarks/run_benchmarks.py --quick         # fewer operations, for a smoke run
+    python benchmarks/run_benchmarks.py --latency 0.02  # inject 20 ms per API request
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import tracemalloc
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+
+# Benchmark the working tree, not an installed copy
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "src"))
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("RUNWAY_TASK_STORE", "off")
+os.environ.setdefault("RUNWAY_RESULT_CACHE", "false")
+
+from runway_mcp_server import server  # noqa: E402
+from runway_mcp_server.ratelimit import RateLimiter  # noqa: E402
+from runway_mcp_server.scheduler import Scheduler  # noqa: E402
+from fake_api import FakeRunwayAPI  # noqa: E402
+
+# httpx logs every request at INFO, which would dominate the timings
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+BASELINE_PATH = ROOT / "baseline.json"
+CONCURRENCY_LEVELS = (1, 10, 100, 1000)
+
+# A result counts as a regression when it is this much worse than the baseline
+DEFAULT_TOLERANCE = 0.25
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(math.ceil(q * len(sorted_values)), 1) - 1]
+
+
+def make_client(api: FakeRunwayAPI) -> server.RunwayAPIClient:
+    """Client wired to the fake API, with limits high enough that they never throttle or queue"""
+    client = server.RunwayAPIClient("bench-key", http_client=api.client())
+    client.rate_limiter = RateLimiter(1e9, 1e9, 1e9, 1e9)
+    client.scheduler = Scheduler({}, default_limit=10 ** 9)
+    return client
+
+
+class Scenario:
+    """A client plus the operation to time; `op(i)` runs operation number i"""
+
+    def __init__(self, client: server.RunwayAPIClient, op: Callable[[int], Awaitable[Any]]):
+        self.client = client
+        self.op = op
+
+
+async def scenario_request(api: FakeRunwayAPI) -> Scenario:
+    """One GET /tasks/{id} through _request: rate limiter, retries, metrics, tracing hooks"""
+    client = make_client(api)
+    api.polls_to_finish = 10 ** 9
+    task = await client.create_task("/text_to_video", {"promptText": "setup"})
+
+    async def op(i: int) -> Any:
+        return await client.get_task(task["id"])
+
+    return Scenario(client, op)
+
+
+async def scenario_wait(api: FakeRunwayAPI) -> Scenario:
+    """create_task followed by wait_for_task, with three polls per task on the shared poller"""
+    client = make_client(api)
+    api.polls_to_finish = 3
+
+    async def op(i: int) -> Any:
+        task = await client.create_task("/text_to_video", {"promptText": f"prompt {i}"})
+        return await client.wait_for_task(task["id"], poll_interval=0.001)
+
+    return Scenario(client, op)
+
+
+async def scenario_tool(api: FakeRunwayAPI) -> Scenario:
+    """The full generate_video_text_to_video tool, including argument handling and JSON output"""
+    client = make_client(api)
+    api.polls_to_finish = 1
+    server.RUNWAY_API_KEY = "bench-key"
+    server._shared_client = client
+
+    async def op(i: int) -> Any:
+        result = json.loads(await server.generate_video_text_to_video(f"prompt {i}"))
+        if result.get("status") != "success":
+            raise RuntimeError(result.get("error", "tool failed"))
+        return result
+
+    return Scenario(client, op)
+
+
+SCENARIOS: Dict[str, Callable[[FakeRunwayAPI], Awaitable[Scenario]]] = {
+    "request": scenario_request,
+    "wait_for_task": scenario_wait,
+    "tool": scenario_tool,
+}
+
+
+async def run_level(
+    build: Callable[[FakeRunwayAPI], Awaitable[Scenario]],
+    concurrency: int,
+    operations: int,
+    latency: float,
+    jitter: float,
+    trace_allocations: bool
+) -> Dict[str, Any]:
+    """Run `operations` ops with at most `concurrency` in flight and summarise them"""
+    api = FakeRunwayAPI(latency=latency, jitter=jitter)
+    # The tool scenario installs its client as the server's shared client
+    original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+    scenario = await build(api)
+    client, op = scenario.client, scenario.op
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await op(i)
+            latencies.append(time.perf_counter() - started)
+
+    if trace_allocations:
+        tracemalloc.start()
+    requests_before = api.requests
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(timed(i) for i in range(operations)))
+        wall = time.perf_counter() - started
+        if trace_allocations:
+            _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+        await client.aclose()
+        await client.http.aclose()
+        server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+
+    latencies.sort()
+    result = {
+        "operations": operations,
+        "throughput_per_s": round(operations / wall, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "requests_per_op": round((api.requests - requests_before) / operations, 2),
+    }
+    if trace_allocations:
+        result["peak_alloc_kb"] = round(peak / 1024, 1)
+        result["alloc_kb_per_op"] = round(peak / 1024 / operations, 2)
+    return result
+
+
+def run_all(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name in args.scenarios:
+        results[name] = {}
+        for concurrency in args.concurrency:
+            operations = max(concurrency * args.rounds, args.min_ops)
+            timing = asyncio.run(run_level(
+                SCENARIOS[name], concurrency, operations, args.latency, args.jitter, trace_allocations=False
+            ))
+            # Allocations are measured in a separate pass: tracemalloc slows everything down
+            allocations = asyncio.run(run_level(
+                SCENARIOS[name], concurrency, operations, args.latency, args.jitter, trace_allocations=True
+            ))
+            timing["peak_alloc_kb"] = allocations["peak_alloc_kb"]
+            timing["alloc_kb_per_op"] = allocations["alloc_kb_per_op"]
+            results[name][str(concurrency)] = timing
+            print(
+                f"{name:>14} c={concurrency:<5} {timing['throughput_per_s']:>10.1f} ops/s  "
+                f"p50 {timing['p50_ms']:>9.3f} ms  p99 {timing['p99_ms']:>9.3f} ms  "
+                f"{timing['alloc_kb_per_op']:>7.2f} KB/op  {timing['requests_per_op']:.2f} req/op"
+            )
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of throughput or p99 latency beyond `tolerance`, as readable lines"""
+    regressions = []
+    for name, levels in results.items():
+        for concurrency, current in levels.items():
+            previous = baseline.get("results", {}).get(name, {}).get(concurrency)
+            if previous is None:
+                continue
+            if current["throughput_per_s"] < previous["throughput_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"{name} c={concurrency}: throughput {current['throughput_per_s']} ops/s "
+                    f"vs baseline {previous['throughput_per_s']}"
+                )
+            if current["p99_ms"] > previous["p99_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name} c={concurrency}: p99 {current['p99_ms']} ms vs baseline {previous['p99_ms']}"
+                )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark RunwayAPIClient against an in-process fake API")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(CONCURRENCY_LEVELS))
+    parser.add_argument("--rounds", type=int, default=3, help="Operations per level = concurrency x rounds")
+    parser.add_argument("--min-ops", type=int, default=200, help="Lower bound on operations per level")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds slept before every fake API response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency of up to this many seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--quick", action="store_true", help="Small smoke run (concurrency 1 and 10, 20 ops)")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.concurrency = [c for c in args.concurrency if c <= 10]
+        args.rounds, args.min_ops = 2, 20
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run_all(args)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if args.quick:
+        print("\nQuick runs are too short to compare with the baseline")
+        return 0
+
+    if not args.baseline.exists():
+        print("\nNo baseline yet; run with --save to create one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if (baseline.get("latency"), baseline.get("jitter")) != (args.latency, args.jitter):
+        print("\nBaseline was recorded with different latency settings; skipping comparison")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Cold-start benchmark for the Runway MCP server
+Measures, in fresh interpreters, how long it takes to import the package, import the
+server module and answer the first tools/list over stdio, and fails when a budget is exceeded
+
+Usage:
+    python benchmarks/startup.py             # 5 runs per measurement, default budgets
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --budget first_tool_list=2000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Optional
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Median milliseconds each measurement may take before the run fails
+DEFAULT_BUDGETS_MS: Dict[str, float] = {
+    "package_import": 50,
+    "server_import": 1500,
+    "first_tool_list": 3000,
+}
+
+IMPORT_TIMER = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - started) * 1000)"
+)
+
+# initialize, initialized and tools/list, as an MCP client sends them over stdio
+HANDSHAKE = [
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+        },
+    },
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    # Measure the server itself, not the persistent task store or an installed copy
+    env.setdefault("RUNWAY_TASK_STORE", "off")
+    return env
+
+
+def time_import(module: str) -> float:
+    """Milliseconds to import `module` in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_TIMER.format(module=module)],
+        env=child_env(), capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_first_tool_list() -> float:
+    """Milliseconds from spawning the server to receiving its tool list"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from runway_mcp_server.server import main; main()"],
+        env=child_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        for message in HANDSHAKE:
+            process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+        for line in process.stdout:
+            response = json.loads(line)
+            if response.get("id") == 2:
+                elapsed = (time.perf_counter() - started) * 1000
+                if not response.get("result", {}).get("tools"):
+                    raise RuntimeError(f"tools/list returned no tools: {response}")
+                return elapsed
+        raise RuntimeError("Server exited before answering tools/list")
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+MEASUREMENTS = {
+    "package_import": lambda: time_import("runway_mcp_server"),
+    "server_import": lambda: time_import("runway_mcp_server.server"),
+    "first_tool_list": time_first_tool_list,
+}
+
+
+def measure(runs: int, names: List[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names:
+        samples = [MEASUREMENTS[name]() for _ in range(runs)]
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+            "max_ms": round(max(samples), 1),
+        }
+    return results
+
+
+def over_budget(results: Dict[str, Dict[str, float]], budgets: Dict[str, float]) -> List[str]:
+    """Measurements whose median exceeds their budget, as readable lines"""
+    return [
+        f"{name}: median {result['median_ms']} ms > budget {budgets[name]} ms"
+        for name, result in results.items()
+        if name in budgets and result["median_ms"] > budgets[name]
+    ]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure Runway MCP server cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(MEASUREMENTS), default=list(MEASUREMENTS))
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="NAME=MS",
+        help="Override a budget, e.g. first_tool_list=2000"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for override in args.budget:
+        name, _, value = override.partition("=")
+        budgets[name] = float(value)
+
+    results = measure(args.runs, args.only)
+    for name, result in results.items():
+        print(
+            f"{name:>16}  median {result['median_ms']:>8.1f} ms  "
+            f"min {result['min_ms']:>8.1f}  max {result['max_ms']:>8.1f}  budget {budgets.get(name, '-')}"
+        )
+
+    failures = over_budget(results, budgets)
+    if failures:
+        print("\nStartup budget exceeded:")
+        for line in failures:
+            print(f"  - {line}")
+        return 1
+    print("\nAll startup measurements within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
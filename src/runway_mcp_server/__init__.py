@@ -8,9 +8,15 @@ __version__ = "0.1.0"
 __author__ = "Sid"
 __description__ = "MCP server for Runway ML video generation with Gen-4, Veo, and Aleph support"
 
-# Import the main server components so they can be accessed as:
+# The main server components can be accessed as:
 # from runway_mcp_server import mcp, main
-from .server import mcp, main
+# They are loaded on first access, so importing the package (e.g. for __version__)
+# does not pay for importing the MCP SDK and building every tool schema
+def __getattr__(name):
+    if name in ("mcp", "main"):
+        from . import server
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # This tells Python what to export when someone does: from runway_mcp_server import *
 __all__ = ["mcp", "main", "__version__"]
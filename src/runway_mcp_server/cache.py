@@ -0,0 +1,128 @@
+"""
+Deterministic result cache for seeded generation requests
+A request with an explicit seed is reproducible, so its finished task can be reused
+"""
+
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+
+def request_key(endpoint: str, data: Dict[str, Any]) -> str:
+    """Canonical hash of a request payload (key order and whitespace do not matter)"""
+    canonical = json.dumps({"endpoint": endpoint, "data": data}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of finished tasks with a TTL and an optional on-disk tier.
+
+    The TTL should stay below the lifetime of Runway's signed output URLs,
+    otherwise a hit could hand back a link that no longer works. With
+    `directory` set, entries are also written there as small JSON files so
+    they survive a restart; memory misses fall back to disk. Both tiers hold
+    at most `max_entries`: each write drops expired files and then the oldest.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 82800, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, endpoint: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached task for this exact request, or None"""
+        key = request_key(endpoint, data)
+        entry = self._entries.get(key) or self._read_disk(key)
+
+        if entry is None or time.time() - entry[0] > self.ttl:
+            self._evict(key)
+            self.misses += 1
+            return None
+
+        self._store(key, entry)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, endpoint: str, data: Dict[str, Any], task: Dict[str, Any]) -> None:
+        """Remember a finished task for this request"""
+        key = request_key(endpoint, data)
+        entry = (time.time(), task)
+        self._store(key, entry)
+        self._write_disk(key, entry)
+        self._prune_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _store(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        """Insert into the memory tier as most recently used, trimming it to max_entries"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "r") as f:
+                stored = json.load(f)
+            return stored["stored_at"], stored["task"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        if not self.directory:
+            return
+        # Write to a temp file first so a crash never leaves a half-written entry
+        tmp_path = self._path(key) + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"stored_at": entry[0], "task": entry[1]}, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            pass
+
+    def _prune_disk(self) -> None:
+        if not self.directory:
+            return
+        # File mtimes match stored_at, so they order entries without reading them
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        files.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            return
+        files.sort()
+        expired_before = time.time() - self.ttl
+        excess = len(files) - self.max_entries
+        for index, (modified, path) in enumerate(files):
+            if index >= excess and modified >= expired_before:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
@@ -0,0 +1,318 @@
+"""
+Model capability registry for the Runway API
+One machine-readable description of what each model accepts, used both to answer
+list_available_models and to reject invalid requests locally before they are submitted
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+
+@dataclass(frozen=True)
+class ModelCapabilities:
+    """What one model accepts; an empty `ratios` or `durations` means the field is not sent"""
+
+    category: str
+    description: str
+    endpoints: Tuple[str, ...]
+    ratios: Tuple[str, ...] = ()
+    durations: Tuple[int, ...] = ()
+    max_reference_images: int = 0
+    # Scheduler lane (concurrency limit) the model's tasks run in
+    lane: str = "default"
+    features: Tuple[str, ...] = ()
+    use_cases: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "description": self.description,
+            "endpoints": list(self.endpoints),
+            "ratios": list(self.ratios),
+            "durations": list(self.durations),
+            "lane": self.lane,
+            "features": list(self.features),
+            "use_cases": list(self.use_cases),
+        }
+
+
+VIDEO_RATIOS = ("1280:720", "720:1280", "1104:832", "832:1104", "960:960", "1584:672")
+VEO_RATIOS = ("1280:720", "720:1280", "1920:1080", "1080:1920")
+IMAGE_RATIOS = (
+    "1920:1080", "1080:1920", "1024:1024", "1360:768", "1080:1080", "1168:880", "1440:1080",
+    "1080:1440", "1808:768", "2112:912", "1280:720", "720:1280", "720:720", "960:720", "720:960", "1680:720",
+)
+
+MODELS: Dict[str, ModelCapabilities] = {
+    "gen4_image": ModelCapabilities(
+        category="image_generation",
+        description="Gen-4 Image - Highest quality image generation",
+        endpoints=("/images",),
+        ratios=IMAGE_RATIOS,
+        max_reference_images=3,
+        lane="gen4",
+        features=("Reference images", "Tag-based composition", "1920:1080 resolution"),
+        use_cases=("Consistent characters", "Styled imagery", "High-fidelity art"),
+    ),
+    "gen4_image_turbo": ModelCapabilities(
+        category="image_generation",
+        description="Gen-4 Image Turbo - Faster image generation",
+        endpoints=("/images",),
+        ratios=IMAGE_RATIOS,
+        max_reference_images=3,
+        lane="gen4",
+        features=("Quick generation", "Multiple ratios", "Cost-efficient"),
+        use_cases=("Rapid prototyping", "Batch generation", "Iterations"),
+    ),
+    "gen4_turbo": ModelCapabilities(
+        category="video_generation",
+        description="Gen-4 Turbo - Fastest and most efficient video model",
+        endpoints=("/image_to_video",),
+        ratios=VIDEO_RATIOS,
+        durations=tuple(range(2, 11)),
+        lane="gen4",
+        features=("2-10s duration", "Multiple ratios", "High consistency"),
+        use_cases=("Quick video creation", "Image-to-video"),
+    ),
+    "gen3a_turbo": ModelCapabilities(
+        category="video_generation",
+        description="Gen-3 Alpha Turbo - Fast Gen-3 variant",
+        endpoints=("/image_to_video", "/first_last_frame_to_video", "/video_to_video", "/extend_video"),
+        ratios=VIDEO_RATIOS + ("1280:768", "768:1280"),
+        durations=(5, 10),
+        lane="gen4",
+        features=("5 or 10s clips", "First/last frame control", "Video-to-video", "Extend video"),
+        use_cases=("Style transfer", "Extended videos", "Quick iterations"),
+    ),
+    "gen3_alpha": ModelCapabilities(
+        category="video_generation",
+        description="Gen-3 Alpha - Highest quality Gen-3",
+        endpoints=("/video_to_video",),
+        durations=(5, 10),
+        lane="gen4",
+        features=("Superior fidelity", "Expressive characters", "Complex scenes"),
+        use_cases=("Premium content", "Character animation", "Cinematic shots"),
+    ),
+    "veo3.1": ModelCapabilities(
+        category="video_generation",
+        description="Veo 3.1 - High quality cinematic video from text or images",
+        endpoints=("/text_to_video", "/image_to_video", "/first_last_frame_to_video"),
+        ratios=VEO_RATIOS,
+        durations=(4, 6, 8),
+        lane="veo",
+        features=("4, 6 or 8s duration", "Text-to-video", "Image-to-video"),
+        use_cases=("Cinematic shots", "Realistic motion", "Text-to-video"),
+    ),
+    "veo3.1_fast": ModelCapabilities(
+        category="video_generation",
+        description="Veo 3.1 Fast - Faster Veo generation with good quality",
+        endpoints=("/text_to_video", "/image_to_video", "/first_last_frame_to_video"),
+        ratios=VEO_RATIOS,
+        durations=(4, 6, 8),
+        lane="veo",
+        features=("4, 6 or 8s duration", "Quick generation"),
+        use_cases=("Drafts", "Quick iterations"),
+    ),
+    "veo3": ModelCapabilities(
+        category="video_generation",
+        description="Veo 3 - Standard quality Veo generation",
+        endpoints=("/text_to_video", "/image_to_video"),
+        ratios=VEO_RATIOS,
+        durations=(4, 6, 8),
+        lane="veo",
+        features=("4, 6 or 8s duration", "Text-to-video", "Image-to-video"),
+        use_cases=("General video generation",),
+    ),
+    "gen4_aleph": ModelCapabilities(
+        category="video_editing",
+        description="⭐ Aleph - Advanced video-to-video editing (Gen-4)",
+        endpoints=("/video_to_video",),
+        ratios=VIDEO_RATIOS + ("848:480", "640:480"),
+        max_reference_images=1,
+        lane="aleph",
+        features=(
+            "Add/remove/replace objects",
+            "Generate new camera angles",
+            "Transform lighting and style",
+            "Shot continuation",
+            "Novel view synthesis",
+        ),
+        use_cases=(
+            "Professional video editing",
+            "Object manipulation",
+            "Scene transformation",
+            "Creative restyles",
+        ),
+    ),
+    "upscale_v1": ModelCapabilities(
+        category="upscaling",
+        description="Upscale v1 - 4K upscaling of generated videos",
+        endpoints=("/upscale",),
+        lane="upscale",
+        features=("4K output", "Enhanced detail"),
+        use_cases=("Production-ready deliverables",),
+    ),
+}
+
+# Endpoints whose requests do not name a model are validated against this one
+ENDPOINT_DEFAULT_MODELS = {
+    "/extend_video": "gen3a_turbo",
+    "/upscale": "upscale_v1",
+}
+
+SPECIAL_FEATURES = {
+    "extend_video": "Extend videos by 5-10 seconds (Gen-3)",
+    "upscale_4k": "Upscale to 4K resolution",
+    "first_last_frame": "Precise control with start/end frames",
+    "keyframe_control": "Image as first or last frame",
+    "reference_images": "Consistent characters with @tags",
+}
+
+# Fields every request to an endpoint must carry; also the set of endpoints that are validated
+REQUIRED_FIELDS = {
+    "/images": ("promptText",),
+    "/text_to_video": ("promptText",),
+    "/image_to_video": ("promptImage",),
+    "/first_last_frame_to_video": ("firstFrame", "lastFrame"),
+    "/video_to_video": (),
+    "/extend_video": ("promptVideo",),
+    "/upscale": ("promptVideo",),
+}
+
+MAX_PROMPT_LENGTH = 1000
+MAX_SEED = 4294967295
+
+# Largest base64 data URI Runway accepts inline, by media kind (bytes of URI text)
+DATA_URI_LIMITS = {"image": 5 * 1024 * 1024, "video": 16 * 1024 * 1024}
+MEDIA_FIELDS = {
+    "promptImage": "image",
+    "firstFrame": "image",
+    "lastFrame": "image",
+    "promptVideo": "video",
+    "videoUri": "video",
+}
+
+
+class RequestValidationError(ValueError):
+    """A request the Runway API would reject, found before it was sent"""
+
+    def __init__(self, endpoint: str, problems: List[str]):
+        self.endpoint = endpoint
+        self.problems = problems
+        super().__init__(f"Invalid request for {endpoint}: " + "; ".join(problems))
+
+
+def lane_for(endpoint: str, model: Optional[str] = None) -> str:
+    """Scheduler lane for a request; Gen-3 models share the gen4 lane"""
+    capabilities = MODELS.get(model or ENDPOINT_DEFAULT_MODELS.get(endpoint, ""))
+    return capabilities.lane if capabilities is not None else "default"
+
+
+def models_for(endpoint: str) -> Tuple[str, ...]:
+    """Models available on an endpoint, in registry order"""
+    return tuple(name for name, capabilities in MODELS.items() if endpoint in capabilities.endpoints)
+
+
+def ratios_for(endpoint: str) -> Tuple[str, ...]:
+    """Every ratio some model on an endpoint supports; validate_request checks the chosen model"""
+    return tuple(dict.fromkeys(ratio for model in models_for(endpoint) for ratio in MODELS[model].ratios))
+
+
+def durations_for(endpoint: str) -> Tuple[int, ...]:
+    """Every duration some model on an endpoint supports"""
+    return tuple(sorted({duration for model in models_for(endpoint) for duration in MODELS[model].durations}))
+
+
+def list_models() -> Dict[str, Any]:
+    """The registry grouped by category, as list_available_models returns it"""
+    grouped: Dict[str, Any] = {}
+    for name, capabilities in MODELS.items():
+        grouped.setdefault(capabilities.category, {})[name] = capabilities.to_dict()
+    grouped["special_features"] = dict(SPECIAL_FEATURES)
+    return grouped
+
+
+def validate_request(endpoint: str, data: Dict[str, Any]) -> None:
+    """
+    Check a request body against the registry and raise RequestValidationError
+    listing every problem found. Endpoints the registry does not know are let through.
+    """
+    if endpoint not in REQUIRED_FIELDS:
+        return
+    problems: List[str] = []
+
+    for key in REQUIRED_FIELDS.get(endpoint, ()):
+        if not data.get(key):
+            problems.append(f"{key} is required")
+
+    model = data.get("model") or ENDPOINT_DEFAULT_MODELS.get(endpoint)
+    capabilities = MODELS.get(model) if model else None
+    if model and capabilities is None:
+        problems.append(f"unknown model {model!r}")
+    elif capabilities is not None:
+        if endpoint not in capabilities.endpoints:
+            supported = ", ".join(m for m, c in MODELS.items() if endpoint in c.endpoints)
+            problems.append(f"model {model!r} is not available on {endpoint} (use one of: {supported})")
+        ratio = data.get("ratio")
+        if ratio is not None and capabilities.ratios and ratio not in capabilities.ratios:
+            problems.append(f"ratio {ratio!r} is not supported by {model} (use one of: {', '.join(capabilities.ratios)})")
+        duration = data.get("duration")
+        if duration is not None and capabilities.durations and duration not in capabilities.durations:
+            problems.append(f"duration {duration!r} is not supported by {model} (use one of: {_describe(capabilities.durations)})")
+        references = data.get("referenceImages") or data.get("references") or []
+        if len(references) > capabilities.max_reference_images:
+            problems.append(f"{model} accepts at most {capabilities.max_reference_images} reference images, got {len(references)}")
+
+    prompt = data.get("promptText")
+    if prompt is not None and len(prompt) > MAX_PROMPT_LENGTH:
+        problems.append(f"promptText is {len(prompt)} characters (maximum {MAX_PROMPT_LENGTH})")
+    seed = data.get("seed")
+    if seed is not None and not (isinstance(seed, int) and 0 <= seed <= MAX_SEED):
+        problems.append(f"seed must be an integer between 0 and {MAX_SEED}")
+
+    for key, uri, kind in _media(data):
+        if uri.startswith("data:") and len(uri) > DATA_URI_LIMITS[kind]:
+            problems.append(
+                f"{key} data URI is {len(uri) / 1048576:.1f} MB, over the {DATA_URI_LIMITS[kind] // 1048576} MB "
+                f"limit for inline {kind}s; pass a URL or local file path instead"
+            )
+
+    if problems:
+        raise RequestValidationError(endpoint, problems)
+
+
+def _media(data: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(field, uri, kind) for every media URI in a request body"""
+    found = []
+    for key, kind in MEDIA_FIELDS.items():
+        value = data.get(key)
+        if isinstance(value, str):
+            found.append((key, value, kind))
+        elif isinstance(value, list):
+            found.extend((key, item["uri"], kind) for item in value if isinstance(item, dict) and isinstance(item.get("uri"), str))
+    for key in ("referenceImages", "references"):
+        for item in data.get(key) or []:
+            if isinstance(item, dict) and isinstance(item.get("uri"), str):
+                found.append((key, item["uri"], "image"))
+    return found
+
+
+def map_media(data: Dict[str, Any], replace: Callable[[str], str]) -> Dict[str, Any]:
+    """Copy of a request body with `replace` applied to every media URI in it"""
+    mapped = dict(data)
+    for key in (*MEDIA_FIELDS, "referenceImages", "references"):
+        value = data.get(key)
+        if isinstance(value, str):
+            mapped[key] = replace(value)
+        elif isinstance(value, list):
+            mapped[key] = [
+                dict(item, uri=replace(item["uri"])) if isinstance(item, dict) and isinstance(item.get("uri"), str) else item
+                for item in value
+            ]
+    return mapped
+
+
+def _describe(durations: Tuple[int, ...]) -> str:
+    """Contiguous ranges read better as "2-10" than as nine numbers"""
+    if len(durations) > 3 and list(durations) == list(range(durations[0], durations[-1] + 1)):
+        return f"{durations[0]}-{durations[-1]}"
+    return ", ".join(str(d) for d in durations)
@@ -0,0 +1,178 @@
+"""
+Parallel, resumable downloads of generated outputs
+Large files are fetched as HTTP range chunks in parallel and streamed straight to disk
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+
+# Bytes read from the network (and written to disk) per step
+STREAM_BLOCK_SIZE = 256 * 1024
+
+# A plain S3/CloudFront ETag is the MD5 of the object (multipart uploads add a "-N" suffix)
+MD5_ETAG = re.compile(r'^"?([0-9a-fA-F]{32})"?$')
+
+
+class ChecksumError(Exception):
+    """Downloaded file does not match the size or checksum the server reported"""
+
+
+def output_filename(task_id: str, index: int, url: str) -> str:
+    """Local file name for output `index` of a task, keeping the URL's extension"""
+    extension = os.path.splitext(urlparse(url).path)[1] or ".bin"
+    return f"{task_id}_{index}{extension}"
+
+
+class OutputDownloader:
+    """
+    Downloads files with HTTP range requests, several chunks at a time.
+
+    Each file is written to `<name>.part` next to a small JSON sidecar that
+    records which chunks are complete, so an interrupted download picks up
+    where it stopped. Finished files are checked against the server's size
+    and (when it is a plain MD5 ETag) checksum before being renamed into place.
+    """
+
+    def __init__(self, http: httpx.AsyncClient, max_concurrency: int = 4, chunk_size: int = 8 * 1024 * 1024):
+        self.http = http
+        self.chunk_size = chunk_size
+        # Shared across every file, so the limit applies to the whole batch of chunks
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def download(self, url: str, path: str) -> Dict[str, Any]:
+        """Download `url` to `path` and return its size, SHA-256 and whether it resumed"""
+        size, etag, ranges = await self._probe(url)
+
+        expected_md5 = MD5_ETAG.match(etag or "")
+        if size is not None and os.path.exists(path) and os.path.getsize(path) == size:
+            md5, sha256 = await asyncio.to_thread(_digests, path)
+            # A file of the right size with the wrong contents is downloaded again
+            if not expected_md5 or expected_md5.group(1).lower() == md5:
+                return {"path": path, "bytes": size, "sha256": sha256, "resumed": False, "skipped": True}
+
+        part_path, state_path = path + ".part", path + ".part.json"
+        if size is None or not ranges:
+            # The server cannot serve ranges, so stream the whole body in one request
+            await self._fetch(url, part_path, 0, None, truncate=True)
+            resumed = False
+        else:
+            resumed = await self._fetch_chunks(url, part_path, state_path, size, etag)
+
+        md5, sha256 = await asyncio.to_thread(_digests, part_path)
+        actual = os.path.getsize(part_path)
+        if size is not None and actual != size:
+            raise ChecksumError(f"Expected {size} bytes from {url}, got {actual}")
+        if expected_md5 and expected_md5.group(1).lower() != md5:
+            os.remove(part_path)
+            _remove(state_path)
+            raise ChecksumError(f"MD5 mismatch for {url}")
+
+        os.replace(part_path, path)
+        _remove(state_path)
+        return {"path": path, "bytes": actual, "sha256": sha256, "resumed": resumed, "skipped": False}
+
+    async def _probe(self, url: str) -> Tuple[Optional[int], Optional[str], bool]:
+        """Find the file size, ETag and range support with a one-byte range request"""
+        async with self._semaphore:
+            async with self.http.stream("GET", url, headers={"Range": "bytes=0-0"}) as response:
+                response.raise_for_status()
+                etag = response.headers.get("ETag")
+                if response.status_code == 206:
+                    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                    return (int(total) if total.isdigit() else None), etag, total.isdigit()
+                length = response.headers.get("Content-Length")
+                return (int(length) if length and length.isdigit() else None), etag, False
+
+    async def _fetch_chunks(self, url: str, part_path: str, state_path: str, size: int, etag: Optional[str]) -> bool:
+        """Download all missing chunks in parallel; returns True if earlier progress was reused"""
+        chunks = [(start, min(start + self.chunk_size, size) - 1) for start in range(0, size, self.chunk_size)]
+        state = _load_state(state_path)
+        resumed = bool(
+            state and state.get("size") == size and state.get("etag") == etag and os.path.exists(part_path)
+        )
+        done = set(state["done"]) if resumed else set()
+
+        if not resumed:
+            # Pre-size the file so every chunk can be written at its own offset
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            state = {"size": size, "etag": etag, "done": []}
+            _save_state(state_path, state)
+
+        async def fetch_chunk(index: int, start: int, end: int) -> None:
+            await self._fetch(url, part_path, start, end)
+            done.add(index)
+            state["done"] = sorted(done)
+            _save_state(state_path, state)
+
+        await asyncio.gather(*(
+            fetch_chunk(i, start, end) for i, (start, end) in enumerate(chunks) if i not in done
+        ))
+        return resumed
+
+    async def _fetch(self, url: str, part_path: str, start: int, end: Optional[int], truncate: bool = False) -> None:
+        """Stream one byte range (or the whole body) into the part file at its offset"""
+        headers = {"Range": f"bytes={start}-{end}"} if end is not None else {}
+        async with self._semaphore:
+            async with self.http.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                if end is not None and response.status_code != 206:
+                    raise Exception(f"Server ignored the range request for {url}")
+                with open(part_path, "wb" if truncate else "r+b") as f:
+                    f.seek(start)
+                    async for block in response.aiter_bytes(STREAM_BLOCK_SIZE):
+                        f.write(block)
+
+
+async def download_all(
+    downloader: OutputDownloader,
+    outputs: List[Tuple[str, str, str]]
+) -> List[Dict[str, Any]]:
+    """Download (task_id, url, path) triples in parallel; one failure never stops the rest"""
+
+    async def run(task_id: str, url: str, path: str) -> Dict[str, Any]:
+        try:
+            return dict(await downloader.download(url, path), task_id=task_id, status="success")
+        except Exception as e:
+            return {"task_id": task_id, "path": path, "status": "error", "error": str(e)}
+
+    return list(await asyncio.gather(*(run(*output) for output in outputs)))
+
+
+def _digests(path: str) -> Tuple[str, str]:
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b""):
+            md5.update(block)
+            sha256.update(block)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def _load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_path: str, state: Dict[str, Any]) -> None:
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
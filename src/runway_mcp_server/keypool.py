@@ -0,0 +1,121 @@
+"""
+Pool of Runway API keys
+Spreads new tasks over several keys by fewest tasks in flight, cools a key down after
+HTTP 429 and pins every task to the key that created it
+"""
+
+import time
+import hashlib
+from typing import Optional, Dict, List, Iterable, Set, Any
+
+
+def key_id(api_key: str) -> str:
+    """Short fingerprint that identifies a key in logs, metrics and the task store without revealing it"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class PooledKey:
+    """One API key, its request headers and the tasks it currently has in flight"""
+
+    __slots__ = ("id", "headers", "in_flight", "cooldown_until", "created", "throttled")
+
+    def __init__(self, api_key: str, headers: Dict[str, str]):
+        self.id = key_id(api_key)
+        self.headers = headers
+        self.in_flight: Set[str] = set()
+        self.cooldown_until = 0.0
+        self.created = 0
+        self.throttled = 0
+
+    def cooling_down(self, now: Optional[float] = None) -> bool:
+        return self.cooldown_until > (time.monotonic() if now is None else now)
+
+
+class KeyPool:
+    """
+    Chooses the key for each request.
+
+    New work goes to the key with the fewest unfinished tasks, skipping keys
+    that were recently throttled; ties rotate so idle keys share the load.
+    Requests about an existing task always use the key that created it, since
+    Runway only answers for a task to the key (or organization) that owns it.
+    """
+
+    def __init__(self, api_keys: Iterable[str], headers: Dict[str, str], max_pins: int = 100000):
+        keys: List[PooledKey] = []
+        for api_key in dict.fromkeys(k for k in api_keys if k):
+            keys.append(PooledKey(api_key, dict(headers, Authorization=f"Bearer {api_key}")))
+        if not keys:
+            raise ValueError("At least one API key is required")
+        self.keys = keys
+        self.max_pins = max_pins
+        self._by_id = {k.id: k for k in keys}
+        self._pins: Dict[str, PooledKey] = {}
+        self._turn = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def primary(self) -> PooledKey:
+        return self.keys[0]
+
+    def choose(self) -> PooledKey:
+        """Key for new work: fewest tasks in flight among keys that are not cooling down"""
+        now = time.monotonic()
+        candidates = [k for k in self.keys if not k.cooling_down(now)]
+        if not candidates:
+            # Every key is throttled: use the one whose cool-down ends first
+            return min(self.keys, key=lambda k: k.cooldown_until)
+        self._turn = (self._turn + 1) % len(self.keys)
+        position = {k.id: (i - self._turn) % len(self.keys) for i, k in enumerate(self.keys)}
+        return min(candidates, key=lambda k: (len(k.in_flight), position[k.id]))
+
+    def available_besides(self, key: PooledKey) -> bool:
+        """Whether another key could take a request that `key` was throttled on"""
+        now = time.monotonic()
+        return any(k is not key and not k.cooling_down(now) for k in self.keys)
+
+    def for_task(self, task_id: str) -> PooledKey:
+        """Key that created `task_id`, or the primary key for tasks created elsewhere"""
+        return self._pins.get(task_id, self.primary)
+
+    def pin(self, task_id: str, key: PooledKey) -> None:
+        """Record that `key` created `task_id`; the task counts as in flight until finished"""
+        self._pins[task_id] = key
+        key.in_flight.add(task_id)
+        key.created += 1
+        # Pins are kept for status lookups after a task finishes, but not forever
+        if len(self._pins) > self.max_pins:
+            oldest = next(iter(self._pins))
+            self._pins.pop(oldest).in_flight.discard(oldest)
+
+    def pin_by_id(self, task_id: str, fingerprint: Optional[str]) -> None:
+        """Re-pin a task from the task store by key fingerprint (ignored if the key left the pool)"""
+        key = self._by_id.get(fingerprint) if fingerprint else None
+        if key is not None:
+            self._pins[task_id] = key
+            key.in_flight.add(task_id)
+
+    def finished(self, task_id: str) -> None:
+        """The task reached a terminal state, so it no longer counts against its key"""
+        key = self._pins.get(task_id)
+        if key is not None:
+            key.in_flight.discard(task_id)
+
+    def cool_down(self, key: PooledKey, seconds: float) -> None:
+        key.throttled += 1
+        key.cooldown_until = max(key.cooldown_until, time.monotonic() + seconds)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "key": k.id,
+                "in_flight": len(k.in_flight),
+                "created": k.created,
+                "throttled": k.throttled,
+                "cooldown_seconds": round(max(k.cooldown_until - now, 0.0), 3),
+            }
+            for k in self.keys
+        ]
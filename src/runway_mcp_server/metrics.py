@@ -0,0 +1,163 @@
+"""
+In-process metrics for the Runway MCP server
+Cheap counters, gauges and fixed-bucket histograms, readable as JSON or Prometheus text
+"""
+
+import re
+from bisect import bisect_left
+from typing import Optional, List, Dict, Any, Tuple, Callable, Sequence
+
+
+# Bucket upper bounds (the last bucket is always +Inf)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TASK_DURATION_BUCKETS = (5, 10, 20, 30, 60, 90, 120, 180, 300, 450, 600, 900)
+POLL_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Task IDs in paths would give every task its own time series
+TASK_PATH = re.compile(r"^/tasks/[^/]+")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse per-task paths such as /tasks/abc/cancel into /tasks/{id}/cancel"""
+    return TASK_PATH.sub("/tasks/{id}", endpoint)
+
+
+class Histogram:
+    """Fixed-bucket histogram: one bisect and three additions per observation"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                if i == len(self.bounds):
+                    # Open-ended top bucket: the best estimate is its lower bound
+                    return lower
+                return lower + (self.bounds[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": _round(self.quantile(0.5)),
+            "p90": _round(self.quantile(0.9)),
+            "p99": _round(self.quantile(0.99)),
+        }
+
+
+class MetricsRegistry:
+    """
+    Named counters, histograms and gauges with optional labels.
+
+    Gauges are callbacks read only when a snapshot is taken, so live values
+    such as queue depth cost nothing on the hot path.
+    """
+
+    def __init__(self):
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def counter(self, name: str, help: str) -> None:
+        self._help[name] = help
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._help[name] = help
+        self._buckets[name] = buckets
+        self._histograms.setdefault(name, {})
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> None:
+        self._help[name] = help
+        self._gauges[name] = read
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        series = self._counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+        histogram.observe(value)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of one counter series (0 if it was never incremented)"""
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain JSON-friendly data"""
+        return {
+            "counters": {
+                name: [dict(labels=dict(key), value=value) for key, value in series.items()]
+                for name, series in self._counters.items()
+            },
+            "histograms": {
+                name: [dict(labels=dict(key), **histogram.summary()) for key, histogram in series.items()]
+                for name, series in self._histograms.items()
+            },
+            "gauges": {name: read() for name, read in self._gauges.items()},
+        }
+
+    def prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        for name, series in self._counters.items():
+            lines += [f"# HELP {name} {self._help.get(name, '')}", f"# TYPE {name} counter"]
+            lines += [f"{name}{_format_labels(key)} {value}" for key, value in series.items()]
+
+        for name, series in self._histograms.items():
+            lines += [f"# HELP {name} {self._help.get(name, '')}", f"# TYPE {name} histogram"]
+            for key, histogram in series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(list(histogram.bounds) + ["+Inf"], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        for name, read in self._gauges.items():
+            lines += [f"# HELP {name} {self._help.get(name, '')}", f"# TYPE {name} gauge", f"{name} {read()}"]
+
+        return "\n".join(lines) + "\n"
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in key)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(key, escaped)) + "}"
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 6) if value is not None else None
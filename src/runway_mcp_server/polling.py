@@ -0,0 +1,387 @@
+"""
+Polling for Runway tasks
+Polling schedules decide how long to wait between status checks based on the
+model and endpoint; TaskPoller runs every wait on one shared background loop
+"""
+
+import time
+import random
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Set, Tuple, Callable, Awaitable, AsyncIterator
+
+from .tracing import get_tracer
+
+
+@dataclass(frozen=True)
+class PollSchedule:
+    """Exponential backoff with jitter, tuned to how long a model usually runs"""
+
+    initial_interval: float  # Delay before the second poll (seconds)
+    max_interval: float      # Upper bound on any single delay
+    backoff: float = 1.5     # Growth factor between polls while progress is unknown
+    jitter: float = 0.2      # +/- fraction applied to every delay to spread load
+    min_interval: float = 0.5
+
+    def next_delay(
+        self,
+        attempt: int,
+        elapsed: float,
+        progress: Optional[float] = None,
+        rng: Optional[random.Random] = None
+    ) -> float:
+        """
+        Seconds to wait before poll number `attempt + 1`.
+
+        Without progress information the delay grows exponentially from
+        `initial_interval`. When Runway reports a progress fraction, the
+        remaining time is extrapolated from the elapsed time and the next poll
+        is aimed at the predicted finish.
+        """
+        delay = self.initial_interval * (self.backoff ** max(attempt - 1, 0))
+
+        if progress is not None and 0 < progress < 1 and elapsed > 0:
+            predicted_remaining = elapsed * (1 - progress) / progress
+            delay = predicted_remaining
+
+        delay = min(max(delay, self.min_interval), self.max_interval)
+
+        if self.jitter:
+            spread = (rng or random).uniform(-self.jitter, self.jitter)
+            delay *= 1 + spread
+
+        return max(delay, self.min_interval)
+
+
+# Image models finish in seconds, so they are polled quickly
+# Long video and editing models back off to spare request quota
+MODEL_SCHEDULES: Dict[str, PollSchedule] = {
+    "gen4_image_turbo": PollSchedule(initial_interval=1.0, max_interval=3.0),
+    "gen4_image": PollSchedule(initial_interval=2.0, max_interval=5.0),
+    "gen4_turbo": PollSchedule(initial_interval=3.0, max_interval=10.0),
+    "gen3a_turbo": PollSchedule(initial_interval=3.0, max_interval=10.0),
+    "veo3.1_fast": PollSchedule(initial_interval=5.0, max_interval=15.0),
+    "veo3.1": PollSchedule(initial_interval=8.0, max_interval=20.0),
+    "veo3": PollSchedule(initial_interval=8.0, max_interval=20.0),
+    "gen4_aleph": PollSchedule(initial_interval=8.0, max_interval=20.0),
+}
+
+# Fallbacks for tools that do not pick a model explicitly
+ENDPOINT_SCHEDULES: Dict[str, PollSchedule] = {
+    "/images": PollSchedule(initial_interval=2.0, max_interval=5.0),
+    "/extend_video": PollSchedule(initial_interval=5.0, max_interval=15.0),
+    "/upscale": PollSchedule(initial_interval=8.0, max_interval=20.0),
+}
+
+DEFAULT_SCHEDULE = PollSchedule(initial_interval=3.0, max_interval=15.0)
+
+
+def get_schedule(model: Optional[str] = None, endpoint: Optional[str] = None) -> PollSchedule:
+    """Pick the polling schedule for a model, then endpoint, then the default"""
+    if model and model in MODEL_SCHEDULES:
+        return MODEL_SCHEDULES[model]
+    if endpoint and endpoint in ENDPOINT_SCHEDULES:
+        return ENDPOINT_SCHEDULES[endpoint]
+    return DEFAULT_SCHEDULE
+
+
+# Task states after which Runway will never change the task again
+TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "CANCELLED", "EXPIRED")
+
+
+@dataclass
+class _Watch:
+    """One task being watched, shared by every caller waiting on it"""
+
+    task_id: str
+    schedule: PollSchedule
+    future: "asyncio.Future[Dict[str, Any]]"
+    poll_interval: Optional[float] = None
+    started: float = field(default_factory=time.monotonic)
+    next_poll_at: float = field(default_factory=time.monotonic)
+    polls: int = 0
+    waiters: int = 0
+    in_flight: bool = False
+    listeners: List["asyncio.Queue[Dict[str, Any]]"] = field(default_factory=list)
+    trace_parent: Any = None         # Span of the caller that started the watch
+    idle_since_ns: Optional[int] = None  # Wall clock end of the last poll, for sleep spans
+
+
+class TaskPoller:
+    """
+    Central poller that multiplexes every waiter onto one background loop.
+
+    Each watched task ID is polled by a single loop with bounded concurrency,
+    no matter how many callers wait on it; duplicate waits on the same ID are
+    coalesced onto one future. The latest status of every polled task is kept
+    in a small cache so status lookups can skip the network.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+        max_concurrency: int = 10,
+        cache_size: int = 1000,
+        on_update: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ):
+        self._fetch = fetch
+        self.on_update = on_update  # Called with every freshly fetched task
+        self._max_concurrency = max_concurrency
+        self._cache_size = cache_size
+        self._watches: Dict[str, _Watch] = {}
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._poll_tasks: Set["asyncio.Task[None]"] = set()
+        self._runner: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def watched(self) -> int:
+        """Number of task IDs currently being polled"""
+        return len(self._watches)
+
+    @property
+    def waiters(self) -> int:
+        """Number of callers currently blocked on a watched task"""
+        return sum(w.waiters for w in self._watches.values())
+
+    async def wait(
+        self,
+        task_id: str,
+        max_wait: float = 300,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        poll_interval: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Wait until a task reaches a terminal state, joining any existing watch"""
+        watch = self._join(task_id, model, endpoint, poll_interval)
+        try:
+            task = await asyncio.wait_for(asyncio.shield(watch.future), timeout=max_wait)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task did not complete within {max_wait} seconds") from None
+        finally:
+            self._leave(watch)
+
+        return dict(task, pollCount=watch.polls)
+
+    async def updates(
+        self,
+        task_id: str,
+        max_wait: float = 300,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        poll_interval: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield an update for every poll of a task until it finishes.
+
+        Each update carries `status`, `progress`, `elapsed` (seconds since this
+        iterator started), `polls` and the raw `task`. The last update is the
+        successful task; failures and timeouts raise like `wait()`.
+        """
+        watch = self._join(task_id, model, endpoint, poll_interval)
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        watch.listeners.append(queue)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        try:
+            while True:
+                remaining = max_wait - (loop.time() - started)
+                if remaining <= 0:
+                    raise TimeoutError(f"Task did not complete within {max_wait} seconds")
+
+                if queue.empty() and watch.future.done():
+                    # Resolved without a final status update, e.g. the status request itself failed
+                    task = watch.future.result()
+                else:
+                    getter = asyncio.ensure_future(queue.get())
+                    try:
+                        await asyncio.wait(
+                            {getter, watch.future}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                        )
+                    finally:
+                        if not getter.done():
+                            getter.cancel()
+                    if not getter.done() or getter.cancelled():
+                        continue
+                    task = getter.result()
+
+                yield {
+                    "task_id": task_id,
+                    "status": task.get("status"),
+                    "progress": task.get("progress"),
+                    "elapsed": round(loop.time() - started, 3),
+                    "polls": watch.polls,
+                    "task": dict(task, pollCount=watch.polls),
+                }
+
+                if task.get("status") in TERMINAL_STATUSES:
+                    # Raises the same error wait() would for FAILED / CANCELLED / EXPIRED
+                    watch.future.result()
+                    return
+        finally:
+            watch.listeners.remove(queue)
+            self._leave(watch)
+
+    def cached(self, task_id: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """
+        Latest polled status of a task, or None if it is older than `max_age`.
+
+        Tasks in a terminal state never change, so they are returned at any age.
+        """
+        entry = self._cache.get(task_id)
+        if entry is None:
+            return None
+        fetched_at, task = entry
+        if task.get("status") in TERMINAL_STATUSES or time.monotonic() - fetched_at <= max_age:
+            return task
+        return None
+
+    def remember(self, task_id: str, task: Dict[str, Any]) -> None:
+        """Store a freshly fetched task in the status cache"""
+        self._cache[task_id] = (time.monotonic(), task)
+        self._cache.move_to_end(task_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        if self.on_update is not None:
+            self.on_update(task_id, task)
+        watch = self._watches.get(task_id)
+        if watch is not None and task.get("status") in TERMINAL_STATUSES:
+            # A final status learned anywhere (a poll, a cancel, a status lookup) releases the waiters
+            self._settle(watch, task)
+
+    async def aclose(self) -> None:
+        """Stop the background loop and fail any remaining waiters"""
+        if self._runner is not None:
+            self._runner.cancel()
+        for poll in list(self._poll_tasks):
+            poll.cancel()
+        for watch in self._watches.values():
+            watch.future.cancel()
+        self._watches.clear()
+        self._runner = None
+
+    def _join(
+        self,
+        task_id: str,
+        model: Optional[str],
+        endpoint: Optional[str],
+        poll_interval: Optional[float]
+    ) -> _Watch:
+        """Register one more waiter on a task, starting a watch if needed"""
+        watch = self._watches.get(task_id)
+        if watch is None:
+            future = asyncio.get_running_loop().create_future()
+            # Mark exceptions as retrieved even if every waiter has already gone
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            watch = _Watch(task_id, get_schedule(model, endpoint), future, poll_interval)
+            # Polls run on the background loop, so their spans are parented explicitly
+            watch.trace_parent = get_tracer().current()
+            self._watches[task_id] = watch
+            self._ensure_running()
+        watch.waiters += 1
+        return watch
+
+    def _leave(self, watch: _Watch) -> None:
+        """Drop one waiter; the last one to leave stops the watch"""
+        watch.waiters -= 1
+        if watch.waiters == 0 and self._watches.get(watch.task_id) is watch:
+            del self._watches[watch.task_id]
+            watch.future.cancel()
+
+    def _ensure_running(self) -> None:
+        """Start the background loop in the current event loop if it is idle"""
+        if self._runner is None or self._runner.done():
+            # Loop-bound primitives are created here so the poller survives event loop restarts
+            self._wakeup = asyncio.Event()
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Poll due tasks until nothing is left to watch"""
+        while self._watches:
+            now = time.monotonic()
+            idle = [w for w in self._watches.values() if not w.in_flight]
+
+            for watch in idle:
+                if watch.next_poll_at <= now:
+                    watch.in_flight = True
+                    poll = asyncio.get_running_loop().create_task(self._poll(watch))
+                    self._poll_tasks.add(poll)
+                    poll.add_done_callback(self._poll_tasks.discard)
+
+            pending = [w.next_poll_at for w in self._watches.values() if not w.in_flight]
+            timeout = max(min(pending) - now, 0) if pending else None
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, watch: _Watch) -> None:
+        """Fetch one task and either resolve its waiters or schedule the next poll"""
+        tracer = get_tracer()
+        if tracer.enabled and watch.idle_since_ns is not None:
+            tracer.record(
+                "poll.sleep", watch.idle_since_ns, time.time_ns(),
+                parent=watch.trace_parent, task_id=watch.task_id
+            )
+        try:
+            with tracer.span("get_task", parent=watch.trace_parent, task_id=watch.task_id, poll=watch.polls + 1) as span:
+                async with self._semaphore:
+                    task = await self._fetch(watch.task_id)
+                span.set_attribute("status", task.get("status"))
+                span.set_attribute("progress", task.get("progress"))
+        except Exception as e:
+            self._finish(watch, error=e)
+            return
+        finally:
+            watch.in_flight = False
+            self._wakeup.set()
+            if tracer.enabled:
+                watch.idle_since_ns = time.time_ns()
+
+        watch.polls += 1
+        # Settles the watch when the task has finished
+        self.remember(watch.task_id, task)
+        for queue in watch.listeners:
+            queue.put_nowait(task)
+
+        if task.get("status") not in TERMINAL_STATUSES:
+            now = time.monotonic()
+            if watch.poll_interval is not None:
+                delay = watch.poll_interval
+            else:
+                delay = watch.schedule.next_delay(watch.polls, now - watch.started, task.get("progress"))
+            watch.next_poll_at = now + delay
+
+    def _settle(self, watch: _Watch, task: Dict[str, Any]) -> None:
+        """Resolve a watch from a task in a terminal state"""
+        status = task.get("status")
+        if status == "SUCCEEDED":
+            self._finish(watch, task=task)
+        elif status == "FAILED":
+            self._finish(watch, error=Exception(f"Task failed: {task.get('failure', 'Unknown error')}"))
+        else:
+            self._finish(watch, error=Exception(f"Task {status.lower()}"))
+
+    def _finish(
+        self,
+        watch: _Watch,
+        task: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Resolve the shared future and stop watching the task"""
+        if self._watches.get(watch.task_id) is watch:
+            del self._watches[watch.task_id]
+        if watch.future.done():
+            return
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(task)
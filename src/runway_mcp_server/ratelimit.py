@@ -0,0 +1,132 @@
+"""
+Client-side rate limiting for the Runway API
+Token buckets queue callers instead of failing them and slow down after HTTP 429
+"""
+
+import time
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+
+
+class TokenBucket:
+    """
+    Token bucket that queues callers in FIFO order until a token is free.
+
+    `rate` tokens are added per second up to `capacity`, which is the largest
+    burst allowed. `pause()` stops handing out tokens for a while, which is
+    how a 429 from Runway slows every caller down at once.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = ""):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._waiting = 0
+        self.throttled = 0  # Number of 429 responses that paused this bucket
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently queued for a token"""
+        return self._waiting
+
+    async def acquire(self) -> None:
+        """Wait for a token, queueing behind earlier callers"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    else:
+                        await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self._waiting -= 1
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is free right now, without waiting"""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._paused_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Stop granting tokens for `seconds` and drop any saved-up burst"""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Separate token buckets for task creation and for polling"""
+
+    def __init__(
+        self,
+        create_rate: float,
+        create_burst: float,
+        poll_rate: float,
+        poll_burst: float
+    ):
+        self.buckets: Dict[str, TokenBucket] = {
+            "create": TokenBucket(create_rate, create_burst, name="create"),
+            "poll": TokenBucket(poll_rate, poll_burst, name="poll"),
+        }
+
+    def bucket_for(self, method: str, endpoint: str) -> TokenBucket:
+        """
+        Task creation spends the create budget; status checks, cancels and
+        uploads spend the poll budget, so staging media never delays the
+        creation it is for
+        """
+        if method.upper() == "POST" and not endpoint.startswith(("/tasks/", "/uploads")):
+            return self.buckets["create"]
+        return self.buckets["poll"]
+
+    @property
+    def waiting(self) -> int:
+        """Callers queued across every budget"""
+        return sum(bucket.waiting for bucket in self.buckets.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throttling counters per budget"""
+        return {
+            name: {
+                "rate_per_second": bucket.rate,
+                "burst": bucket.capacity,
+                "queued": bucket.waiting,
+                "throttled": bucket.throttled,
+            }
+            for name, bucket in self.buckets.items()
+        }
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Seconds to back off from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,51 @@
+"""
+Retry policy for transient Runway API failures
+Knows which requests are safe to repeat and how long to back off between attempts
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+
+# Server-side errors that usually clear up on their own
+RETRYABLE_STATUS_CODES = (500, 502, 503, 504)
+
+# Failures raised while opening a connection - the request body never left this machine,
+# so even a non-idempotent POST can safely be sent again
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a total deadline"""
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    deadline: float = 60.0  # Total seconds one request may spend retrying
+
+    @staticmethod
+    def is_idempotent(method: str, endpoint: str) -> bool:
+        """
+        Reads can be repeated freely. Cancelling a task is idempotent too;
+        creating one is not - a retried POST could start a second generation.
+        """
+        return method.upper() in ("GET", "HEAD", "DELETE") or endpoint.endswith("/cancel")
+
+    def should_retry_error(self, method: str, endpoint: str, error: Exception) -> bool:
+        """Whether a transport-level failure may be retried for this request"""
+        if isinstance(error, UNSENT_ERRORS):
+            return True
+        return self.is_idempotent(method, endpoint) and isinstance(error, httpx.TransportError)
+
+    def should_retry_status(self, method: str, endpoint: str, status_code: int) -> bool:
+        """Whether an HTTP error status may be retried for this request"""
+        return self.is_idempotent(method, endpoint) and status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, retry: int, rng: Optional[random.Random] = None) -> float:
+        """Delay before retry number `retry` (0-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** retry))
+        return (rng or random).uniform(0, ceiling)
@@ -0,0 +1,153 @@
+"""
+Job scheduler between the tools and task creation
+Per-model-family lanes with their own concurrency limits, priority classes and
+round-robin fairness between MCP sessions, so bulk work cannot starve interactive calls
+"""
+
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Deque, AsyncIterator
+
+# Served strictly in this order within a lane
+PRIORITIES = ("interactive", "bulk")
+
+
+class _Lane:
+    def __init__(self, limit: int, reserve: int):
+        self.limit = max(1, limit)
+        # Slots only interactive jobs may use, so a bulk backlog never fills the lane
+        self.reserve = min(max(0, reserve), self.limit - 1)
+        self.active = {p: 0 for p in PRIORITIES}
+        # Per priority: waiting jobs grouped by session, in round-robin order
+        self.waiting: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {p: OrderedDict() for p in PRIORITIES}
+
+    @property
+    def running(self) -> int:
+        return sum(self.active.values())
+
+    def queued(self, priority: str) -> int:
+        return sum(len(q) for q in self.waiting[priority].values())
+
+    def can_start(self, priority: str) -> bool:
+        if self.running >= self.limit:
+            return False
+        return priority != "bulk" or self.active["bulk"] < self.limit - self.reserve
+
+
+class Scheduler:
+    """
+    Admits jobs into lanes (gen4, veo, aleph, upscale, ...) one slot at a time.
+
+    A job holds its lane slot from task creation until it finishes. Queued
+    interactive jobs always start before queued bulk jobs, and within a
+    priority the sessions with queued jobs take turns, so one session's
+    large batch is interleaved with everyone else's work instead of
+    running ahead of it.
+    """
+
+    def __init__(self, limits: Dict[str, int], default_limit: int = 4, interactive_reserve: int = 1):
+        self.limits = dict(limits)
+        self.default_limit = default_limit
+        self.interactive_reserve = interactive_reserve
+        self._lanes: Dict[str, _Lane] = {}
+
+    def _lane(self, name: str) -> _Lane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = _Lane(self.limits.get(name, self.default_limit), self.interactive_reserve)
+        return lane
+
+    async def acquire(self, lane_name: str, priority: str = "interactive", session: str = "default") -> float:
+        """Wait for a slot in `lane_name`; returns the seconds spent queued"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; use one of: {', '.join(PRIORITIES)}")
+        lane = self._lane(lane_name)
+        ahead = any(lane.waiting[p] for p in PRIORITIES[:PRIORITIES.index(priority) + 1])
+        if not ahead and lane.can_start(priority):
+            lane.active[priority] += 1
+            return 0.0
+
+        queued_at = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        lane.waiting[priority].setdefault(session, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the caller gave up
+                self.release(lane_name, priority)
+            else:
+                self._forget(lane, priority, session, future)
+            raise
+        return time.perf_counter() - queued_at
+
+    def release(self, lane_name: str, priority: str = "interactive") -> None:
+        lane = self._lanes[lane_name]
+        lane.active[priority] -= 1
+        self._dispatch(lane)
+
+    @asynccontextmanager
+    async def slot(self, lane_name: str, priority: str = "interactive", session: str = "default") -> AsyncIterator[float]:
+        """Hold a lane slot around a block; yields the seconds spent queued"""
+        waited = await self.acquire(lane_name, priority, session)
+        try:
+            yield waited
+        finally:
+            self.release(lane_name, priority)
+
+    @property
+    def queued(self) -> int:
+        return sum(lane.queued(p) for lane in self._lanes.values() for p in PRIORITIES)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "limit": lane.limit,
+                "running": lane.running,
+                **{f"queued_{p}": lane.queued(p) for p in PRIORITIES},
+            }
+            for name, lane in self._lanes.items()
+        }
+
+    def _dispatch(self, lane: _Lane) -> None:
+        """Start queued jobs while the lane has room, highest priority first, sessions in turn"""
+        for priority in PRIORITIES:
+            sessions = lane.waiting[priority]
+            while sessions and lane.can_start(priority):
+                session, queue = next(iter(sessions.items()))
+                future = queue.popleft()
+                # The session goes to the back of the line behind everyone else
+                del sessions[session]
+                if queue:
+                    sessions[session] = queue
+                if future.done():
+                    continue
+                lane.active[priority] += 1
+                future.set_result(None)
+            if sessions:
+                # Lower priorities wait until this one has nothing queued
+                return
+
+    @staticmethod
+    def _forget(lane: _Lane, priority: str, session: str, future: asyncio.Future) -> None:
+        queue = lane.waiting[priority].get(session)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del lane.waiting[priority][session]
+
+
+def parse_lane_limits(value: str) -> Dict[str, int]:
+    """Parse "gen4=8,veo=4" into {"gen4": 8, "veo": 4}"""
+    limits = {}
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
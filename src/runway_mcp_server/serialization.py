@@ -0,0 +1,95 @@
+"""
+Serialization of tool responses
+Turns tool results into the JSON text returned over MCP: compact by default, through
+orjson when it is installed, with per-call field selection and cached static responses
+"""
+
+import json
+import logging
+from typing import Optional, Dict, Any, Iterable, Callable, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install "runway-mcp-server[fast-json]"
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Kept in every selected object so a caller always learns whether the call (or item) worked
+ALWAYS_KEPT = ("status", "error")
+
+
+def select_fields(result: Any, fields: Optional[Iterable[str]]) -> Any:
+    """
+    Keep only the requested fields of a result.
+
+    Dotted paths reach into nested objects and into every element of a list,
+    so "clips.video_url" keeps just the URL of each storyboard clip.
+    """
+    if fields is None:
+        return result
+    # Nested dicts of the requested paths; None marks a field that is kept whole
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        *parents, leaf = path.split(".")
+        node: Optional[Dict[str, Any]] = tree
+        for part in parents:
+            if node is None:
+                break
+            node = node.setdefault(part, {})
+        if node is not None:
+            node[leaf] = None
+    return _select(result, tree)
+
+
+def _select(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _select(item, tree.get(key)) for key, item in value.items() if key in tree or key in ALWAYS_KEPT}
+
+
+class ResponseEncoder:
+    """
+    Encodes tool results as JSON text.
+
+    `backend` is "auto" (orjson when importable, else the standard library),
+    "orjson" or "json". Both backends emit the same JSON documents.
+    """
+
+    def __init__(self, pretty: bool = False, backend: str = "auto"):
+        self.pretty = pretty
+        if backend == "orjson" and orjson is None:
+            logger.warning("RUNWAY_JSON_BACKEND=orjson but orjson is not installed; using json")
+        self.backend = "orjson" if orjson is not None and backend in ("auto", "orjson") else "json"
+        # Full results and their encoded text, by name
+        self._static: Dict[str, Tuple[Any, str]] = {}
+
+    def dumps(self, value: Any) -> str:
+        if self.backend == "orjson":
+            options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if self.pretty else 0)
+            return orjson.dumps(value, option=options, default=str).decode("utf-8")
+        if self.pretty:
+            return json.dumps(value, indent=2, ensure_ascii=False, default=str)
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    def encode(self, result: Any, fields: Optional[Iterable[str]] = None) -> str:
+        """Serialize a result, keeping only `fields` when given"""
+        return self.dumps(select_fields(result, fields))
+
+    def static(self, name: str, build: Callable[[], Any], fields: Optional[Iterable[str]] = None) -> str:
+        """
+        Build and serialize a response that never changes once, and reuse the text on every later call.
+
+        Only the full response is cached; a `fields` selection is encoded from the cached result.
+        """
+        entry = self._static.get(name)
+        if entry is None:
+            result = build()
+            entry = self._static[name] = (result, self.dumps(result))
+        if fields is None:
+            return entry[1]
+        return self.encode(entry[0], fields)
@@ -4,110 +4,1031 @@ Supports all latest Runway features including Gen-4, Aleph video editing, Act-On
 """
 
 import os
-import json
 import time
 import asyncio
-from typing import Optional, List, Dict, Any, Literal
+import logging
+import mimetypes
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Literal, AsyncIterator, Set, Tuple, TYPE_CHECKING
 from enum import Enum
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from dotenv import load_dotenv
 
+from .polling import TaskPoller, TERMINAL_STATUSES
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryPolicy
+from .cache import ResultCache, request_key
+from .downloads import OutputDownloader, download_all, output_filename
+from .metrics import MetricsRegistry, endpoint_label, TASK_DURATION_BUCKETS, POLL_COUNT_BUCKETS
+from .tracing import get_tracer, set_tracer, build_tracer
+from .capabilities import MODELS, lane_for, list_models, validate_request, map_media, models_for, ratios_for, durations_for
+from .serialization import ResponseEncoder
+from .keypool import KeyPool, PooledKey
+from .scheduler import Scheduler, parse_lane_limits
+
+# SQLite and the simulator are only needed for some configurations, so they load on first use
+if TYPE_CHECKING:
+    from .task_store import TaskStore
+    from .simulator import RunwaySimulator
+
 # Load environment variables from .env file
 # This reads your .env file and makes the variables available to the program
 load_dotenv()
 
-# Initialize FastMCP server
-mcp = FastMCP("Runway AI Video Generation")
+logger = logging.getLogger(__name__)
 
 # Configuration
 # Check for both uppercase and lowercase versions of the API key
 # This way it works with either "RUNWAY_API_KEY" or "runway_api_key" in your .env file
 RUNWAY_API_KEY = os.getenv("RUNWAY_API_KEY") or os.getenv("runway_api_key") or ""
-RUNWAY_API_BASE = "https://api.dev.runwayml.com/v1"  # Development API endpoint
+# Extra keys, comma separated: new tasks are spread over every key by fewest tasks in flight
+RUNWAY_API_KEYS = [k.strip() for k in os.getenv("RUNWAY_API_KEYS", "").split(",") if k.strip()]
+# Defaults to the development API endpoint; point it at a proxy or another deployment as needed
+RUNWAY_API_BASE = os.getenv("RUNWAY_API_BASE", "https://api.dev.runwayml.com/v1").rstrip("/")
 RUNWAY_API_VERSION = "2024-11-06"
 
+# Local simulator mode: every request is answered in-process and no credits are spent
+# RUNWAY_SIMULATOR_CONFIG points at a JSON file with per-model timings, failure rates and 429 limits
+RUNWAY_SIMULATOR = os.getenv("RUNWAY_SIMULATOR", "false").lower() in ("1", "true", "yes")
+RUNWAY_SIMULATOR_CONFIG = os.getenv("RUNWAY_SIMULATOR_CONFIG", "")
+# Speed up simulated tasks, e.g. 10 makes a 30 second generation finish in 3 seconds
+RUNWAY_SIMULATOR_TIME_SCALE = float(os.getenv("RUNWAY_SIMULATOR_TIME_SCALE", "1"))
+
+# HTTP connection pool settings for the shared client
+# Every tool call and every poll reuses these keep-alive connections instead of
+# paying a fresh TCP + TLS handshake per request
+RUNWAY_HTTP_TIMEOUT = float(os.getenv("RUNWAY_HTTP_TIMEOUT", "60"))
+RUNWAY_HTTP_MAX_CONNECTIONS = int(os.getenv("RUNWAY_HTTP_MAX_CONNECTIONS", "100"))
+RUNWAY_HTTP_MAX_KEEPALIVE = int(os.getenv("RUNWAY_HTTP_MAX_KEEPALIVE", "20"))
+RUNWAY_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("RUNWAY_HTTP_KEEPALIVE_EXPIRY", "30"))
+RUNWAY_HTTP2 = os.getenv("RUNWAY_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Client-side rate limits (requests per second and burst size)
+# Task creation and polling have separate budgets so a burst of new jobs
+# cannot starve status checks, and vice versa; media uploads use the poll budget
+RUNWAY_CREATE_RATE = float(os.getenv("RUNWAY_CREATE_RATE", "1"))
+RUNWAY_CREATE_BURST = float(os.getenv("RUNWAY_CREATE_BURST", "5"))
+RUNWAY_POLL_RATE = float(os.getenv("RUNWAY_POLL_RATE", "10"))
+RUNWAY_POLL_BURST = float(os.getenv("RUNWAY_POLL_BURST", "20"))
+# How many times a request rate-limited with HTTP 429 is queued again before failing
+RUNWAY_RATE_LIMIT_MAX_RETRIES = int(os.getenv("RUNWAY_RATE_LIMIT_MAX_RETRIES", "5"))
+
+# Retries for transient failures (connection errors, timeouts, 5xx)
+# Status polls are retried freely; task creation only when the request was never sent
+RUNWAY_RETRY_MAX = int(os.getenv("RUNWAY_RETRY_MAX", "5"))
+RUNWAY_RETRY_BASE_DELAY = float(os.getenv("RUNWAY_RETRY_BASE_DELAY", "0.5"))
+RUNWAY_RETRY_MAX_DELAY = float(os.getenv("RUNWAY_RETRY_MAX_DELAY", "10"))
+RUNWAY_RETRY_DEADLINE = float(os.getenv("RUNWAY_RETRY_DEADLINE", "60"))
+
+# Persistent task store (SQLite) so waits survive a server restart
+# Set RUNWAY_TASK_STORE=off to disable
+RUNWAY_TASK_STORE = os.getenv("RUNWAY_TASK_STORE", "~/.runway-mcp/tasks.db")
+# Buffered writes are flushed at most this often (seconds)
+RUNWAY_TASK_STORE_FLUSH_INTERVAL = float(os.getenv("RUNWAY_TASK_STORE_FLUSH_INTERVAL", "1"))
+# Finished tasks older than this many days are deleted when the store opens
+RUNWAY_TASK_STORE_RETENTION_DAYS = float(os.getenv("RUNWAY_TASK_STORE_RETENTION_DAYS", "7"))
+# How long a stored task is polled in the background before giving up until the next start
+RUNWAY_TASK_TRACK_MAX_WAIT = float(os.getenv("RUNWAY_TASK_TRACK_MAX_WAIT", "3600"))
+
+# Single-flight task creation: identical seeded payloads sent within this many seconds
+# of each other attach to the same Runway task instead of creating a duplicate
+RUNWAY_CREATE_COALESCE = os.getenv("RUNWAY_CREATE_COALESCE", "true").lower() in ("1", "true", "yes")
+RUNWAY_CREATE_COALESCE_WINDOW = float(os.getenv("RUNWAY_CREATE_COALESCE_WINDOW", "2"))
+
+# Opt-in cache of results for requests with an explicit seed
+# The TTL stays below the ~24h lifetime of Runway's signed output URLs
+RUNWAY_RESULT_CACHE = os.getenv("RUNWAY_RESULT_CACHE", "false").lower() in ("1", "true", "yes")
+# Entries kept in memory, and on disk when the on-disk tier is enabled
+RUNWAY_RESULT_CACHE_SIZE = int(os.getenv("RUNWAY_RESULT_CACHE_SIZE", "256"))
+RUNWAY_RESULT_CACHE_TTL = float(os.getenv("RUNWAY_RESULT_CACHE_TTL", "82800"))
+# Optional directory for the on-disk tier, so cached results survive a restart
+RUNWAY_RESULT_CACHE_DIR = os.getenv("RUNWAY_RESULT_CACHE_DIR", "")
+
+# Downloads of generated outputs
+RUNWAY_DOWNLOAD_DIR = os.getenv("RUNWAY_DOWNLOAD_DIR", "~/Downloads/runway")
+RUNWAY_DOWNLOAD_CONCURRENCY = int(os.getenv("RUNWAY_DOWNLOAD_CONCURRENCY", "4"))
+# Files larger than this are split into parallel range requests (megabytes)
+RUNWAY_DOWNLOAD_CHUNK_MB = int(os.getenv("RUNWAY_DOWNLOAD_CHUNK_MB", "8"))
+
+# Tracing: "off", "jsonl" (spans appended to RUNWAY_TRACE_FILE) or "otel" (OpenTelemetry API)
+RUNWAY_TRACING = os.getenv("RUNWAY_TRACING", "off")
+RUNWAY_TRACE_FILE = os.getenv("RUNWAY_TRACE_FILE", "~/.runway-mcp/traces.jsonl")
+
+# Tool responses: "compact" JSON (fewest bytes and tokens) or "pretty" (indented for reading)
+RUNWAY_RESPONSE_FORMAT = os.getenv("RUNWAY_RESPONSE_FORMAT", "compact")
+# JSON encoder: "auto" uses orjson when installed, "json" forces the standard library
+RUNWAY_JSON_BACKEND = os.getenv("RUNWAY_JSON_BACKEND", "auto")
+
+# Check requests against the model capability registry before submitting them
+RUNWAY_VALIDATE_REQUESTS = os.getenv("RUNWAY_VALIDATE_REQUESTS", "true").lower() in ("1", "true", "yes")
+
+# Scheduler lanes: concurrent tasks per model family (per API key), from creation until finished
+RUNWAY_LANE_LIMITS = parse_lane_limits(os.getenv("RUNWAY_LANE_LIMITS", "gen4=8,veo=4,aleph=2,upscale=2"))
+RUNWAY_LANE_DEFAULT_LIMIT = int(os.getenv("RUNWAY_LANE_DEFAULT_LIMIT", "4"))
+# Slots in every lane that bulk work (batches, storyboards, pipelines) may not take
+RUNWAY_LANE_INTERACTIVE_RESERVE = int(os.getenv("RUNWAY_LANE_INTERACTIVE_RESERVE", "1"))
+
+# Cancel the Runway task when the tool call waiting on it is cancelled by the MCP client,
+# and (opt-in) when the wait times out, so abandoned tasks stop holding slots and credits
+RUNWAY_CANCEL_ON_ABORT = os.getenv("RUNWAY_CANCEL_ON_ABORT", "true").lower() in ("1", "true", "yes")
+RUNWAY_CANCEL_ON_TIMEOUT = os.getenv("RUNWAY_CANCEL_ON_TIMEOUT", "false").lower() in ("1", "true", "yes")
+# Seconds an abandoned task waits before it is cancelled. A server shutting down also cancels
+# every call in flight, and closes the client within this window so those tasks are resumed instead
+RUNWAY_CANCEL_GRACE = float(os.getenv("RUNWAY_CANCEL_GRACE", "2"))
+
+# Maximum number of images a single batch tool call generates at the same time
+RUNWAY_BATCH_CONCURRENCY = int(os.getenv("RUNWAY_BATCH_CONCURRENCY", "5"))
+
+# Task polling settings
+# All waits share one background poller; this caps how many status requests it has in flight
+RUNWAY_POLL_CONCURRENCY = int(os.getenv("RUNWAY_POLL_CONCURRENCY", "10"))
+# get_task_status answers from the poller's cache when the entry is younger than this (seconds)
+RUNWAY_STATUS_CACHE_TTL = float(os.getenv("RUNWAY_STATUS_CACHE_TTL", "5"))
+
+# Media inputs starting with these are sent to Runway as-is; anything else that
+# names an existing local file is streamed to the upload endpoint first
+REMOTE_MEDIA_PREFIXES = ("http://", "https://", "data:", "runway://")
+# Seconds an upload is reused for the same unchanged file; Runway keeps ephemeral uploads for 24h
+RUNWAY_UPLOAD_REUSE_WINDOW = float(os.getenv("RUNWAY_UPLOAD_REUSE_WINDOW", "3600"))
+
 # Type definitions
-# Updated with correct API model names from Runway docs (Nov 2024)
-VideoRatio = Literal["1280:720", "720:1280", "1104:832", "832:1104", "960:960", "1584:672"]
-ImageRatio = Literal["1920:1080", "1080:1920", "1024:1024"]
-TextToVideoModel = Literal["veo3.1", "veo3.1_fast", "veo3"]  # For text_to_video endpoint
-ImageToVideoModel = Literal["gen4_turbo", "gen3a_turbo", "veo3.1", "veo3.1_fast", "veo3"]  # For image_to_video
+# Built from the capability registry so the tools accept exactly what list_available_models
+# advertises; each type is the union over an endpoint's models and validate_request checks the pair
+VideoRatio = Literal[ratios_for("/image_to_video")]
+ImageRatio = Literal[ratios_for("/images")]
+TextToVideoRatio = Literal[ratios_for("/text_to_video")]
+VideoEditingRatio = Literal[MODELS["gen4_aleph"].ratios]  # For video_to_video (Aleph)
+TextToVideoModel = Literal[models_for("/text_to_video")]  # For text_to_video endpoint
+ImageToVideoModel = Literal[models_for("/image_to_video")]  # For image_to_video
 VideoEditingModel = Literal["gen4_aleph"]  # For video_to_video (Aleph)
-ImageModel = Literal["gen4_image", "gen4_image_turbo"]
-Duration = Literal[4, 6, 8]  # Valid durations for Veo models
+ImageModel = Literal[models_for("/images")]
+Duration = Literal[durations_for("/text_to_video")]  # Valid durations for Veo models
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_http_client(**overrides) -> httpx.AsyncClient:
+    """Build a pooled httpx client using the configured keep-alive limits"""
+    http2 = RUNWAY_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("RUNWAY_HTTP2 is enabled but 'h2' is not installed; falling back to HTTP/1.1")
+        http2 = False
+    
+    options: Dict[str, Any] = {
+        "timeout": RUNWAY_HTTP_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=RUNWAY_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=RUNWAY_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=RUNWAY_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "http2": http2,
+    }
+    if RUNWAY_SIMULATOR:
+        options["transport"] = get_simulator().transport()
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+_simulator: Optional["RunwaySimulator"] = None
+
+
+def get_simulator() -> "RunwaySimulator":
+    """The in-process Runway API simulator used when RUNWAY_SIMULATOR is enabled"""
+    global _simulator
+    if _simulator is None:
+        from .simulator import RunwaySimulator, SimulatorConfig
+        config = SimulatorConfig.from_file(RUNWAY_SIMULATOR_CONFIG) if RUNWAY_SIMULATOR_CONFIG else SimulatorConfig()
+        if RUNWAY_SIMULATOR_TIME_SCALE != 1:
+            config.time_scale = RUNWAY_SIMULATOR_TIME_SCALE
+        _simulator = RunwaySimulator(config)
+        logger.info("Runway API simulator enabled; no requests will reach %s", RUNWAY_API_BASE)
+    return _simulator
+
+
+def local_media_path(value: Optional[str]) -> Optional[str]:
+    """The local file a media input names, or None for URLs, data URIs and missing files"""
+    if not value or value.startswith(REMOTE_MEDIA_PREFIXES):
+        return None
+    path = os.path.expanduser(value[len("file://"):] if value.startswith("file://") else value)
+    return path if os.path.isfile(path) else None
+
+
+def file_fingerprint(path: str) -> str:
+    """Stable stand-in for a local file in cache keys: its path, size and modification time"""
+    stat = os.stat(path)
+    return f"file://{os.path.abspath(path)}?size={stat.st_size}&mtime={stat.st_mtime_ns}"
 
 
 class RunwayAPIClient:
     """HTTP client for Runway API with authentication and error handling"""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        task_store: Optional["TaskStore"] = None,
+        extra_api_keys: Optional[List[str]] = None
+    ):
         self.api_key = api_key
         self.base_url = RUNWAY_API_BASE
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
+        # Every key gets its own headers; each task stays pinned to the key that created it
+        self.keys = KeyPool([api_key, *(extra_api_keys or [])], {
             "X-Runway-Version": RUNWAY_API_VERSION,
             "Content-Type": "application/json"
-        }
+        })
+        self.headers = self.keys.primary.headers
+        # The underlying connection pool is created lazily and reused for every request
+        self._http = http_client
+        self._owns_http = http_client is None
+        # Token buckets shared by every tool call that goes through this client
+        # The configured limits are per key, so a pool of keys gets proportionally more
+        self.rate_limiter = RateLimiter(
+            create_rate=RUNWAY_CREATE_RATE * len(self.keys),
+            create_burst=RUNWAY_CREATE_BURST * len(self.keys),
+            poll_rate=RUNWAY_POLL_RATE * len(self.keys),
+            poll_burst=RUNWAY_POLL_BURST * len(self.keys)
+        )
+        # Which failures are retried, and how long to back off between attempts
+        self.retry_policy = RetryPolicy(
+            max_retries=RUNWAY_RETRY_MAX,
+            base_delay=RUNWAY_RETRY_BASE_DELAY,
+            max_delay=RUNWAY_RETRY_MAX_DELAY,
+            deadline=RUNWAY_RETRY_DEADLINE
+        )
+        self.retry_counts: Dict[str, int] = {}
+        # Lanes and priorities that generation tools queue in before creating a task
+        self.scheduler = Scheduler(
+            {lane: limit * len(self.keys) for lane, limit in RUNWAY_LANE_LIMITS.items()},
+            default_limit=RUNWAY_LANE_DEFAULT_LIMIT * len(self.keys),
+            interactive_reserve=RUNWAY_LANE_INTERACTIVE_RESERVE
+        )
+        # One background loop polls every task this client is waiting on
+        self.poller = TaskPoller(self.get_task, max_concurrency=RUNWAY_POLL_CONCURRENCY)
+        # Optional persistent record of created tasks, kept current by _on_task_update
+        self.task_store = task_store
+        self._tracking: Set["asyncio.Task[None]"] = set()
+        # Identical task creations that are in flight (or just finished), keyed by payload hash
+        self._inflight_creates: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self.coalesced_creates = 0
+        # Fingerprint of the local file behind each runway:// URI uploaded here, for stable request keys
+        self._upload_sources: Dict[str, str] = {}
+        # Uploads in flight (or recently finished), keyed by file fingerprint
+        self._uploads: Dict[str, "asyncio.Task[str]"] = {}
+        # Tasks a coalesced create handed to more than one caller; never cancelled on one caller's behalf
+        self._shared_tasks: Set[str] = set()
+        # Background cancellations of abandoned tasks; the ones still in their grace period are dropped on close
+        self._cancelling: Set["asyncio.Task[None]"] = set()
+        self._cancel_pending: Set["asyncio.Task[None]"] = set()
+        self._closing = False
+        # Counters and latency histograms for get_server_metrics
+        self.metrics = MetricsRegistry()
+        self._register_metrics()
+        # Creation time, model and poll count of tasks created here, until they finish
+        self._task_meta: Dict[str, List[Any]] = {}
+        self.poller.on_update = self._on_task_update
+    
+    def _register_metrics(self) -> None:
+        """Declare every metric this client reports"""
+        m = self.metrics
+        m.histogram("runway_request_seconds", "Latency of each Runway API request by method and endpoint")
+        m.histogram("runway_rate_limit_wait_seconds", "Time spent queued for a rate limit token by budget")
+        m.histogram("runway_task_duration_seconds", "Create-to-finish time of succeeded tasks by model", TASK_DURATION_BUCKETS)
+        m.histogram("runway_task_polls", "Status polls needed per task by model", POLL_COUNT_BUCKETS)
+        m.histogram("runway_queue_wait_seconds", "Time a generation waited for a scheduler slot by lane and priority", TASK_DURATION_BUCKETS)
+        m.counter("runway_tasks_total", "Finished tasks by model and final status")
+        m.counter("runway_request_errors_total", "Failed API requests by endpoint and error kind")
+        m.counter("runway_retries_total", "Retried API requests by reason")
+        m.counter("runway_throttled_total", "HTTP 429 responses by rate limit budget")
+        m.counter("runway_coalesced_creates_total", "Task creations that joined an identical in-flight task")
+        m.counter("runway_key_cooldowns_total", "API keys put in cool-down after HTTP 429, by key fingerprint")
+        m.counter("runway_abandoned_tasks_total", "Tasks cancelled because their caller gave up, by reason and result")
+        m.gauge("runway_tasks_in_flight", "Tasks currently being polled", lambda: self.poller.watched)
+        m.gauge("runway_task_waiters", "Callers currently waiting on a task", lambda: self.poller.waiters)
+        m.gauge("runway_rate_limit_queued", "Requests queued for a rate limit token", lambda: self.rate_limiter.waiting)
+        m.gauge("runway_scheduler_queued", "Generations waiting for a scheduler slot", lambda: self.scheduler.queued)
+    
+    def _remember_created(self, task_id: str, model: str) -> None:
+        """Start the create-to-finish clock for a new task"""
+        self._task_meta[task_id] = [time.monotonic(), model, 0]
+        # Tasks nobody ever polls would otherwise be remembered forever
+        if len(self._task_meta) > 10000:
+            self._task_meta.pop(next(iter(self._task_meta)))
+    
+    def _on_task_update(self, task_id: str, task: Dict[str, Any]) -> None:
+        """Called by the poller with every fetched task: keeps the store and task metrics current"""
+        if self.task_store is not None:
+            self.task_store.record_status(task_id, task)
+        
+        meta = self._task_meta.get(task_id)
+        if meta is None:
+            return
+        meta[2] += 1
+        status = task.get("status")
+        if status in TERMINAL_STATUSES:
+            self._shared_tasks.discard(task_id)
+            created_at, model, polls = self._task_meta.pop(task_id)
+            self.metrics.inc("runway_tasks_total", model=model, status=status)
+            self.metrics.observe("runway_task_polls", polls, model=model)
+            if status == "SUCCEEDED":
+                self.metrics.observe("runway_task_duration_seconds", time.monotonic() - created_at, model=model)
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Long-lived pooled HTTP client shared by all requests from this instance"""
+        if self._http is None or self._http.is_closed:
+            self._http = build_http_client()
+            self._owns_http = True
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Stop polling and close the connection pool (only if this instance created it)"""
+        self._closing = True
+        for tracker in list(self._tracking):
+            tracker.cancel()
+        # Calls abandoned because the server is shutting down leave their tasks running to be resumed
+        for canceller in list(self._cancel_pending):
+            canceller.cancel()
+        if self._cancelling:
+            await asyncio.gather(*self._cancelling, return_exceptions=True)
+        await self.poller.aclose()
+        if self._http is not None and self._owns_http and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+    
+    async def __aenter__(self) -> "RunwayAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make authenticated API request"""
+        """
+        Make authenticated API request.
+        
+        Every request waits for a token from the shared rate limiter. On HTTP 429
+        the matching budget is paused for the server's Retry-After and the request
+        is queued again, up to RUNWAY_RATE_LIMIT_MAX_RETRIES times.
+        
+        Transient failures (connection errors, timeouts, 5xx) are retried with
+        backoff and jitter when the retry policy says the request is safe to
+        repeat: status polls always, task creation only if it was never sent.
+        
+        Requests about a task use the API key that created it; anything else goes
+        to the pool key with the fewest tasks in flight. A key throttled with 429
+        cools down, and the request moves straight to another key when one is free;
+        requests pinned to the throttled key wait for it alone. The shared budget is
+        only paused once every key is throttled.
+        """
+        result, _ = await self._send(method, endpoint, **kwargs)
+        return result
+    
+    async def _send(self, method: str, endpoint: str, **kwargs) -> Tuple[Dict[str, Any], PooledKey]:
+        """_request, also returning the pool key that the successful attempt used"""
         url = f"{self.base_url}{endpoint}"
+        bucket = self.rate_limiter.bucket_for(method, endpoint)
+        policy = self.retry_policy
+        metrics = self.metrics
+        label = endpoint_label(endpoint)
+        deadline = time.monotonic() + policy.deadline
+        throttled = 0
+        retries = 0
+        task_id = endpoint.split("/")[2] if endpoint.startswith("/tasks/") else None
+        key = self.keys.for_task(task_id) if task_id else self.keys.choose()
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=self.headers,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
+        while True:
+            if task_id is not None and key.cooling_down():
+                # A request pinned to a throttled key waits out its cool-down without pausing the other keys
+                await asyncio.sleep(key.cooldown_until - time.monotonic())
+            queued_at = time.perf_counter()
+            await bucket.acquire()
+            sent_at = time.perf_counter()
+            metrics.observe("runway_rate_limit_wait_seconds", sent_at - queued_at, budget=bucket.name)
+            failure: Optional[Exception] = None
+            try:
+                with get_tracer().span(
+                    "runway.request", method=method, endpoint=label,
+                    attempt=retries + throttled + 1, queued_ms=round((sent_at - queued_at) * 1000, 3)
+                ) as span:
+                    response = await self.http.request(
+                        method=method,
+                        url=url,
+                        headers=key.headers,
+                        **kwargs
+                    )
+                    span.set_attribute("status_code", response.status_code)
+            except httpx.TransportError as e:
+                metrics.observe("runway_request_seconds", time.perf_counter() - sent_at, method=method, endpoint=label)
+                metrics.inc("runway_request_errors_total", endpoint=label, kind=type(e).__name__)
+                if not policy.should_retry_error(method, endpoint, e):
+                    raise
+                failure = e
+                reason = type(e).__name__
+            else:
+                metrics.observe("runway_request_seconds", time.perf_counter() - sent_at, method=method, endpoint=label)
+                if response.is_error:
+                    metrics.inc("runway_request_errors_total", endpoint=label, kind=str(response.status_code))
+                if response.status_code == 429 and throttled < RUNWAY_RATE_LIMIT_MAX_RETRIES:
+                    # Fall back to exponential backoff when Runway does not say how long to wait
+                    delay = parse_retry_after(response.headers.get("Retry-After"), default=2.0 ** throttled)
+                    metrics.inc("runway_throttled_total", budget=bucket.name)
+                    throttled += 1
+                    self.keys.cool_down(key, delay)
+                    metrics.inc("runway_key_cooldowns_total", key=key.id)
+                    if self.keys.available_besides(key):
+                        # New work moves to another key; pinned requests stay on theirs
+                        if task_id is None:
+                            key = self.keys.choose()
+                        continue
+                    # Every key is throttled, so the shared budget waits too
+                    bucket.pause(delay)
+                    continue
+                if not policy.should_retry_status(method, endpoint, response.status_code):
+                    response.raise_for_status()
+                    return response.json(), key
+                reason = f"HTTP {response.status_code}"
+            
+            delay = policy.backoff(retries)
+            if retries >= policy.max_retries or time.monotonic() + delay > deadline:
+                if failure is not None:
+                    raise failure
+                response.raise_for_status()
+            
+            retries += 1
+            self.retry_counts[reason] = self.retry_counts.get(reason, 0) + 1
+            metrics.inc("runway_retries_total", reason=reason)
+            await asyncio.sleep(delay)
     
     async def create_task(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new generation task"""
-        return await self._request("POST", endpoint, json=data)
+        """
+        Create a new generation task (recorded in the task store when one is attached).
+        
+        Identical seeded payloads for the same endpoint are single-flighted: while
+        one is in flight, and for RUNWAY_CREATE_COALESCE_WINDOW seconds after it
+        returns, duplicate calls attach to the same Runway task instead of creating
+        another. Without a seed every call asks for a new random result, so unseeded
+        payloads always create their own task.
+        """
+        if not RUNWAY_CREATE_COALESCE or data.get("seed") is None:
+            return await self._create_task(endpoint, data)
+        
+        key = request_key(endpoint, self.media_key(data))
+        existing = self._inflight_creates.get(key)
+        if existing is not None:
+            self.coalesced_creates += 1
+            self.metrics.inc("runway_coalesced_creates_total")
+            with get_tracer().span("create_task", endpoint=endpoint, coalesced=True):
+                task = dict(await asyncio.shield(existing))
+            self._shared_tasks.add(task.get("id"))
+            return task
+        
+        loop = asyncio.get_running_loop()
+        # The POST runs as its own task so cancelling the caller that started it
+        # neither cancels the duplicates waiting on it nor loses the created task
+        creation = loop.create_task(self._create_task(endpoint, data))
+        self._inflight_creates[key] = creation
+        
+        def forget() -> None:
+            if self._inflight_creates.get(key) is creation:
+                del self._inflight_creates[key]
+        
+        def settle(done: "asyncio.Future[Dict[str, Any]]") -> None:
+            # Reading the exception also marks it retrieved when no duplicate was waiting
+            if done.cancelled() or done.exception() is not None:
+                forget()
+            else:
+                # Late duplicates within the window still join this task
+                loop.call_later(RUNWAY_CREATE_COALESCE_WINDOW, forget)
+        
+        creation.add_done_callback(settle)
+        return dict(await asyncio.shield(creation))
+    
+    async def _create_task(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with get_tracer().span("create_task", endpoint=endpoint, model=data.get("model")) as span:
+            task, key = await self._send("POST", endpoint, json=data)
+            span.set_attribute("task_id", task.get("id"))
+        if "id" in task:
+            self.keys.pin(task["id"], key)
+            self._remember_created(task["id"], data.get("model") or endpoint)
+        if self.task_store is not None and "id" in task:
+            self.task_store.record_created(task["id"], endpoint, data, api_key_id=key.id)
+            self.track_task(task["id"], model=data.get("model"), endpoint=endpoint)
+        return task
     
     async def get_task(self, task_id: str) -> Dict[str, Any]:
         """Get task status and results"""
-        return await self._request("GET", f"/tasks/{task_id}")
+        task = await self._request("GET", f"/tasks/{task_id}")
+        if task.get("status") in TERMINAL_STATUSES:
+            self.keys.finished(task_id)
+        return task
+    
+    async def cancel_task(self, task_id: str) -> None:
+        """Cancel a task with the key that created it"""
+        await self._request("POST", f"/tasks/{task_id}/cancel")
+        self.keys.finished(task_id)
+        # Recorded like a polled status, so the store, metrics and status cache see it at once
+        self.poller.remember(task_id, {"id": task_id, "status": "CANCELLED"})
+    
+    def hold_slot(
+        self,
+        task_id: str,
+        lane: str,
+        priority: str,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> None:
+        """
+        Keep the scheduler slot of a task nobody waits on until the task finishes.
+        
+        A background wait on the shared poller releases the slot once the task
+        reaches a terminal state, is cancelled, or has run for RUNWAY_TASK_TRACK_MAX_WAIT.
+        """
+        holder = asyncio.get_running_loop().create_task(self._hold_slot(task_id, lane, priority, model, endpoint))
+        self._tracking.add(holder)
+        holder.add_done_callback(self._tracking.discard)
+    
+    async def _hold_slot(self, task_id: str, lane: str, priority: str, model: Optional[str], endpoint: Optional[str]) -> None:
+        try:
+            await self.wait_for_task(task_id, max_wait=RUNWAY_TASK_TRACK_MAX_WAIT, model=model, endpoint=endpoint)
+        except Exception:
+            # Failed, cancelled and lost tasks free their slot all the same
+            pass
+        finally:
+            self.scheduler.release(lane, priority)
+    
+    def abandon(self, task_id: str, reason: str) -> None:
+        """
+        Cancel a task whose caller gave up on it ("aborted" or "timeout").
+        
+        The cancel request is sent in the background so a cancelled tool call
+        unwinds at once and its scheduler slot goes straight to queued work.
+        It waits RUNWAY_CANCEL_GRACE seconds first and is dropped if the client
+        closes meanwhile: a server shutting down cancels every call in flight,
+        and those tasks are resumed on the next start rather than cancelled.
+        Tasks that a coalesced create also handed to another caller keep running.
+        """
+        if self._closing or task_id in self._shared_tasks:
+            return
+        # Duplicates created later must not join a task that is being cancelled
+        for key, future in list(self._inflight_creates.items()):
+            if future.done() and not future.cancelled() and future.exception() is None and future.result().get("id") == task_id:
+                del self._inflight_creates[key]
+        canceller = asyncio.get_running_loop().create_task(self._cancel_abandoned(task_id, reason))
+        self._cancelling.add(canceller)
+        self._cancel_pending.add(canceller)
+        canceller.add_done_callback(self._cancelling.discard)
+        canceller.add_done_callback(self._cancel_pending.discard)
+    
+    async def _cancel_abandoned(self, task_id: str, reason: str) -> None:
+        await asyncio.sleep(RUNWAY_CANCEL_GRACE)
+        self._cancel_pending.discard(asyncio.current_task())
+        if self._closing:
+            return
+        try:
+            await self.cancel_task(task_id)
+        except Exception as e:
+            # Usually the task finished in the meantime
+            logger.warning("Could not cancel abandoned task %s: %s", task_id, e)
+            self.metrics.inc("runway_abandoned_tasks_total", reason=reason, result="error")
+        else:
+            logger.info("Cancelled task %s after the caller gave up (%s)", task_id, reason)
+            self.metrics.inc("runway_abandoned_tasks_total", reason=reason, result="cancelled")
     
     async def wait_for_task(
         self, 
         task_id: str, 
         max_wait: int = 300,
-        poll_interval: int = 5
+        poll_interval: Optional[float] = None,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Wait for task completion with polling"""
-        start_time = time.time()
+        """
+        Wait for task completion with adaptive polling.
+        
+        All waits go through the shared TaskPoller, so concurrent waits on the
+        same task ID are coalesced into one polling stream. The delay between
+        polls follows the schedule for `model` / `endpoint` (fast at first, then
+        exponential backoff with jitter, steered by the task's reported
+        progress). Pass `poll_interval` to force a fixed delay.
+        The returned task carries a `pollCount` entry with the number of polls made.
+        """
+        return await self.poller.wait(
+            task_id,
+            max_wait=max_wait,
+            model=model,
+            endpoint=endpoint,
+            poll_interval=poll_interval
+        )
+
+
+    def task_updates(
+        self,
+        task_id: str,
+        max_wait: int = 300,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iterator of updates for a task: status, progress and elapsed time.
+        
+        Shares the poller's single polling stream with every other waiter on the
+        task. The last update's `task` is the finished task; failures raise.
+        
+        Example:
+            async for update in client.task_updates(task_id):
+                print(update["status"], update["progress"], update["elapsed"])
+        """
+        return self.poller.updates(task_id, max_wait=max_wait, model=model, endpoint=endpoint)
+    
+    async def upload_file(self, path: str) -> str:
+        """
+        Stream a local file to Runway's upload endpoint and return its runway:// URI.
+        
+        The file is sent as a multipart body read in small chunks, so memory use
+        stays constant no matter how large the file is.
+        """
+        filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        
+        upload = await self._request("POST", "/uploads", json={"filename": filename, "type": "ephemeral"})
+        
+        with open(path, "rb") as f:
+            # Presigned upload URLs carry their own auth, so Runway headers are not sent
+            response = await self.http.post(
+                upload["uploadUrl"],
+                data=upload.get("fields") or {},
+                files={"file": (filename, f, content_type)}
+            )
+        response.raise_for_status()
+        return upload["runwayUri"]
+    
+    async def resolve_media(self, value: Optional[str]) -> Optional[str]:
+        """
+        Upload `value` if it is a local file path; URLs and data URIs pass through unchanged.
         
-        while time.time() - start_time < max_wait:
-            task = await self.get_task(task_id)
-            status = task.get("status")
+        Callers naming the same unchanged file share one upload, for
+        RUNWAY_UPLOAD_REUSE_WINDOW seconds after it finishes.
+        """
+        path = local_media_path(value)
+        if path is None:
+            return value
+        fingerprint = file_fingerprint(path)
+        upload = self._uploads.get(fingerprint)
+        if upload is None:
+            loop = asyncio.get_running_loop()
+            upload = loop.create_task(self.upload_file(path))
+            self._uploads[fingerprint] = upload
             
-            if status == "SUCCEEDED":
-                return task
-            elif status == "FAILED":
-                raise Exception(f"Task failed: {task.get('failure', 'Unknown error')}")
-            elif status in ["CANCELLED", "EXPIRED"]:
-                raise Exception(f"Task {status.lower()}")
+            def forget() -> None:
+                if self._uploads.get(fingerprint) is upload:
+                    del self._uploads[fingerprint]
+            
+            def settle(done: "asyncio.Task[str]") -> None:
+                if done.cancelled() or done.exception() is not None:
+                    forget()
+                else:
+                    loop.call_later(RUNWAY_UPLOAD_REUSE_WINDOW, forget)
             
-            await asyncio.sleep(poll_interval)
+            upload.add_done_callback(settle)
+        # Shielded so one caller giving up does not fail the others sharing this upload
+        uri = await asyncio.shield(upload)
+        self._upload_sources[uri] = fingerprint
+        if len(self._upload_sources) > 10000:
+            self._upload_sources.pop(next(iter(self._upload_sources)))
+        return uri
+    
+    async def resolve_request_media(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Request body with every local file it names uploaded and replaced by its runway:// URI"""
+        values: List[str] = []
+        map_media(data, lambda value: values.append(value) or value)
+        local = [value for value in dict.fromkeys(values) if local_media_path(value)]
+        if not local:
+            return data
+        uris = dict(zip(local, await asyncio.gather(*(self.resolve_media(value) for value in local))))
+        return map_media(data, lambda value: uris.get(value, value))
+    
+    def media_key(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Request body as the result cache and create coalescing see it.
+        
+        Upload URIs are new on every upload, so local files (and URIs uploaded
+        from them) are replaced by the file's path, size and modification time.
+        """
+        def source(value: str) -> str:
+            path = local_media_path(value)
+            if path is not None:
+                return file_fingerprint(path)
+            return self._upload_sources.get(value, value)
+        
+        return map_media(data, source)
+    
+    def track_task(self, task_id: str, model: Optional[str] = None, endpoint: Optional[str] = None) -> None:
+        """
+        Keep a stored task under the poller's watch until it finishes.
         
-        raise TimeoutError(f"Task did not complete within {max_wait} seconds")
+        This is what keeps the task store current for tasks nobody waits on, and
+        it coalesces with any tool that later waits on the same task.
+        """
+        tracker = asyncio.get_running_loop().create_task(self._track(task_id, model, endpoint))
+        self._tracking.add(tracker)
+        tracker.add_done_callback(self._tracking.discard)
+    
+    async def _track(self, task_id: str, model: Optional[str], endpoint: Optional[str]) -> None:
+        try:
+            await self.wait_for_task(task_id, max_wait=RUNWAY_TASK_TRACK_MAX_WAIT, model=model, endpoint=endpoint)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404 and self.task_store is not None:
+                # Runway no longer knows this task, so there is nothing left to resume
+                self.task_store.record_status(task_id, {"status": "EXPIRED", "failure": "Task not found"})
+        except Exception:
+            # Failures are already recorded through the poller; timeouts are resumed next start
+            pass
+    
+    async def resume_unfinished(self) -> int:
+        """Reattach the poller to every stored task that had not finished; returns how many"""
+        if self.task_store is None:
+            return 0
+        rows = await asyncio.to_thread(self.task_store.unfinished)
+        for row in rows:
+            self.keys.pin_by_id(row["task_id"], row.get("api_key_id"))
+            self.track_task(row["task_id"], model=row.get("model"), endpoint=row.get("endpoint"))
+        return len(rows)
+
+
+# Shared client handed out to every tool call
+# It is opened by the server lifespan and closed when the last session shuts down
+_shared_client: Optional[RunwayAPIClient] = None
+_task_store: Optional["TaskStore"] = None
+_lifespan_users = 0
+
+
+def configured_api_keys() -> List[str]:
+    """RUNWAY_API_KEY followed by RUNWAY_API_KEYS, without duplicates"""
+    keys = list(dict.fromkeys(k for k in [RUNWAY_API_KEY, *RUNWAY_API_KEYS] if k))
+    # The simulator accepts any key, so none has to be configured
+    if not keys and RUNWAY_SIMULATOR:
+        keys = ["simulator"]
+    return keys
 
 
 def get_client() -> RunwayAPIClient:
-    """Get authenticated Runway API client"""
-    if not RUNWAY_API_KEY:
+    """Get the shared, authenticated Runway API client"""
+    global _shared_client
+    api_keys = configured_api_keys()
+    if not api_keys:
         raise ValueError("RUNWAY_API_KEY environment variable not set")
-    return RunwayAPIClient(RUNWAY_API_KEY)
+    if _shared_client is None:
+        _shared_client = RunwayAPIClient(api_keys[0], task_store=get_task_store(), extra_api_keys=api_keys[1:])
+    return _shared_client
+
+
+def get_task_store() -> Optional["TaskStore"]:
+    """Open the persistent task store, or None when RUNWAY_TASK_STORE is disabled"""
+    global _task_store
+    # Simulated tasks must not be resumed against the real API later
+    if RUNWAY_SIMULATOR:
+        return None
+    if _task_store is None and RUNWAY_TASK_STORE.lower() not in ("", "off", "none", "false", "0"):
+        try:
+            from .task_store import TaskStore
+            _task_store = TaskStore(
+                os.path.expanduser(RUNWAY_TASK_STORE),
+                RUNWAY_TASK_STORE_FLUSH_INTERVAL,
+                retention=RUNWAY_TASK_STORE_RETENTION_DAYS * 86400
+            )
+        except Exception as e:
+            logger.warning("Task store disabled, could not open %s: %s", RUNWAY_TASK_STORE, e)
+    return _task_store
+
+
+async def close_client() -> None:
+    """Close the shared client and release its pooled connections"""
+    global _shared_client, _task_store
+    if _shared_client is not None:
+        client, _shared_client = _shared_client, None
+        await client.aclose()
+    if _task_store is not None:
+        store, _task_store = _task_store, None
+        await store.aclose()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Keep one pooled Runway client alive for as long as the server is running"""
+    global _lifespan_users
+    _lifespan_users += 1
+    resuming: Optional["asyncio.Task[None]"] = None
+    if _lifespan_users == 1 and configured_api_keys() and not RUNWAY_SIMULATOR:
+        # Runs in the background so opening the task store never delays the first tool listing
+        resuming = asyncio.get_running_loop().create_task(resume_unfinished_tasks())
+    try:
+        yield
+    finally:
+        _lifespan_users -= 1
+        if resuming is not None and not resuming.done():
+            resuming.cancel()
+        if _lifespan_users == 0:
+            await close_client()
+
+
+async def resume_unfinished_tasks() -> None:
+    """Pick up waits that were interrupted when the previous server process exited"""
+    try:
+        resumed = await get_client().resume_unfinished()
+        if resumed:
+            logger.info("Resumed polling for %d unfinished task(s)", resumed)
+    except Exception as e:
+        logger.warning("Could not resume unfinished tasks: %s", e)
+
+
+class TracedFastMCP(FastMCP):
+    """FastMCP server that opens a trace span around every tool call"""
+    
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        with get_tracer().span(f"tool {name}", tool=name):
+            return await super().call_tool(name, arguments)
+
+
+set_tracer(build_tracer(RUNWAY_TRACING, RUNWAY_TRACE_FILE))
+
+# Initialize FastMCP server
+mcp = TracedFastMCP("Runway AI Video Generation", lifespan=lifespan)
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Shared cache of seeded results, or None unless RUNWAY_RESULT_CACHE is enabled"""
+    global _result_cache
+    if _result_cache is None and RUNWAY_RESULT_CACHE:
+        _result_cache = ResultCache(
+            max_entries=RUNWAY_RESULT_CACHE_SIZE,
+            ttl=RUNWAY_RESULT_CACHE_TTL,
+            directory=os.path.expanduser(RUNWAY_RESULT_CACHE_DIR) if RUNWAY_RESULT_CACHE_DIR else None
+        )
+    return _result_cache
+
+
+_response_encoder: Optional[ResponseEncoder] = None
+
+
+def respond(result: Any, fields: Optional[List[str]] = None) -> str:
+    """Serialize a tool result with the shared encoder, keeping only `fields` when given"""
+    return get_response_encoder().encode(result, fields)
+
+
+def get_response_encoder() -> ResponseEncoder:
+    global _response_encoder
+    if _response_encoder is None:
+        _response_encoder = ResponseEncoder(
+            pretty=RUNWAY_RESPONSE_FORMAT.lower() == "pretty",
+            backend=RUNWAY_JSON_BACKEND.lower()
+        )
+    return _response_encoder
+
+
+def session_key(ctx: Optional[Context]) -> str:
+    """Identifies the MCP session a tool call came from, so the scheduler can share lanes fairly"""
+    if ctx is None:
+        return "default"
+    try:
+        return f"session-{id(ctx.session)}"
+    except Exception:
+        return "default"
+
+
+async def report_progress(ctx: Optional[Context], progress: float, total: float = 1.0, message: Optional[str] = None) -> None:
+    """Send an MCP progress notification; a client that cannot receive it never fails the tool"""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(progress, total=total, message=message)
+    except Exception as e:
+        logger.debug("Could not send progress notification: %s", e)
+
+
+async def run_generation(
+    client: RunwayAPIClient,
+    endpoint: str,
+    data: Dict[str, Any],
+    wait_for_completion: bool,
+    max_wait: int = 600,
+    model: Optional[str] = None,
+    ctx: Optional[Context] = None,
+    priority: str = "interactive",
+    session: Optional[str] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Create a task and, if asked, wait for it - the flow shared by every generation tool.
+    
+    Returns the task ID and the finished task (None when not waiting).
+    Requests with an explicit seed are reproducible, so when the result cache
+    is enabled they are answered from it; hits are marked with `cached: True`.
+    With an MCP context, every poll is forwarded as a progress notification.
+    Requests the capability registry knows to be invalid raise before anything is sent.
+    Local files named in `data` are uploaded here, after the cache lookup.
+    
+    The task runs in its model family's scheduler lane: it queues behind higher
+    priority work and other sessions' turns, and holds its slot until it finishes,
+    also when the call returns without waiting.
+    When the wait is cancelled the Runway task is cancelled too (RUNWAY_CANCEL_ON_ABORT),
+    and likewise when it times out if RUNWAY_CANCEL_ON_TIMEOUT is set.
+    """
+    if RUNWAY_VALIDATE_REQUESTS:
+        validate_request(endpoint, data)
+    
+    cache = get_result_cache() if wait_for_completion and data.get("seed") is not None else None
+    if cache is not None:
+        # Checked before any local file is uploaded, so a hit costs no upload
+        cache_key = client.media_key(data)
+        hit = cache.get(endpoint, cache_key)
+        if hit is not None:
+            return hit.get("id"), dict(hit, cached=True, pollCount=0)
+    
+    data = await client.resolve_request_media(data)
+    lane = lane_for(endpoint, data.get("model"))
+    waited = await client.scheduler.acquire(lane, priority, session or session_key(ctx))
+    client.metrics.observe("runway_queue_wait_seconds", waited, lane=lane, priority=priority)
+    try:
+        task = await client.create_task(endpoint, data)
+        task_id = task["id"]
+    except BaseException:
+        client.scheduler.release(lane, priority)
+        raise
+    
+    if not wait_for_completion:
+        # The slot stays taken until the task finishes, not just until this call returns
+        client.hold_slot(task_id, lane, priority, model=model, endpoint=endpoint)
+        return task_id, None
+    
+    try:
+        if ctx is None:
+            result = await client.wait_for_task(task_id, max_wait=max_wait, model=model, endpoint=endpoint)
+        else:
+            progress = 0.0
+            async for update in client.task_updates(task_id, max_wait=max_wait, model=model, endpoint=endpoint):
+                # MCP progress must increase; finished updates often carry no progress at all
+                if update["status"] in TERMINAL_STATUSES:
+                    progress = 1.0
+                else:
+                    progress = max(progress, update.get("progress") or 0.0)
+                await report_progress(
+                    ctx,
+                    progress,
+                    message=f"{update['status']} - {update['elapsed']:.0f}s elapsed"
+                )
+                result = update["task"]
+    except asyncio.CancelledError:
+        # The MCP client cancelled the call, so nobody will collect this output
+        if RUNWAY_CANCEL_ON_ABORT:
+            client.abandon(task_id, "aborted")
+        raise
+    except TimeoutError:
+        if RUNWAY_CANCEL_ON_TIMEOUT:
+            client.abandon(task_id, "timeout")
+        raise
+    finally:
+        client.scheduler.release(lane, priority)
+    
+    if cache is not None:
+        cache.put(endpoint, cache_key, {k: v for k, v in result.items() if k != "pollCount"})
+    return task_id, result
 
 
 # ============================================================================
 # GEN-4 IMAGE GENERATION
 # ============================================================================
 
+def build_image_request(
+    prompt_text: str,
+    model: str = "gen4_image",
+    ratio: str = "1920:1080",
+    reference_images: Optional[List[Dict[str, str]]] = None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build the /images request body shared by the single and batch image tools"""
+    data = {
+        "model": model,
+        "promptText": prompt_text,
+        "ratio": ratio
+    }
+    
+    if reference_images:
+        data["referenceImages"] = reference_images
+    if seed is not None:
+        data["seed"] = seed
+    
+    return data
+
+
 @mcp.tool()
 async def generate_image_gen4(
     prompt_text: str,
@@ -115,7 +1036,9 @@ async def generate_image_gen4(
     ratio: ImageRatio = "1920:1080",
     reference_images: Optional[List[Dict[str, str]]] = None,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Generate high-quality images using Gen-4 Image models with reference image support.
@@ -126,11 +1049,12 @@ async def generate_image_gen4(
     Args:
         prompt_text: Text description of the image to generate. Use @tags to reference images.
         model: Model to use - gen4_image (high quality) or gen4_image_turbo (faster)
-        ratio: Image aspect ratio (1920:1080, 1080:1920, 1024:1024)
-        reference_images: List of reference images with uri and tag fields
+        ratio: Image aspect ratio (see list_available_models for every supported ratio)
+        reference_images: List of reference images with uri and tag fields (uri may be a local file path)
             Example: [{"uri": "https://...", "tag": "Character"}]
         seed: Random seed for reproducible results
         wait_for_completion: Wait for task to complete before returning
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with image URL or task ID if not waiting
@@ -142,31 +1066,122 @@ async def generate_image_gen4(
         )
     """
     client = get_client()
+    data = build_image_request(prompt_text, model, ratio, reference_images, seed)
     
-    data = {
-        "model": model,
-        "promptText": prompt_text,
-        "ratio": ratio
-    }
-    
-    if reference_images:
-        data["referenceImages"] = reference_images
-    if seed is not None:
-        data["seed"] = seed
+    task_id, result = await run_generation(client, "/images", data, wait_for_completion, max_wait=300, model=model, ctx=ctx)
     
-    task = await client.create_task("/images", data)
-    task_id = task["id"]
-    
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "image_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False),
             "model": model
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
+
+
+@mcp.tool()
+async def generate_images_batch(
+    images: List[Dict[str, Any]],
+    model: ImageModel = "gen4_image",
+    max_concurrency: int = RUNWAY_BATCH_CONCURRENCY,
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """
+    Generate many Gen-4 images in one call with bounded concurrency.
+    
+    Every image is submitted concurrently (at most `max_concurrency` at a time)
+    and waited on by the shared poller. A failing item is reported in its own
+    result and never aborts the rest of the batch.
+    
+    Args:
+        images: List of image specs. Each spec takes the same fields as generate_image_gen4:
+            prompt_text (required), ratio, seed, reference_images and an optional per-item model
+            Example: [{"prompt_text": "@Hero at dawn", "ratio": "1920:1080", "seed": 7,
+                       "reference_images": [{"uri": "https://...", "tag": "Hero"}]}]
+        model: Default model for specs that do not set their own
+        max_concurrency: Maximum number of images being generated at the same time
+        wait_for_completion: Wait for every image to complete before returning
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["results.image_url"]
+    
+    Returns:
+        Per-item results in input order with image URL or error, task ID and timings
+    
+    Example:
+        generate_images_batch(
+            images=[
+                {"prompt_text": "Storyboard frame 1: a lighthouse at dusk"},
+                {"prompt_text": "Storyboard frame 2: waves crash on the rocks", "seed": 42}
+            ],
+            model="gen4_image_turbo"
+        )
+    """
+    client = get_client()
+    session = session_key(ctx)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    batch_start = time.perf_counter()
+    finished = 0
+    
+    async def run_item(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+        item = await generate_item(index, spec)
+        # Batch progress is the number of finished images
+        nonlocal finished
+        finished += 1
+        await report_progress(ctx, finished, total=len(images), message=f"{finished}/{len(images)} images finished")
+        return item
+    
+    async def generate_item(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"index": index}
+        if not spec.get("prompt_text"):
+            item.update(status="error", error="Missing required field: prompt_text", elapsed_seconds=0.0)
+            return item
+        
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                item_model = spec.get("model", model)
+                data = build_image_request(
+                    spec["prompt_text"],
+                    item_model,
+                    spec.get("ratio", "1920:1080"),
+                    spec.get("reference_images"),
+                    spec.get("seed")
+                )
+                task_id, result = await run_generation(
+                    client, "/images", data, wait_for_completion, max_wait=300, model=item_model,
+                    priority="bulk", session=session
+                )
+                item["task_id"] = task_id
+                
+                if result is not None:
+                    item["status"] = "success"
+                    item["image_url"] = result["output"][0] if result.get("output") else None
+                    item["polls"] = result.get("pollCount")
+                    item["cached"] = result.get("cached", False)
+                else:
+                    item["status"] = "processing"
+            except Exception as e:
+                item["status"] = "error"
+                item["error"] = str(e)
+            item["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+        return item
+    
+    results = await asyncio.gather(*(run_item(i, spec) for i, spec in enumerate(images)))
+    succeeded = sum(1 for r in results if r["status"] != "error")
+    
+    return respond({
+        "status": "success" if succeeded == len(results) else "partial" if succeeded else "error",
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_seconds": round(time.perf_counter() - batch_start, 3),
+        "results": results
+    }, fields)
 
 
 # ============================================================================
@@ -177,9 +1192,11 @@ async def generate_image_gen4(
 async def generate_video_text_to_video(
     prompt_text: str,
     model: TextToVideoModel = "veo3.1",
-    ratio: VideoRatio = "1280:720",
+    ratio: TextToVideoRatio = "1280:720",
     duration: Duration = 4,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Generate videos from text descriptions using Google's Veo 3 models.
@@ -193,9 +1210,10 @@ async def generate_video_text_to_video(
             - veo3.1: High quality, best results
             - veo3.1_fast: Faster generation with good quality
             - veo3: Standard quality
-        ratio: Video aspect ratio (1280:720, 720:1280, 1104:832, 832:1104, 960:960, 1584:672)
+        ratio: Video aspect ratio (1280:720, 720:1280, 1920:1080 or 1080:1920)
         duration: Video length in seconds (4, 6, or 8)
         wait_for_completion: Wait for generation to complete
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with video URL or task ID
@@ -217,20 +1235,19 @@ async def generate_video_text_to_video(
         "duration": duration
     }
     
-    task = await client.create_task("/text_to_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/text_to_video", data, wait_for_completion, max_wait=600, model=model, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
             "model": model,
             "duration": duration
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
 
 
 # ============================================================================
@@ -245,7 +1262,9 @@ async def generate_video_image_to_video(
     ratio: VideoRatio = "1280:720",
     duration: int = 5,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Generate videos from images using Gen-4, Gen-3, or Veo models.
@@ -254,13 +1273,14 @@ async def generate_video_image_to_video(
     quality/speed tradeoffs.
     
     Args:
-        prompt_image: URL or base64 data URI of the input image
+        prompt_image: URL, base64 data URI, or local file path of the input image
         prompt_text: Optional text prompt for additional guidance (max 1000 characters)
         model: Video model to use (gen4_turbo, gen3a_turbo, veo3.1, veo3.1_fast, veo3)
         ratio: Video aspect ratio
-        duration: Video length in seconds (2-10)
+        duration: Video length in seconds (2-10 for gen4_turbo, 5 or 10 for gen3a_turbo, 4, 6 or 8 for Veo)
         seed: Random seed for reproducibility
         wait_for_completion: Wait for completion
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with video URL
@@ -287,25 +1307,51 @@ async def generate_video_image_to_video(
     if seed is not None:
         data["seed"] = seed
     
-    task = await client.create_task("/image_to_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/image_to_video", data, wait_for_completion, max_wait=600, model=model, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False),
             "model": model
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
 
 
 # ============================================================================
 # FIRST-LAST FRAME TO VIDEO
 # ============================================================================
 
+def build_first_last_frame_request(
+    first_frame: str,
+    last_frame: str,
+    prompt_text: Optional[str] = None,
+    model: str = "gen3a_turbo",
+    ratio: str = "1280:720",
+    duration: int = 5,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build the /first_last_frame_to_video request body shared by the single-shot and storyboard tools"""
+    data = {
+        "model": model,
+        "firstFrame": first_frame,
+        "lastFrame": last_frame,
+        "ratio": ratio,
+        "duration": duration
+    }
+    
+    if prompt_text:
+        data["promptText"] = prompt_text
+    if seed is not None:
+        data["seed"] = seed
+    
+    return data
+
+
 @mcp.tool()
 async def generate_video_first_last_frame(
     first_frame: str,
@@ -315,7 +1361,9 @@ async def generate_video_first_last_frame(
     ratio: VideoRatio = "1280:720",
     duration: int = 5,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Generate video with precise control over first and last frames.
@@ -324,45 +1372,144 @@ async def generate_video_first_last_frame(
     Perfect for precise storytelling and controlled animations.
     
     Args:
-        first_frame: URL or data URI of the first frame
-        last_frame: URL or data URI of the last frame
+        first_frame: URL, data URI, or local file path of the first frame
+        last_frame: URL, data URI, or local file path of the last frame
         prompt_text: Optional guidance for the transition
         model: Video model to use
         ratio: Video aspect ratio
         duration: Video length in seconds
         seed: Random seed
         wait_for_completion: Wait for completion
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with video URL
     """
     client = get_client()
     
-    data = {
-        "model": model,
-        "firstFrame": first_frame,
-        "lastFrame": last_frame,
-        "ratio": ratio,
-        "duration": duration
-    }
-    
-    if prompt_text:
-        data["promptText"] = prompt_text
-    if seed is not None:
-        data["seed"] = seed
+    data = build_first_last_frame_request(first_frame, last_frame, prompt_text, model, ratio, duration, seed)
     
-    task = await client.create_task("/first_last_frame_to_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/first_last_frame_to_video", data, wait_for_completion, max_wait=600, model=model, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "video_url": result["output"][0] if result.get("output") else None,
-            "task_id": task_id
-        }, indent=2)
+            "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False)
+        }, fields)
+    
+    return respond({"task_id": task_id, "status": "processing"}, fields)
+
+
+@mcp.tool()
+async def generate_storyboard(
+    keyframes: List[str],
+    prompts: Optional[List[Optional[str]]] = None,
+    model: ImageToVideoModel = "gen3a_turbo",
+    ratio: VideoRatio = "1280:720",
+    duration: int = 5,
+    seed: Optional[int] = None,
+    max_concurrency: int = RUNWAY_BATCH_CONCURRENCY,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """
+    Generate a multi-shot sequence from ordered keyframes in one call.
+    
+    Every pair of neighbouring keyframes becomes a first/last-frame transition
+    clip. All N-1 transitions are submitted at once (at most `max_concurrency`
+    at a time), so the whole storyboard takes about as long as one generation
+    instead of N-1 generations back to back.
+    
+    Args:
+        keyframes: Ordered keyframe images (URLs, data URIs or local file paths), at least two
+        prompts: Optional guidance per transition, prompts[i] for keyframes[i] -> keyframes[i+1]
+        model: Video model used for every transition
+        ratio: Video aspect ratio
+        duration: Length of each clip in seconds
+        seed: Random seed applied to every transition
+        max_concurrency: Maximum number of transitions generating at the same time
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["clips.video_url"]
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    Returns:
+        Ordered clip list with video URLs, task IDs and timings
+    
+    Example:
+        generate_storyboard(
+            keyframes=["shot1.png", "shot2.png", "shot3.png"],
+            prompts=["Camera pushes in on the door", "The door swings open to daylight"]
+        )
+    """
+    if len(keyframes) < 2:
+        return respond({"status": "error", "error": "A storyboard needs at least two keyframes"}, fields)
+    transitions = len(keyframes) - 1
+    prompts = list(prompts or [])
+    if len(prompts) > transitions:
+        return respond({
+            "status": "error",
+            "error": f"Got {len(prompts)} prompts for {transitions} transitions"
+        }, fields)
+    prompts += [None] * (transitions - len(prompts))
+    
+    # Every transition shares model, ratio and duration: reject a bad combination before uploading anything
+    if RUNWAY_VALIDATE_REQUESTS:
+        try:
+            validate_request("/first_last_frame_to_video", build_first_last_frame_request(
+                keyframes[0], keyframes[1], prompts[0], model, ratio, duration, seed
+            ))
+        except ValueError as e:
+            return respond({"status": "error", "error": str(e)}, fields)
+    
+    client = get_client()
+    session = session_key(ctx)
+    
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    storyboard_start = time.perf_counter()
+    finished = 0
+    
+    async def run_transition(index: int) -> Dict[str, Any]:
+        nonlocal finished
+        clip: Dict[str, Any] = {"index": index, "from_keyframe": index, "to_keyframe": index + 1}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Local keyframes are uploaded by run_generation on a cache miss;
+                # inner ones are shared by two transitions and reuse one upload
+                data = build_first_last_frame_request(
+                    keyframes[index], keyframes[index + 1], prompts[index], model, ratio, duration, seed
+                )
+                task_id, result = await run_generation(
+                    client, "/first_last_frame_to_video", data, True, max_wait=600, model=model,
+                    priority="bulk", session=session
+                )
+                clip["task_id"] = task_id
+                clip["status"] = "success"
+                clip["video_url"] = result["output"][0] if result.get("output") else None
+                clip["cached"] = result.get("cached", False)
+            except Exception as e:
+                clip["status"] = "error"
+                clip["error"] = str(e)
+            clip["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+        
+        finished += 1
+        await report_progress(ctx, finished, total=transitions, message=f"{finished}/{transitions} transitions finished")
+        return clip
+    
+    clips = await asyncio.gather(*(run_transition(i) for i in range(transitions)))
+    succeeded = sum(1 for c in clips if c["status"] == "success")
+    
+    return respond({
+        "status": "success" if succeeded == transitions else "partial" if succeeded else "error",
+        "total": transitions,
+        "succeeded": succeeded,
+        "failed": transitions - succeeded,
+        "elapsed_seconds": round(time.perf_counter() - storyboard_start, 3),
+        "sequential_seconds": round(sum(c["elapsed_seconds"] for c in clips), 3),
+        "model": model,
+        "clips": clips
+    }, fields)
 
 
 # ============================================================================
@@ -373,10 +1520,12 @@ async def generate_video_first_last_frame(
 async def edit_video_with_aleph(
     input_video: str,
     prompt_text: str,
-    ratio: VideoRatio = "1280:720",
+    ratio: VideoEditingRatio = "1280:720",
     reference_image: Optional[str] = None,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     ⭐ ALEPH VIDEO EDITING - Transform and edit existing videos with AI ⭐
@@ -391,7 +1540,7 @@ async def edit_video_with_aleph(
     This is Runway's breakthrough video-to-video editing technology!
     
     Args:
-        input_video: URL or data URI of the input video to edit
+        input_video: URL, data URI, or local file path of the input video to edit
         prompt_text: Editing instruction (max 1000 characters)
             Examples: "Add fireworks to the sky", "Remove the car from the scene",
             "Change to nighttime lighting"
@@ -399,6 +1548,7 @@ async def edit_video_with_aleph(
         reference_image: Optional reference image for style/lighting guidance
         seed: Random seed for reproducibility
         wait_for_completion: Wait for processing to complete
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with edited video URL
@@ -446,20 +1596,20 @@ async def edit_video_with_aleph(
         data["seed"] = seed
     
     # Aleph uses video-to-video endpoint
-    task = await client.create_task("/video_to_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/video_to_video", data, wait_for_completion, max_wait=600, model="gen4_aleph", ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "edited_video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False),
             "model": "gen4_aleph",
             "prompt": prompt_text
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
 
 
 # ============================================================================
@@ -475,7 +1625,9 @@ async def restyle_video(
     duration: int = 10,
     structure_transformation: float = 0.5,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Restyle existing videos with new aesthetic styles using Gen-3 models.
@@ -484,14 +1636,15 @@ async def restyle_video(
     Use text prompts, reference images, or both for style guidance.
     
     Args:
-        input_video: URL of the input video to restyle
+        input_video: URL or local file path of the input video to restyle
         style_prompt: Text description of desired style
         style_image: Optional reference image for style transfer
         model: Video model (gen3a_turbo or gen3_alpha)
-        duration: Video duration (up to 20s for Gen-3)
+        duration: Video duration (5 or 10 seconds)
         structure_transformation: How much to transform structure (0.0-1.0)
         seed: Random seed
         wait_for_completion: Wait for completion
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with restyled video URL
@@ -520,19 +1673,19 @@ async def restyle_video(
     if seed is not None:
         data["seed"] = seed
     
-    task = await client.create_task("/video_to_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/video_to_video", data, wait_for_completion, max_wait=600, model=model, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False),
             "style": style_prompt or "image-based"
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
 
 
 # ============================================================================
@@ -545,7 +1698,9 @@ async def extend_video(
     extension_duration: Literal[5, 10] = 10,
     prompt_text: Optional[str] = None,
     seed: Optional[int] = None,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Extend videos by generating continuation footage (Gen-3 feature).
@@ -554,11 +1709,12 @@ async def extend_video(
     The AI continues the motion and action naturally.
     
     Args:
-        input_video: URL of the video to extend
+        input_video: URL or local file path of the video to extend
         extension_duration: How many seconds to add (5 or 10)
         prompt_text: Optional guidance for the extension
         seed: Random seed
         wait_for_completion: Wait for completion
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with extended video URL
@@ -575,19 +1731,19 @@ async def extend_video(
     if seed is not None:
         data["seed"] = seed
     
-    task = await client.create_task("/extend_video", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/extend_video", data, wait_for_completion, max_wait=600, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "extended_video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
+            "cached": result.get("cached", False),
             "extension_seconds": extension_duration
-        }, indent=2)
+        }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    return respond({"task_id": task_id, "status": "processing"}, fields)
 
 
 # ============================================================================
@@ -597,7 +1753,9 @@ async def extend_video(
 @mcp.tool()
 async def upscale_video_4k(
     input_video: str,
-    wait_for_completion: bool = True
+    wait_for_completion: bool = True,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
 ) -> str:
     """
     Upscale videos to 4K resolution for production-ready quality.
@@ -605,8 +1763,9 @@ async def upscale_video_4k(
     Enhanced detail and clarity for professional outputs. Available for Gen-3 videos.
     
     Args:
-        input_video: URL of the video to upscale
+        input_video: URL or local file path of the video to upscale
         wait_for_completion: Wait for upscaling to complete
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Task result with 4K video URL
@@ -617,19 +1776,201 @@ async def upscale_video_4k(
         "promptVideo": input_video
     }
     
-    task = await client.create_task("/upscale", data)
-    task_id = task["id"]
+    task_id, result = await run_generation(client, "/upscale", data, wait_for_completion, max_wait=600, ctx=ctx)
     
-    if wait_for_completion:
-        result = await client.wait_for_task(task_id, max_wait=600)
-        return json.dumps({
+    if result is not None:
+        return respond({
             "status": "success",
             "upscaled_video_url": result["output"][0] if result.get("output") else None,
             "task_id": task_id,
+            "polls": result.get("pollCount"),
             "resolution": "4K"
-        }, indent=2)
+        }, fields)
+    
+    return respond({"task_id": task_id, "status": "processing"}, fields)
+
+
+# ============================================================================
+# MULTI-STAGE PIPELINES
+# ============================================================================
+
+# Stage types run_pipeline understands: the endpoint, the request field that receives the
+# previous stage's output, the default model and default request fields
+PIPELINE_STAGES: Dict[str, Dict[str, Any]] = {
+    "image": {"endpoint": "/images", "input": None, "model": "gen4_image", "defaults": {"ratio": "1920:1080"}},
+    "text_to_video": {"endpoint": "/text_to_video", "input": None, "model": "veo3.1", "defaults": {"ratio": "1280:720", "duration": 4}},
+    "image_to_video": {"endpoint": "/image_to_video", "input": "promptImage", "model": "gen4_turbo", "defaults": {"ratio": "1280:720", "duration": 5}},
+    "video_to_video": {"endpoint": "/video_to_video", "input": "videoUri", "model": "gen4_aleph", "defaults": {"ratio": "1280:720"}},
+    "upscale": {"endpoint": "/upscale", "input": "promptVideo", "model": None, "defaults": {}},
+}
+
+
+def build_stage_request(
+    stage: Dict[str, Any],
+    input_uri: Optional[str],
+    prompt_text: Optional[str],
+    seed: Optional[int] = None
+) -> Tuple[str, Dict[str, Any], Optional[str]]:
+    """Build the endpoint, request body and model for one pipeline stage"""
+    spec = PIPELINE_STAGES[stage["type"]]
+    model = stage.get("model", spec["model"])
+    data: Dict[str, Any] = {}
+    
+    if model:
+        data["model"] = model
+    if spec["input"]:
+        if not input_uri:
+            raise ValueError(f"Stage '{stage['type']}' needs an input image or video")
+        data[spec["input"]] = input_uri
+    if stage["type"] != "upscale":
+        if prompt_text:
+            data["promptText"] = prompt_text
+        elif stage["type"] != "image_to_video":
+            raise ValueError(f"Stage '{stage['type']}' needs a prompt_text")
+    for key, default in spec["defaults"].items():
+        data[key] = stage.get(key, default)
+    if stage.get("seed", seed) is not None:
+        data["seed"] = stage.get("seed", seed)
+    
+    return spec["endpoint"], data, model
+
+
+@mcp.tool()
+async def run_pipeline(
+    items: List[Dict[str, Any]],
+    stages: List[Dict[str, Any]],
+    max_concurrency: int = RUNWAY_BATCH_CONCURRENCY,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """
+    Run a multi-stage generation pipeline (e.g. image -> video -> 4K upscale) in one call.
+    
+    Each stage's output URL is passed straight to the next stage inside the server,
+    so there is no round-trip back to the agent between steps. Items move through
+    the stages independently: item 2's image is generated while item 1's video is
+    still rendering. Each stage runs at most `max_concurrency` tasks at a time, and
+    a failing item stops at its failing stage without affecting the others.
+    
+    Args:
+        items: What to run through the pipeline. Each item takes:
+            prompt_text - prompt for every stage that uses one
+            input - optional image/video URL or local path for a first stage that needs an input
+            prompts - optional per-stage prompt overrides keyed by stage name
+            seed - optional seed for every stage
+        stages: Ordered stages. Each stage takes a type (image, text_to_video, image_to_video,
+            video_to_video, upscale), an optional name (defaults to the type) and optional
+            model, ratio, duration, seed and prompt_text overrides
+        max_concurrency: Maximum tasks running at the same time within each stage
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["results.stages.output_url"]
+    
+    Returns:
+        Per-item stage results (task ID, output URL, timings) and per-stage timing summaries
+    
+    Example:
+        run_pipeline(
+            items=[
+                {"prompt_text": "A lighthouse at dusk, cinematic"},
+                {"prompt_text": "A fox in fresh snow", "prompts": {"animate": "The fox looks up"}}
+            ],
+            stages=[
+                {"type": "image", "model": "gen4_image_turbo"},
+                {"type": "image_to_video", "name": "animate", "duration": 5},
+                {"type": "upscale"}
+            ]
+        )
+    """
+    if not stages:
+        return respond({"status": "error", "error": "At least one stage is required"}, fields)
+    for stage in stages:
+        if stage.get("type") not in PIPELINE_STAGES:
+            return respond({
+                "status": "error",
+                "error": f"Unknown stage type: {stage.get('type')}. Valid types: {', '.join(PIPELINE_STAGES)}"
+            }, fields)
     
-    return json.dumps({"task_id": task_id, "status": "processing"}, indent=2)
+    client = get_client()
+    session = session_key(ctx)
+    names = [stage.get("name", stage["type"]) for stage in stages]
+    # One limit per stage, so a backlog of videos never blocks new images from starting
+    semaphores = [asyncio.Semaphore(max(1, max_concurrency)) for _ in stages]
+    total_steps = len(items) * len(stages)
+    finished_steps = 0
+    pipeline_start = time.perf_counter()
+    
+    async def step_done(name: str) -> None:
+        nonlocal finished_steps
+        finished_steps += 1
+        await report_progress(ctx, finished_steps, total=total_steps, message=f"{finished_steps}/{total_steps} stages finished ({name})")
+    
+    async def run_item(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        nonlocal finished_steps
+        result: Dict[str, Any] = {"index": index, "stages": []}
+        current = item.get("input")
+        
+        for position, (stage, name) in enumerate(zip(stages, names)):
+            step: Dict[str, Any] = {"stage": name}
+            result["stages"].append(step)
+            queued_at = time.perf_counter()
+            try:
+                prompt = item.get("prompts", {}).get(name) or stage.get("prompt_text") or item.get("prompt_text")
+                endpoint, data, model = build_stage_request(stage, current, prompt, item.get("seed"))
+                
+                async with semaphores[position]:
+                    started = time.perf_counter()
+                    step["queued_seconds"] = round(started - queued_at, 3)
+                    task_id, task = await run_generation(
+                        client, endpoint, data, True, max_wait=600, model=model, priority="bulk", session=session
+                    )
+                
+                step["task_id"] = task_id
+                step["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+                step["cached"] = task.get("cached", False)
+                current = task["output"][0] if task.get("output") else None
+                step["output_url"] = current
+                if current is None:
+                    raise Exception(f"Stage '{name}' finished without an output")
+                step["status"] = "success"
+            except Exception as e:
+                step["status"] = "error"
+                step["error"] = str(e)
+                result.update(status="error", error=f"Stage '{name}' failed: {e}")
+                # The stages this item will now skip count as done for progress
+                finished_steps += len(stages) - position - 1
+                return result
+            finally:
+                await step_done(name)
+        
+        result.update(status="success", output_url=current)
+        return result
+    
+    results = await asyncio.gather(*(run_item(i, item) for i, item in enumerate(items)))
+    succeeded = sum(1 for r in results if r["status"] == "success")
+    elapsed = time.perf_counter() - pipeline_start
+    
+    stage_timings = []
+    for name in names:
+        times = [s["elapsed_seconds"] for r in results for s in r["stages"] if s["stage"] == name and "elapsed_seconds" in s]
+        stage_timings.append({
+            "stage": name,
+            "completed": len(times),
+            "min_seconds": round(min(times), 3) if times else None,
+            "mean_seconds": round(sum(times) / len(times), 3) if times else None,
+            "max_seconds": round(max(times), 3) if times else None,
+        })
+    # What running every stage of every item one after another would have taken
+    sequential = sum(s.get("elapsed_seconds", 0) for r in results for s in r["stages"])
+    
+    return respond({
+        "status": "success" if succeeded == len(results) else "partial" if succeeded else "error",
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_seconds": round(elapsed, 3),
+        "sequential_seconds": round(sequential, 3),
+        "stage_timings": stage_timings,
+        "results": results
+    }, fields)
 
 
 # ============================================================================
@@ -637,48 +1978,221 @@ async def upscale_video_4k(
 # ============================================================================
 
 @mcp.tool()
-async def get_task_status(task_id: str) -> str:
+async def get_task_status(task_id: str, fields: Optional[List[str]] = None) -> str:
     """
     Check the status of any Runway generation task.
     
     Args:
         task_id: The task ID returned from any generation function
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Current task status and output if completed
     """
     client = get_client()
-    task = await client.get_task(task_id)
     
-    return json.dumps({
+    # Reuse the background poller's fresh result instead of making another API call
+    task = client.poller.cached(task_id, max_age=RUNWAY_STATUS_CACHE_TTL)
+    cached = task is not None
+    if task is None:
+        task = await client.get_task(task_id)
+        client.poller.remember(task_id, task)
+    
+    return respond({
         "task_id": task_id,
         "status": task.get("status"),
         "progress": task.get("progress"),
         "output": task.get("output"),
         "failure": task.get("failure"),
         "created_at": task.get("createdAt"),
-        "updated_at": task.get("updatedAt")
-    }, indent=2)
+        "updated_at": task.get("updatedAt"),
+        "cached": cached
+    }, fields)
 
 
 @mcp.tool()
-async def cancel_task(task_id: str) -> str:
+async def cancel_task(task_id: str, fields: Optional[List[str]] = None) -> str:
     """
     Cancel a running generation task.
     
     Args:
         task_id: The task ID to cancel
+        fields: Only return these result fields (status and error are always kept)
     
     Returns:
         Cancellation confirmation
     """
     client = get_client()
-    await client._request("POST", f"/tasks/{task_id}/cancel")
+    await client.cancel_task(task_id)
     
-    return json.dumps({
+    return respond({
         "task_id": task_id,
         "status": "cancelled"
-    }, indent=2)
+    }, fields)
+
+
+@mcp.tool()
+async def wait_for_tasks(
+    task_ids: List[str],
+    mode: Literal["all", "any", "first_n"] = "all",
+    count: Optional[int] = None,
+    timeout: float = 600,
+    fields: Optional[List[str]] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """
+    Wait for several tasks at once and return them in the order they finish.
+    
+    Use this after starting generations with wait_for_completion=False instead
+    of calling get_task_status in a loop. The tasks are watched by the server's
+    shared poller, so one call covers any number of IDs.
+    
+    Args:
+        task_ids: Task IDs returned from generation functions
+        mode: "all" waits for every task, "any" for the first to finish, "first_n" for the first `count`
+        count: Number of tasks to wait for in "first_n" mode
+        timeout: Seconds to wait before returning whatever has finished (default: 600)
+        fields: Only return these result fields (status and error are always kept)
+    
+    Returns:
+        Finished tasks in completion order (failed and cancelled ones included),
+        the IDs still pending, and status "complete" or "timeout"
+    
+    Example:
+        wait_for_tasks(task_ids=["task-1", "task-2", "task-3"], mode="first_n", count=2)
+    """
+    ids = list(dict.fromkeys(task_ids))
+    if not ids:
+        return respond({"status": "error", "error": "At least one task ID is required"}, fields)
+    if mode == "all":
+        wanted = len(ids)
+    elif mode == "any":
+        wanted = 1
+    elif mode == "first_n":
+        if count is None or not 1 <= count <= len(ids):
+            return respond({
+                "status": "error",
+                "error": f"first_n mode needs a count between 1 and {len(ids)}"
+            }, fields)
+        wanted = count
+    else:
+        return respond({"status": "error", "error": f"Unknown mode: {mode}. Valid modes: all, any, first_n"}, fields)
+    
+    client = get_client()
+    start = time.perf_counter()
+    
+    async def settle(task_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            task = await client.wait_for_task(task_id, max_wait=timeout)
+        except TimeoutError:
+            return None
+        except Exception as e:
+            # Failed tasks raise, but the poller keeps their final status
+            task = client.poller.cached(task_id, max_age=0)
+            if task is None:
+                return {"task_id": task_id, "status": "error", "error": str(e), "elapsed_seconds": round(time.perf_counter() - start, 3)}
+        return {
+            "task_id": task_id,
+            "status": task.get("status"),
+            "output": task.get("output"),
+            "failure": task.get("failure"),
+            "elapsed_seconds": round(time.perf_counter() - start, 3)
+        }
+    
+    waits = {asyncio.ensure_future(settle(task_id)): task_id for task_id in ids}
+    pending = set(waits)
+    completed: List[Dict[str, Any]] = []
+    try:
+        while pending and len(completed) < wanted:
+            remaining = timeout - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            # Tasks finishing on the same poll are reported in request order
+            for future in sorted(done, key=lambda f: ids.index(waits[f])):
+                if future.result() is not None:
+                    completed.append(future.result())
+            await report_progress(ctx, min(len(completed), wanted), total=wanted, message=f"{len(completed)}/{wanted} tasks finished")
+    finally:
+        # Leaving the shared watches stops polling for tasks nobody else waits on
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    finished = {entry["task_id"] for entry in completed}
+    return respond({
+        "status": "complete" if len(completed) >= wanted else "timeout",
+        "mode": mode,
+        "wanted": wanted,
+        "completed": completed,
+        "pending": [task_id for task_id in ids if task_id not in finished],
+        "elapsed_seconds": round(time.perf_counter() - start, 3)
+    }, fields)
+
+
+# ============================================================================
+# OUTPUT DOWNLOADS
+# ============================================================================
+
+@mcp.tool()
+async def download_outputs(
+    task_ids: List[str],
+    directory: str = RUNWAY_DOWNLOAD_DIR,
+    max_concurrency: int = RUNWAY_DOWNLOAD_CONCURRENCY,
+    fields: Optional[List[str]] = None
+) -> str:
+    """
+    Download every output of one or more finished tasks to a local directory.
+    
+    Output URLs are signed and expire, so use this to keep the files. Large files
+    are fetched as parallel HTTP range chunks and streamed straight to disk; an
+    interrupted download resumes from its completed chunks on the next call.
+    Each file is checked against the server's size and checksum.
+    
+    Args:
+        task_ids: IDs of SUCCEEDED tasks whose outputs should be downloaded
+        directory: Local directory to save files in (created if missing)
+        max_concurrency: Maximum number of chunks downloading at the same time
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["files.path"]
+    
+    Returns:
+        Per-file results with local path, size and SHA-256, or the error
+    
+    Example:
+        download_outputs(task_ids=["abc123", "def456"], directory="~/Videos/runway")
+    """
+    client = get_client()
+    directory = os.path.expanduser(directory)
+    os.makedirs(directory, exist_ok=True)
+    
+    outputs: List[Tuple[str, str, str]] = []
+    results: List[Dict[str, Any]] = []
+    for task_id in task_ids:
+        try:
+            task = client.poller.cached(task_id, max_age=RUNWAY_STATUS_CACHE_TTL) or await client.get_task(task_id)
+        except Exception as e:
+            results.append({"task_id": task_id, "status": "error", "error": str(e)})
+            continue
+        if task.get("status") != "SUCCEEDED":
+            results.append({"task_id": task_id, "status": "error", "error": f"Task is {task.get('status')}, not SUCCEEDED"})
+            continue
+        for index, url in enumerate(task.get("output") or []):
+            outputs.append((task_id, url, os.path.join(directory, output_filename(task_id, index, url))))
+    
+    downloader = OutputDownloader(
+        client.http,
+        max_concurrency=max_concurrency,
+        chunk_size=RUNWAY_DOWNLOAD_CHUNK_MB * 1024 * 1024
+    )
+    results.extend(await download_all(downloader, outputs))
+    
+    return respond({
+        "directory": directory,
+        "downloaded": sum(1 for r in results if r["status"] == "success"),
+        "failed": sum(1 for r in results if r["status"] == "error"),
+        "files": results
+    }, fields)
 
 
 # ============================================================================
@@ -686,107 +2200,103 @@ async def cancel_task(task_id: str) -> str:
 # ============================================================================
 
 @mcp.tool()
-async def list_available_models() -> str:
+async def list_available_models(fields: Optional[List[str]] = None) -> str:
     """
     List all available Runway models and their capabilities.
     
+    Generated from the same capability registry that validates every request
+    before it is submitted, so the endpoints, ratios and durations listed here
+    are exactly the ones the generation tools accept.
+    
+    Args:
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["video_generation"]
+    
     Returns:
         Comprehensive list of models and features
     """
-    models = {
-        "image_generation": {
-            "gen4_image": {
-                "description": "Gen-4 Image - Highest quality image generation",
-                "features": ["Reference images", "Tag-based composition", "1920:1080 resolution"],
-                "use_cases": ["Consistent characters", "Styled imagery", "High-fidelity art"]
-            },
-            "gen4_image_turbo": {
-                "description": "Gen-4 Image Turbo - Faster image generation",
-                "features": ["Quick generation", "Multiple ratios", "Cost-efficient"],
-                "use_cases": ["Rapid prototyping", "Batch generation", "Iterations"]
-            }
-        },
-        "video_generation": {
-            "gen4_turbo": {
-                "description": "Gen-4 Turbo - Fastest and most efficient video model",
-                "features": ["5-10s duration", "Multiple ratios", "High consistency"],
-                "use_cases": ["Quick video creation", "Text-to-video", "Image-to-video"]
-            },
-            "gen3a_turbo": {
-                "description": "Gen-3 Alpha Turbo - Fast Gen-3 variant",
-                "features": ["Up to 20s duration", "Advanced controls", "Video-to-video"],
-                "use_cases": ["Style transfer", "Extended videos", "Quick iterations"]
-            },
-            "gen3_alpha": {
-                "description": "Gen-3 Alpha - Highest quality Gen-3",
-                "features": ["Superior fidelity", "Expressive characters", "Complex scenes"],
-                "use_cases": ["Premium content", "Character animation", "Cinematic shots"]
-            }
-        },
-        "video_editing": {
-            "aleph": {
-                "description": "⭐ Aleph - Advanced video-to-video editing (Gen-4)",
-                "features": [
-                    "Add/remove/replace objects",
-                    "Generate new camera angles",
-                    "Transform lighting and style",
-                    "Shot continuation",
-                    "Novel view synthesis"
-                ],
-                "use_cases": [
-                    "Professional video editing",
-                    "Object manipulation",
-                    "Scene transformation",
-                    "Creative restyles"
-                ]
-            }
-        },
-        "special_features": {
-            "extend_video": "Extend videos by 5-10 seconds (Gen-3)",
-            "upscale_4k": "Upscale to 4K resolution",
-            "first_last_frame": "Precise control with start/end frames",
-            "keyframe_control": "Image as first or last frame",
-            "reference_images": "Consistent characters with @tags"
-        }
-    }
+    return get_response_encoder().static("models", list_models, fields)
+
+
+@mcp.tool()
+async def get_server_metrics(format: Literal["json", "prometheus"] = "json", fields: Optional[List[str]] = None) -> str:
+    """
+    Get live performance metrics for this server.
+    
+    Covers API latency per endpoint, create-to-finish time and polls per task
+    by model, errors, retries, 429 throttling, rate limit queueing, and the
+    number of tasks in flight and callers waiting on them.
     
-    return json.dumps(models, indent=2)
+    Args:
+        format: "json" for summaries with p50/p90/p99, or "prometheus" for the text exposition format
+        fields: Only return these result fields; dotted paths reach into lists, e.g. ["histograms"]
+    
+    Returns:
+        Metrics snapshot (empty until the first API call)
+    """
+    if _shared_client is None:
+        if format == "prometheus":
+            return ""
+        return respond({"counters": {}, "histograms": {}, "gauges": {}}, fields)
+    
+    if format == "prometheus":
+        return _shared_client.metrics.prometheus()
+    return respond(_shared_client.metrics.snapshot(), fields)
+
+
+# The part of get_api_info that never changes
+API_INFO = {
+    "server": "Runway MCP Server",
+    "version": "1.0.0",
+    "api_version": RUNWAY_API_VERSION,
+    "features": [
+        "Gen-4 Image & Video Generation",
+        "Gen-3 Alpha & Turbo Models",
+        "⭐ Aleph Video Editing (video-to-video)",
+        "Text-to-Video",
+        "Image-to-Video",
+        "First-Last Frame Control",
+        "Video Extension",
+        "4K Upscaling",
+        "Style Transfer",
+        "Reference Images",
+        "Keyframe Control"
+    ],
+    "setup": {
+        "required_env": "RUNWAY_API_KEY",
+        "get_api_key": "https://dev.runwayml.com",
+        "documentation": "https://docs.dev.runwayml.com"
+    }
+}
 
 
 @mcp.tool()
-async def get_api_info() -> str:
+async def get_api_info(fields: Optional[List[str]] = None) -> str:
     """
     Get information about the Runway MCP server and API configuration.
     
+    Args:
+        fields: Only return these result fields (status and error are always kept)
+    
     Returns:
         Server info and setup instructions
     """
     info = {
-        "server": "Runway MCP Server",
-        "version": "1.0.0",
-        "api_version": RUNWAY_API_VERSION,
-        "features": [
-            "Gen-4 Image & Video Generation",
-            "Gen-3 Alpha & Turbo Models",
-            "⭐ Aleph Video Editing (video-to-video)",
-            "Text-to-Video",
-            "Image-to-Video",
-            "First-Last Frame Control",
-            "Video Extension",
-            "4K Upscaling",
-            "Style Transfer",
-            "Reference Images",
-            "Keyframe Control"
-        ],
-        "setup": {
-            "required_env": "RUNWAY_API_KEY",
-            "get_api_key": "https://dev.runwayml.com",
-            "documentation": "https://docs.dev.runwayml.com"
-        },
-        "api_configured": bool(RUNWAY_API_KEY)
+        **API_INFO,
+        "api_configured": bool(configured_api_keys()),
+        "api_base": RUNWAY_API_BASE,
+        "simulator": RUNWAY_SIMULATOR,
+        "responses": {"format": RUNWAY_RESPONSE_FORMAT, "json_backend": get_response_encoder().backend},
+        # Live queue depth of the shared rate limiter (empty until the first API call)
+        "rate_limits": _shared_client.rate_limiter.stats() if _shared_client else {},
+        "retries": dict(_shared_client.retry_counts) if _shared_client else {},
+        "coalesced_creates": _shared_client.coalesced_creates if _shared_client else 0,
+        "scheduler": _shared_client.scheduler.stats() if _shared_client else {},
+        "cancel_abandoned": {"on_abort": RUNWAY_CANCEL_ON_ABORT, "on_timeout": RUNWAY_CANCEL_ON_TIMEOUT},
+        # Fingerprints only, never the keys themselves
+        "api_keys": _shared_client.keys.stats() if _shared_client else []
     }
     
-    return json.dumps(info, indent=2)
+    return respond(info, fields)
 
 
 def main():
@@ -0,0 +1,275 @@
+"""
+Local simulator of the Runway API
+Serves task creation, status, cancel, upload and output downloads in-process through an
+httpx transport, with configurable per-model timings, failure rates and 429 behaviour
+"""
+
+import json
+import time
+import random
+import asyncio
+import itertools
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, Tuple
+
+import httpx
+
+from .ratelimit import TokenBucket
+
+
+CREATE_ENDPOINTS = (
+    "/images",
+    "/text_to_video",
+    "/image_to_video",
+    "/first_last_frame_to_video",
+    "/video_to_video",
+    "/extend_video",
+    "/upscale",
+)
+
+# Model assumed when a request does not name one
+ENDPOINT_MODELS = {
+    "/images": "gen4_image",
+    "/text_to_video": "veo3.1",
+    "/image_to_video": "gen4_turbo",
+    "/first_last_frame_to_video": "gen3a_turbo",
+    "/video_to_video": "gen4_aleph",
+    "/extend_video": "gen3a_turbo",
+    "/upscale": "upscale_v1",
+}
+
+OUTPUT_PREFIX = "/_simulator/outputs/"
+UPLOAD_PREFIX = "/_simulator/uploads/"
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """How long a model's tasks queue and run, and how often they fail"""
+
+    queue_time: float = 2.0     # Seconds spent PENDING
+    run_time: float = 20.0      # Seconds spent RUNNING
+    jitter: float = 0.2         # +/- fraction applied to both times per task
+    failure_rate: float = 0.0   # Probability a task ends FAILED instead of SUCCEEDED
+
+
+# Rough shape of real Runway timings; override per model through SimulatorConfig.models
+DEFAULT_PROFILES: Dict[str, ModelProfile] = {
+    "gen4_image": ModelProfile(queue_time=1, run_time=8),
+    "gen4_image_turbo": ModelProfile(queue_time=1, run_time=4),
+    "gen4_turbo": ModelProfile(queue_time=2, run_time=25),
+    "gen3a_turbo": ModelProfile(queue_time=2, run_time=20),
+    "gen3_alpha": ModelProfile(queue_time=3, run_time=40),
+    "gen4_aleph": ModelProfile(queue_time=5, run_time=60),
+    "veo3.1": ModelProfile(queue_time=10, run_time=75),
+    "veo3.1_fast": ModelProfile(queue_time=5, run_time=35),
+    "veo3": ModelProfile(queue_time=10, run_time=60),
+    "upscale_v1": ModelProfile(queue_time=3, run_time=30),
+}
+
+
+@dataclass
+class SimulatorConfig:
+    """Everything the simulator can be tuned with; loadable from a JSON file"""
+
+    latency: float = 0.0          # Seconds slept before every response
+    time_scale: float = 1.0       # 10 makes every task finish ten times sooner
+    create_rate: float = 0.0      # Task creations per second before HTTP 429 (0 = unlimited)
+    create_burst: float = 5.0
+    poll_rate: float = 0.0        # Status requests per second before HTTP 429 (0 = unlimited)
+    poll_burst: float = 20.0
+    retry_after: float = 1.0      # Retry-After seconds sent with every 429
+    output_bytes: int = 64 * 1024  # Size of each generated output file
+    seed: Optional[int] = None
+    default: ModelProfile = field(default_factory=ModelProfile)
+    models: Dict[str, ModelProfile] = field(default_factory=lambda: dict(DEFAULT_PROFILES))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SimulatorConfig":
+        """Build a config from plain JSON data, merging `models` over the defaults"""
+        known = {f.name for f in fields(cls)} - {"default", "models"}
+        config = cls(**{k: v for k, v in data.items() if k in known})
+        if "default" in data:
+            config.default = ModelProfile(**data["default"])
+        for model, profile in data.get("models", {}).items():
+            config.models[model] = ModelProfile(**profile)
+        return config
+
+    @classmethod
+    def from_file(cls, path: str) -> "SimulatorConfig":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    def profile(self, model: str) -> ModelProfile:
+        return self.models.get(model, self.default)
+
+
+@dataclass
+class _SimTask:
+    task_id: str
+    model: str
+    created: float
+    queue_time: float
+    run_time: float
+    fails: bool
+    output_extension: str
+    cancelled: bool = False
+
+
+class RunwaySimulator:
+    """
+    In-process stand-in for the Runway API.
+
+    A task's status is derived from the time since it was created: PENDING
+    for its model's queue time, RUNNING (with progress) for its run time, then
+    SUCCEEDED or FAILED. Creation and polling can each be rate limited so the
+    client's 429 handling and pacing can be exercised offline.
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.requests = 0
+        self.throttled = 0
+        self._tasks: Dict[str, _SimTask] = {}
+        self._ids = itertools.count(1)
+        self._rng = random.Random(self.config.seed)
+        self._create_bucket = self._bucket(self.config.create_rate, self.config.create_burst)
+        self._poll_bucket = self._bucket(self.config.poll_rate, self.config.poll_burst)
+
+    def transport(self) -> httpx.MockTransport:
+        """httpx transport that answers every request from this simulator"""
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+
+        path = request.url.path
+        if path.startswith(OUTPUT_PREFIX):
+            return self._serve_output(request, path[len(OUTPUT_PREFIX):])
+        if path.startswith(UPLOAD_PREFIX):
+            return httpx.Response(204)
+
+        if not request.headers.get("Authorization"):
+            return httpx.Response(401, json={"error": "Missing API key"})
+        # Accept paths with or without the /v1 prefix of the real API
+        path = path[3:] if path.startswith("/v1/") else path
+
+        if request.method == "POST" and path in CREATE_ENDPOINTS:
+            if self._create_bucket is not None and not self._create_bucket.try_acquire():
+                return self._too_many_requests()
+            return self._create(request, path)
+        if request.method == "POST" and path == "/uploads":
+            return self._upload(request)
+        if path.startswith("/tasks/"):
+            if self._poll_bucket is not None and not self._poll_bucket.try_acquire():
+                return self._too_many_requests()
+            parts = path.split("/")
+            task = self._tasks.get(parts[2])
+            if task is None:
+                return httpx.Response(404, json={"error": "Task not found"})
+            if request.method == "DELETE":
+                task.cancelled = True
+                return httpx.Response(204)
+            if request.method == "POST" and parts[3:] == ["cancel"]:
+                task.cancelled = True
+                return httpx.Response(200, json={"id": task.task_id, "status": "CANCELLED"})
+            if request.method == "GET" and len(parts) == 3:
+                return httpx.Response(200, json=self.task_status(task, request))
+
+        return httpx.Response(404, json={"error": f"Unknown endpoint {request.method} {path}"})
+
+    def task_status(self, task: _SimTask, request: httpx.Request) -> Dict[str, Any]:
+        """The task as GET /tasks/{id} would return it right now"""
+        body: Dict[str, Any] = {"id": task.task_id}
+        elapsed = (time.monotonic() - task.created) * self.config.time_scale
+
+        if task.cancelled:
+            body["status"] = "CANCELLED"
+        elif elapsed < task.queue_time:
+            body["status"] = "PENDING"
+        elif elapsed < task.queue_time + task.run_time:
+            body["status"] = "RUNNING"
+            body["progress"] = round((elapsed - task.queue_time) / task.run_time, 3)
+        elif task.fails:
+            body["status"] = "FAILED"
+            body["failure"] = "Simulated failure"
+            body["failureCode"] = "SIMULATED"
+        else:
+            body["status"] = "SUCCEEDED"
+            body["output"] = [
+                f"{request.url.scheme}://{request.url.host}{OUTPUT_PREFIX}{task.task_id}{task.output_extension}"
+            ]
+        return body
+
+    def _create(self, request: httpx.Request, endpoint: str) -> httpx.Response:
+        try:
+            data = json.loads(request.content or b"{}")
+        except ValueError:
+            return httpx.Response(400, json={"error": "Request body is not valid JSON"})
+
+        model = data.get("model") or ENDPOINT_MODELS[endpoint]
+        profile = self.config.profile(model)
+
+        def spread(value: float) -> float:
+            return value * (1 + self._rng.uniform(-profile.jitter, profile.jitter))
+
+        task = _SimTask(
+            task_id=f"sim-{next(self._ids)}",
+            model=model,
+            created=time.monotonic(),
+            queue_time=spread(profile.queue_time),
+            run_time=max(spread(profile.run_time), 1e-6),
+            fails=self._rng.random() < profile.failure_rate,
+            output_extension=".png" if endpoint == "/images" else ".mp4",
+        )
+        self._tasks[task.task_id] = task
+        return httpx.Response(200, json={"id": task.task_id})
+
+    def _upload(self, request: httpx.Request) -> httpx.Response:
+        upload_id = f"upload-{next(self._ids)}"
+        filename = json.loads(request.content or b"{}").get("filename", "file")
+        return httpx.Response(200, json={
+            "uploadUrl": f"{request.url.scheme}://{request.url.host}{UPLOAD_PREFIX}{upload_id}",
+            "fields": {},
+            "runwayUri": f"runway://simulator/{upload_id}/{filename}",
+        })
+
+    def _serve_output(self, request: httpx.Request, name: str) -> httpx.Response:
+        """Deterministic bytes for an output file, honouring single byte ranges"""
+        size = self.config.output_bytes
+        start, end = _parse_range(request.headers.get("Range"), size)
+        if start is None:
+            return httpx.Response(200, content=_output_bytes(name, 0, size), headers={"Accept-Ranges": "bytes"})
+        return httpx.Response(
+            206,
+            content=_output_bytes(name, start, end + 1),
+            headers={"Content-Range": f"bytes {start}-{end}/{size}", "Accept-Ranges": "bytes"},
+        )
+
+    def _bucket(self, rate: float, burst: float) -> Optional[TokenBucket]:
+        return TokenBucket(rate * self.config.time_scale, burst) if rate > 0 else None
+
+    def _too_many_requests(self) -> httpx.Response:
+        self.throttled += 1
+        return httpx.Response(
+            429,
+            json={"error": "Too many requests"},
+            headers={"Retry-After": f"{self.config.retry_after / self.config.time_scale:g}"},
+        )
+
+
+def _parse_range(header: Optional[str], size: int) -> Tuple[Optional[int], int]:
+    if not header or not header.startswith("bytes="):
+        return None, size - 1
+    first, _, last = header[len("bytes="):].partition("-")
+    start = int(first or 0)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _output_bytes(name: str, start: int, end: int) -> bytes:
+    """Bytes `start`..`end` of a repeating pattern derived from the file name"""
+    pattern = (name.encode("utf-8") + b"\n") * 8
+    repeats = end // len(pattern) + 1
+    return (pattern * repeats)[start:end]
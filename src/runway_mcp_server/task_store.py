@@ -0,0 +1,207 @@
+"""
+Persistent local task store
+Records every Runway task this server creates in SQLite so waits can resume after a restart
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+from typing import Optional, List, Dict, Any
+
+from .polling import TERMINAL_STATUSES
+from .capabilities import map_media
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id    TEXT PRIMARY KEY,
+    endpoint   TEXT,
+    model      TEXT,
+    params     TEXT,
+    status     TEXT,
+    output     TEXT,
+    failure    TEXT,
+    created_at REAL,
+    updated_at REAL,
+    api_key_id TEXT
+)
+"""
+
+# Columns added after the first release, applied to older databases on open
+MIGRATIONS = {
+    "api_key_id": "ALTER TABLE tasks ADD COLUMN api_key_id TEXT",
+}
+
+UPSERT_CREATED = """
+INSERT INTO tasks (task_id, endpoint, model, params, status, output, failure, created_at, updated_at, api_key_id)
+VALUES (:task_id, :endpoint, :model, :params, :status, :output, :failure, :created_at, :updated_at, :api_key_id)
+ON CONFLICT(task_id) DO UPDATE SET
+    status = excluded.status,
+    output = excluded.output,
+    failure = excluded.failure,
+    updated_at = excluded.updated_at
+"""
+
+DELETE_FINISHED = "DELETE FROM tasks WHERE status IN ({}) AND updated_at < ?"
+
+# Inline data URIs can run to megabytes; the store keeps only their header
+MAX_STORED_URI = 256
+
+UPDATE_STATUS = """
+UPDATE tasks SET status = :status, output = :output, failure = :failure, updated_at = :updated_at
+WHERE task_id = :task_id
+"""
+
+
+class TaskStore:
+    """
+    SQLite-backed record of every task created through RunwayAPIClient.
+
+    Writes are buffered in memory and flushed in one transaction every
+    `flush_interval` seconds, and a status is only written when it changes,
+    so a busy poller does not turn into a stream of tiny disk writes.
+    Finished tasks older than `retention` seconds are deleted on open.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, retention: float = 7 * 86400):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention = retention
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(tasks)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                self._db.execute(statement)
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        self._db.execute(DELETE_FINISHED.format(placeholders), (*TERMINAL_STATUSES, time.time() - retention))
+        self._db.commit()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_status: Dict[str, Optional[str]] = {}
+        self._flusher: Optional["asyncio.Task[None]"] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    def record_created(
+        self, task_id: str, endpoint: str, params: Dict[str, Any], api_key_id: Optional[str] = None
+    ) -> None:
+        """Queue a newly created task for writing, with the fingerprint of the key that created it"""
+        now = time.time()
+        self._last_status[task_id] = "PENDING"
+        self._pending[task_id] = {
+            "task_id": task_id,
+            "endpoint": endpoint,
+            "model": params.get("model"),
+            "params": json.dumps(map_media(params, _abbreviate)),
+            "status": "PENDING",
+            "output": None,
+            "failure": None,
+            "created_at": now,
+            "updated_at": now,
+            "api_key_id": api_key_id,
+        }
+        self._schedule_flush()
+
+    def record_status(self, task_id: str, task: Dict[str, Any]) -> None:
+        """Queue a status change; repeated polls with the same status write nothing"""
+        status = task.get("status")
+        if self._last_status.get(task_id) == status:
+            return
+        self._last_status[task_id] = status
+        row = self._pending.setdefault(task_id, {"task_id": task_id})
+        row.update(
+            status=status,
+            output=json.dumps(task.get("output")) if task.get("output") is not None else None,
+            failure=task.get("failure"),
+            updated_at=time.time(),
+        )
+        # Finished tasks will never be polled again, so stop remembering their status
+        if status in TERMINAL_STATUSES:
+            self._last_status.pop(task_id, None)
+        self._schedule_flush()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read one stored task (including writes that are still buffered)"""
+        rows = self._select("SELECT * FROM tasks WHERE task_id = ?", (task_id,))
+        row = rows[0] if rows else None
+        pending = self._pending.get(task_id)
+        if pending:
+            row = {**(row or {}), **self._decode(dict(pending))}
+        return row
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Tasks that had not reached a terminal state when last seen"""
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        return self._select(
+            f"SELECT * FROM tasks WHERE status IS NULL OR status NOT IN ({placeholders}) ORDER BY created_at",
+            TERMINAL_STATUSES,
+        )
+
+    async def flush(self) -> None:
+        """Write every buffered change in a single transaction"""
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            if not self._pending:
+                return
+            rows, self._pending = list(self._pending.values()), {}
+            await asyncio.to_thread(self._write, rows)
+
+    async def aclose(self) -> None:
+        """Flush outstanding writes and close the database"""
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+        self._flusher = None
+        await self.flush()
+        self._db.close()
+
+    def _schedule_flush(self) -> None:
+        """Start a delayed flush unless one is already waiting"""
+        if self._flusher is not None and not self._flusher.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside an event loop (e.g. scripts and tests) write straight away
+            rows, self._pending = list(self._pending.values()), {}
+            self._write(rows)
+            return
+        self._flusher = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        created = [r for r in rows if "endpoint" in r]
+        updates = [r for r in rows if "endpoint" not in r]
+        with self._db:
+            if created:
+                self._db.executemany(UPSERT_CREATED, created)
+            if updates:
+                self._db.executemany(UPDATE_STATUS, updates)
+
+    def _select(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        cursor = self._db.execute(query, args)
+        columns = [c[0] for c in cursor.description]
+        return [self._decode(dict(zip(columns, values))) for values in cursor.fetchall()]
+
+    @staticmethod
+    def _decode(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn the JSON text columns back into Python values"""
+        for column in ("params", "output"):
+            if column in row:
+                row[column] = json.loads(row[column]) if row[column] else None
+        return row
+
+
+def _abbreviate(uri: str) -> str:
+    """Keep the header of a long data URI and record how much was dropped"""
+    if len(uri) <= MAX_STORED_URI or not uri.startswith("data:"):
+        return uri
+    header = uri[:uri.find(",") + 1] if "," in uri else uri[:MAX_STORED_URI]
+    return f"{header}...({len(uri)} bytes omitted)"
@@ -0,0 +1,226 @@
+"""
+Tracing for the Runway MCP server
+Spans for tool calls, task creation, API requests, polls and the sleeps between polls,
+exported through OpenTelemetry or written to a local JSONL file
+"""
+
+import os
+import json
+import time
+import logging
+import secrets
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Iterator, ContextManager
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Reusable: entering a nullcontext has no side effects, so one instance serves every caller
+_NOOP_CONTEXT = nullcontext(NOOP_SPAN)
+
+
+class Tracer:
+    """
+    Tracer that records nothing.
+
+    This is the default, so instrumented code pays one method call per span
+    and nothing else. Code that would do extra work only for tracing (such as
+    taking timestamps) should check `enabled` first.
+    """
+
+    enabled = False
+
+    def span(self, name: str, parent: Any = None, **attributes: Any) -> ContextManager[Any]:
+        """Open a span around a block, as a child of `parent` or of the current span"""
+        return _NOOP_CONTEXT
+
+    def record(self, name: str, start_ns: int, end_ns: int, parent: Any = None, **attributes: Any) -> None:
+        """Record a span that has already ended, e.g. a sleep measured after the fact"""
+
+    def current(self) -> Any:
+        """Handle for the current span, to parent spans started from another task"""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class _Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["_Span"], start_ns: int, attributes: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.name = name
+        self.start_ns = start_ns
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+
+_current_span: ContextVar[Optional[_Span]] = ContextVar("runway_current_span", default=None)
+
+
+class JsonlTracer(Tracer):
+    """Appends one JSON line per finished span to a local file"""
+
+    enabled = True
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._file = None
+
+    @contextmanager
+    def span(self, name: str, parent: Any = None, **attributes: Any) -> Iterator[_Span]:
+        span = _Span(name, parent if parent is not None else _current_span.get(), time.time_ns(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._write(span, time.time_ns())
+
+    def record(self, name: str, start_ns: int, end_ns: int, parent: Any = None, **attributes: Any) -> None:
+        self._write(_Span(name, parent if parent is not None else _current_span.get(), start_ns, attributes), end_ns)
+
+    def current(self) -> Optional[_Span]:
+        return _current_span.get()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, span: _Span, end_ns: int) -> None:
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Line buffered, so every span is on disk as soon as it ends
+            self._file = open(self.path, "a", buffering=1)
+        self._file.write(json.dumps({
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "start": span.start_ns / 1e9,
+            "duration_ms": round((end_ns - span.start_ns) / 1e6, 3),
+            "attributes": span.attributes,
+            "error": span.error,
+        }, default=str) + "\n")
+
+
+class _OtelSpan:
+    """Adapts an OpenTelemetry span to the set_attribute / record_error interface"""
+
+    __slots__ = ("_span",)
+
+    def __init__(self, span: Any):
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self._span.set_attribute(key, value)
+
+    def record_error(self, error: BaseException) -> None:
+        from opentelemetry.trace import Status, StatusCode
+        self._span.record_exception(error)
+        self._span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+class OtelTracer(Tracer):
+    """
+    Sends spans through the OpenTelemetry API.
+
+    Exporting is configured the usual OpenTelemetry way (an SDK tracer
+    provider, or `opentelemetry-instrument` with OTEL_* environment variables);
+    without one the API itself discards the spans.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = trace.get_tracer("runway_mcp_server")
+
+    @contextmanager
+    def span(self, name: str, parent: Any = None, **attributes: Any) -> Iterator[_OtelSpan]:
+        with self._tracer.start_as_current_span(
+            name, context=parent, attributes=_otel_attributes(attributes),
+            record_exception=False, set_status_on_exception=False
+        ) as span:
+            wrapped = _OtelSpan(span)
+            try:
+                yield wrapped
+            except BaseException as e:
+                wrapped.record_error(e)
+                raise
+
+    def record(self, name: str, start_ns: int, end_ns: int, parent: Any = None, **attributes: Any) -> None:
+        span = self._tracer.start_span(name, context=parent, attributes=_otel_attributes(attributes), start_time=start_ns)
+        span.end(end_time=end_ns)
+
+    def current(self) -> Any:
+        from opentelemetry import context
+        return context.get_current()
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenTelemetry only accepts primitive attribute values"""
+    return {
+        k: v if isinstance(v, (str, bool, int, float)) else str(v)
+        for k, v in attributes.items() if v is not None
+    }
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer (a no-op unless tracing was configured)"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Replace the process-wide tracer and return the previous one"""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def build_tracer(mode: str, path: str) -> Tracer:
+    """Tracer for a RUNWAY_TRACING setting: "off", "jsonl" or "otel" """
+    mode = mode.strip().lower()
+    if mode == "jsonl":
+        return JsonlTracer(path)
+    if mode == "otel":
+        try:
+            return OtelTracer()
+        except ImportError:
+            logger.warning("RUNWAY_TRACING=otel needs opentelemetry-api; tracing is disabled")
+    elif mode not in ("", "off", "false", "0"):
+        logger.warning("Unknown RUNWAY_TRACING mode %r; tracing is disabled", mode)
+    return Tracer()
@@ -297,16 +297,22 @@ def test_server_structure():
             
             expected_tools = [
                 "generate_image_gen4",
+                "generate_images_batch",
+                "run_pipeline",
                 "generate_video_text_to_video",
                 "generate_video_image_to_video",
                 "generate_video_first_last_frame",
+                "generate_storyboard",
                 "edit_video_with_aleph",
                 "restyle_video",
                 "extend_video",
                 "upscale_video_4k",
                 "get_task_status",
                 "cancel_task",
+                "wait_for_tasks",
+                "download_outputs",
                 "list_available_models",
+                "get_server_metrics",
                 "get_api_info",
             ]
             
@@ -409,6 +415,2330 @@ def test_type_safety():
     return all_passed
 
 
+def test_shared_http_client():
+    """Test 8: Verify requests reuse one pooled HTTP client"""
+    print_test_header("TEST 8: Shared HTTP Client")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    # Fake Runway API served in-process - no network, no credits
+    seen_clients = set()
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": "task-1", "status": "SUCCEEDED", "output": ["https://out"]})
+    
+    async def run_requests():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        for _ in range(3):
+            await client.get_task("task-1")
+            seen_clients.add(id(client.http))
+        await client.aclose()
+        # Externally supplied clients are owned by the caller and stay open
+        still_open = not http.is_closed
+        await http.aclose()
+        return still_open
+    
+    try:
+        still_open = asyncio.run(run_requests())
+        assert len(seen_clients) == 1, "Each request opened a new HTTP client"
+        assert still_open, "Client closed a connection pool it did not create"
+        print_success("Requests share a single pooled connection")
+    except Exception as e:
+        print_failure(f"Connection pooling check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    try:
+        original_key, original_store = server.RUNWAY_API_KEY, server.RUNWAY_TASK_STORE
+        server.RUNWAY_API_KEY, server.RUNWAY_TASK_STORE = "test-key", "off"
+        try:
+            assert server.get_client() is server.get_client(), "get_client() returned different instances"
+            asyncio.run(server.close_client())
+            assert server._shared_client is None, "close_client() did not release the shared client"
+        finally:
+            server.RUNWAY_API_KEY, server.RUNWAY_TASK_STORE = original_key, original_store
+        print_success("get_client() hands out one shared instance")
+    except Exception as e:
+        print_failure(f"Shared client check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_polling_schedule():
+    """Test 9: Verify adaptive, model-aware polling"""
+    print_test_header("TEST 9: Adaptive Polling Schedule")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import random
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.polling import PollSchedule, get_schedule
+    
+    all_passed = True
+    
+    try:
+        rng = random.Random(0)
+        turbo = get_schedule("gen4_image_turbo", "/images")
+        veo = get_schedule("veo3.1", "/text_to_video")
+        assert turbo.next_delay(1, 1.0, rng=rng) < veo.next_delay(1, 1.0, rng=rng), "Image polls should start faster than video polls"
+        
+        no_jitter = PollSchedule(initial_interval=2.0, max_interval=30.0, jitter=0)
+        assert no_jitter.next_delay(3, 10.0) > no_jitter.next_delay(1, 10.0), "Delay should back off between polls"
+        # 90% done after 90s -> roughly 10s left
+        assert abs(no_jitter.next_delay(5, 90.0, progress=0.9) - 10.0) < 0.01, "Progress should predict the next poll"
+        assert no_jitter.next_delay(20, 10.0) == 30.0, "Delay should be capped at max_interval"
+        print_success("Schedules back off, cap and follow progress")
+    except Exception as e:
+        print_failure(f"Polling schedule check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    # Task reports RUNNING twice before succeeding
+    statuses = iter(["RUNNING", "RUNNING", "SUCCEEDED"])
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": "task-1", "status": next(statuses), "output": ["https://out"]})
+    
+    async def run_wait():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            return await client.wait_for_task("task-1", poll_interval=0)
+        finally:
+            await http.aclose()
+    
+    try:
+        task = asyncio.run(run_wait())
+        assert task["pollCount"] == 3, f"Expected 3 polls, got {task['pollCount']}"
+        print_success("wait_for_task reports its poll count")
+    except Exception as e:
+        print_failure(f"Poll count check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_task_poller():
+    """Test 10: Verify waits are multiplexed onto one shared poller"""
+    print_test_header("TEST 10: Central Task Poller")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    # Each task reports RUNNING twice before succeeding
+    polls = {}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        polls[task_id] = polls.get(task_id, 0) + 1
+        status = "SUCCEEDED" if polls[task_id] >= 3 else "RUNNING"
+        return httpx.Response(200, json={"id": task_id, "status": status, "output": ["https://out"]})
+    
+    async def run_waits():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            results = await asyncio.gather(
+                client.wait_for_task("task-a", poll_interval=0),
+                client.wait_for_task("task-a", poll_interval=0),
+                client.wait_for_task("task-b", poll_interval=0),
+            )
+            requests_before = sum(polls.values())
+            
+            original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+            server.RUNWAY_API_KEY, server._shared_client = "test-key", client
+            try:
+                status = json.loads(await server.get_task_status("task-a"))
+            finally:
+                server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            
+            return results, requests_before, status, client.poller.watched
+        finally:
+            await http.aclose()
+    
+    try:
+        results, requests_before, status, watched = asyncio.run(run_waits())
+        assert polls["task-a"] == 3, f"Duplicate waits polled task-a {polls['task-a']} times"
+        assert all(r["status"] == "SUCCEEDED" for r in results), "Not every waiter was resolved"
+        assert results[0]["pollCount"] == results[1]["pollCount"] == 3, "Coalesced waiters disagree on poll count"
+        assert watched == 0, "Finished tasks are still being watched"
+        print_success("Duplicate waits on one task share a single polling stream")
+        
+        assert sum(polls.values()) == requests_before, "get_task_status hit the API despite a fresh cache"
+        assert status["cached"] and status["status"] == "SUCCEEDED", "get_task_status ignored the poller cache"
+        print_success("get_task_status reads from the poller cache")
+    except Exception as e:
+        print_failure(f"Task poller check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_image_batch():
+    """Test 11: Verify batch image generation tolerates partial failures"""
+    print_test_header("TEST 11: Batch Image Generation")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            body = json.loads(request.content)
+            if "fail" in body["promptText"]:
+                return httpx.Response(500, json={"error": "boom"})
+            return httpx.Response(200, json={"id": f"task-{body['seed']}"})
+        return httpx.Response(200, json={"status": "SUCCEEDED", "output": ["https://out/" + request.url.path]})
+    
+    async def run_batch():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            return json.loads(await server.generate_images_batch(
+                images=[
+                    {"prompt_text": "frame one", "seed": 1},
+                    {"prompt_text": "this will fail", "seed": 2},
+                    {"ratio": "1024:1024"},
+                    {"prompt_text": "frame four", "seed": 4},
+                ],
+                max_concurrency=2
+            ))
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        batch = asyncio.run(run_batch())
+        statuses = [r["status"] for r in batch["results"]]
+        assert statuses == ["success", "error", "error", "success"], f"Unexpected item statuses: {statuses}"
+        assert batch["status"] == "partial" and batch["succeeded"] == 2, "Batch summary is wrong"
+        assert "prompt_text" in batch["results"][2]["error"], "Missing prompt was not reported"
+        assert all("elapsed_seconds" in r for r in batch["results"]), "Per-item timings are missing"
+        print_success("Failed items are reported without aborting the batch")
+    except Exception as e:
+        print_failure(f"Batch image check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_rate_limiter():
+    """Test 12: Verify 429 responses are queued and retried, not failed"""
+    print_test_header("TEST 12: Client-Side Rate Limiter")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+    
+    all_passed = True
+    
+    try:
+        assert parse_retry_after("3", default=1.0) == 3.0, "Delta-seconds Retry-After not parsed"
+        assert parse_retry_after(None, default=1.5) == 1.5, "Missing Retry-After should use the default"
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", default=1.0) == 0.0, "Past HTTP dates should not wait"
+        print_success("Retry-After headers parsed")
+    except Exception as e:
+        print_failure(f"Retry-After parsing failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    async def drain_bucket():
+        bucket = TokenBucket(rate=50, capacity=1)
+        queued = []
+        
+        async def take():
+            queued.append(bucket.waiting)
+            await bucket.acquire()
+        
+        await asyncio.gather(*(take() for _ in range(4)))
+        return queued, bucket.waiting
+    
+    try:
+        queued, remaining = asyncio.run(drain_bucket())
+        assert max(queued) >= 1, "Callers were not queued behind an empty bucket"
+        assert remaining == 0, "Queue depth did not drain"
+        print_success("Callers queue for tokens and the queue depth is visible")
+    except Exception as e:
+        print_failure(f"Token bucket check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"id": "task-1"}),
+    ])
+    
+    async def create_under_429():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses)))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        # Fast budgets keep the test quick; a 429 still drains the create bucket
+        client.rate_limiter = RateLimiter(create_rate=100, create_burst=1, poll_rate=100, poll_burst=1)
+        try:
+            task = await client.create_task("/images", {"promptText": "x"})
+            return task, client.rate_limiter.stats()
+        finally:
+            await http.aclose()
+    
+    try:
+        task, stats = asyncio.run(create_under_429())
+        assert task["id"] == "task-1", "Request was not retried after 429"
+        assert stats["create"]["throttled"] == 2, "429 responses did not pause the create budget"
+        assert stats["poll"]["throttled"] == 0, "429 on task creation should not pause polling"
+        print_success("HTTP 429 slows down the matching budget and the request succeeds")
+        
+        limiter = RateLimiter(1, 5, 10, 20)
+        assert limiter.bucket_for("POST", "/uploads") is limiter.buckets["poll"], "Uploads spend the create budget"
+        assert limiter.bucket_for("POST", "/image_to_video") is limiter.buckets["create"], "Task creation left the create budget"
+        print_success("Media uploads do not spend the task creation budget")
+    except Exception as e:
+        print_failure(f"429 handling check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_retry_policy():
+    """Test 13: Verify transient failures are retried only when safe"""
+    print_test_header("TEST 13: Retry Policy")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.retry import RetryPolicy
+    
+    all_passed = True
+    
+    def scripted(*outcomes):
+        """Mock transport that raises or returns each outcome in turn"""
+        remaining = iter(outcomes)
+        calls = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            outcome = next(remaining)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        
+        return handler, calls
+    
+    async def call(handler, method, endpoint):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        client.retry_policy = RetryPolicy(max_retries=3, base_delay=0)
+        try:
+            return await client._request(method, endpoint), client.retry_counts
+        finally:
+            await http.aclose()
+    
+    ok = httpx.Response(200, json={"id": "task-1", "status": "RUNNING"})
+    
+    try:
+        handler, calls = scripted(httpx.ReadTimeout("slow"), httpx.Response(503), ok)
+        task, counts = asyncio.run(call(handler, "GET", "/tasks/task-1"))
+        assert task["status"] == "RUNNING" and len(calls) == 3, "Poll was not retried through a timeout and a 503"
+        assert counts == {"ReadTimeout": 1, "HTTP 503": 1}, f"Retries were not counted: {counts}"
+        print_success("Status polls retry through timeouts and 5xx")
+        
+        handler, calls = scripted(httpx.ConnectError("refused"), ok)
+        task, _ = asyncio.run(call(handler, "POST", "/images"))
+        assert len(calls) == 2, "Unsent task creation should be retried"
+        print_success("Task creation retries when the request was never sent")
+        
+        handler, calls = scripted(httpx.ReadTimeout("slow"), ok)
+        try:
+            asyncio.run(call(handler, "POST", "/images"))
+            raise AssertionError("Task creation was retried after it may have reached Runway")
+        except httpx.ReadTimeout:
+            pass
+        assert len(calls) == 1, "Task creation was sent twice"
+        print_success("Task creation is not repeated once it may have been sent")
+        
+        handler, calls = scripted(httpx.Response(503), httpx.Response(503), httpx.Response(503), httpx.Response(503))
+        try:
+            asyncio.run(call(handler, "GET", "/tasks/task-1"))
+            raise AssertionError("Retries did not stop at max_retries")
+        except httpx.HTTPStatusError:
+            pass
+        assert len(calls) == 4, f"Expected 1 attempt + 3 retries, got {len(calls)}"
+        print_success("Retries stop at the configured limit")
+    except Exception as e:
+        print_failure(f"Retry policy check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_task_store():
+    """Test 14: Verify tasks are persisted and resumed after a restart"""
+    print_test_header("TEST 14: Persistent Task Store")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.task_store import TaskStore
+    
+    all_passed = True
+    
+    finished = {"value": False}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "task-1"})
+        if finished["value"]:
+            return httpx.Response(200, json={"id": "task-1", "status": "SUCCEEDED", "output": ["https://out/video.mp4"]})
+        return httpx.Response(200, json={"id": "task-1", "status": "RUNNING", "progress": 0.2})
+    
+    async def first_process(path):
+        store = TaskStore(path, flush_interval=0.01)
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http, task_store=store)
+        await client.create_task("/text_to_video", {"model": "veo3.1", "promptText": "waves"})
+        await asyncio.sleep(0.05)
+        # The process "restarts" while the task is still running
+        await client.aclose()
+        await store.aclose()
+        await http.aclose()
+    
+    async def second_process(path):
+        finished["value"] = True
+        store = TaskStore(path, flush_interval=0.01)
+        unfinished = store.unfinished()
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http, task_store=store)
+        resumed = await client.resume_unfinished()
+        while client._tracking:
+            await asyncio.sleep(0.01)
+        await store.flush()
+        row = store.get("task-1")
+        await client.aclose()
+        await store.aclose()
+        await http.aclose()
+        return unfinished, resumed, row
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "tasks.db")
+            asyncio.run(first_process(path))
+            unfinished, resumed, row = asyncio.run(second_process(path))
+        
+        assert [r["task_id"] for r in unfinished] == ["task-1"], "Running task was not persisted as unfinished"
+        assert unfinished[0]["endpoint"] == "/text_to_video" and unfinished[0]["params"]["model"] == "veo3.1", "Task parameters were not stored"
+        assert resumed == 1, "Unfinished task was not resumed"
+        assert row["status"] == "SUCCEEDED" and row["output"] == ["https://out/video.mp4"], "Resumed task result was not stored"
+        print_success("Unfinished tasks are resumed and completed after a restart")
+    except Exception as e:
+        print_failure(f"Task store resume check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TaskStore(str(Path(tmp) / "tasks.db"))
+            store.record_created("task-2", "/images", {"model": "gen4_image"})
+            store.record_status("task-2", {"status": "RUNNING"})
+            writes = store._db.total_changes
+            store.record_status("task-2", {"status": "RUNNING"})
+            assert store._db.total_changes == writes, "Unchanged status was written again"
+            assert store.get("task-2")["status"] == "RUNNING", "Status change was not written"
+            store._db.close()
+        print_success("Repeated polls with the same status write nothing")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "tasks.db")
+            store = TaskStore(path)
+            inline = "data:image/png;base64," + "A" * 100000
+            store.record_created("task-3", "/image_to_video", {"model": "gen4_turbo", "promptImage": inline})
+            store.record_created("task-4", "/images", {"model": "gen4_image"})
+            store.record_status("task-4", {"status": "SUCCEEDED"})
+            stored = store.get("task-3")["params"]["promptImage"]
+            assert len(stored) < 100 and stored.startswith("data:image/png;base64,"), f"Inline media was stored: {len(stored)} characters"
+            store._db.execute("UPDATE tasks SET updated_at = updated_at - 8 * 86400")
+            store._db.commit()
+            store._db.close()
+            reopened = TaskStore(path)
+            kept = [row["task_id"] for row in reopened._select("SELECT task_id FROM tasks", ())]
+            reopened._db.close()
+            assert kept == ["task-3"], f"Retention kept {kept}"
+        print_success("Inline media is not stored and old finished tasks are deleted on open")
+    except Exception as e:
+        print_failure(f"Write batching check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_result_cache():
+    """Test 15: Verify seeded requests are served from the result cache"""
+    print_test_header("TEST 15: Seeded Result Cache")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.cache import ResultCache, request_key
+    
+    all_passed = True
+    
+    try:
+        assert request_key("/images", {"a": 1, "b": 2}) == request_key("/images", {"b": 2, "a": 1}), "Key depends on field order"
+        assert request_key("/images", {"seed": 1}) != request_key("/images", {"seed": 2}), "Different seeds share a key"
+        print_success("Cache keys are canonical payload hashes")
+    except Exception as e:
+        print_failure(f"Cache key check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    api_calls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        api_calls.append(request.method)
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "task-1"})
+        return httpx.Response(200, json={"id": "task-1", "status": "SUCCEEDED", "output": ["https://out/image.png"]})
+    
+    async def generate_twice(cache):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        saved = server.RUNWAY_API_KEY, server._shared_client, server._result_cache
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        server._result_cache = cache
+        try:
+            first = json.loads(await server.generate_image_gen4("a red fox", seed=7))
+            calls_after_first = len(api_calls)
+            second = json.loads(await server.generate_image_gen4("a red fox", seed=7))
+            return first, second, calls_after_first
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client, server._result_cache = saved
+            await http.aclose()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second, calls_after_first = asyncio.run(generate_twice(ResultCache(directory=tmp)))
+            assert not first["cached"] and second["cached"], "Second seeded call was not a cache hit"
+            assert len(api_calls) == calls_after_first, "Cache hit still called the Runway API"
+            assert second["image_url"] == first["image_url"], "Cached result differs from the original"
+            print_success("Identical seeded requests return the cached result")
+            
+            # A fresh process only has the on-disk tier
+            restarted = ResultCache(directory=tmp)
+            assert restarted.get("/images", {"model": "gen4_image", "promptText": "a red fox", "ratio": "1920:1080", "seed": 7}), "On-disk tier was not read"
+            expired = ResultCache(directory=tmp, ttl=0)
+            assert expired.get("/images", {"model": "gen4_image", "promptText": "a red fox", "ratio": "1920:1080", "seed": 7}) is None, "Expired entry was returned"
+            print_success("On-disk tier survives a restart and respects the TTL")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ResultCache(max_entries=5, directory=tmp)
+            for seed in range(5):
+                writer.put("/images", {"seed": seed}, {"id": f"task-{seed}"})
+            reader = ResultCache(max_entries=2, directory=tmp)
+            hits = [reader.get("/images", {"seed": seed}) for seed in range(5)]
+            assert all(hits) and reader.stats()["entries"] == 2, f"Disk hits grew memory to {reader.stats()['entries']} entries"
+            reader.put("/images", {"seed": 5}, {"id": "task-5"})
+            assert len(os.listdir(tmp)) == 2, f"Disk tier holds {len(os.listdir(tmp))} files"
+            assert reader.get("/images", {"seed": 5}) and reader.get("/images", {"seed": 0}) is None, "Disk tier dropped the wrong entry"
+            print_success("Both tiers stay within max_entries")
+    except Exception as e:
+        print_failure(f"Result cache check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_create_coalescing():
+    """Test 16: Verify identical in-flight task creations are single-flighted"""
+    print_test_header("TEST 16: Single-Flight Task Creation")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    posts = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        posts.append(json.loads(request.content))
+        return httpx.Response(200, json={"id": f"task-{len(posts)}"})
+    
+    async def create_many():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            same = {"model": "gen4_image", "promptText": "a red fox", "ratio": "1920:1080", "seed": 7}
+            other = dict(same, promptText="a blue fox")
+            third = dict(same, promptText="a green fox")
+            tasks = await asyncio.gather(
+                client.create_task("/images", same),
+                client.create_task("/images", dict(same)),
+                client.create_task("/images", other),
+            )
+            # Outside the window the same payload creates a new task again
+            original_window = server.RUNWAY_CREATE_COALESCE_WINDOW
+            server.RUNWAY_CREATE_COALESCE_WINDOW = 0
+            try:
+                await client.create_task("/images", third)
+                await asyncio.sleep(0.01)
+                later = await client.create_task("/images", third)
+            finally:
+                server.RUNWAY_CREATE_COALESCE_WINDOW = original_window
+            unseeded = {"model": "gen4_image", "promptText": "a cat", "ratio": "1920:1080"}
+            random_tasks = await asyncio.gather(*(client.create_task("/images", dict(unseeded)) for _ in range(3)))
+            return tasks, later, client.coalesced_creates, random_tasks
+        finally:
+            await http.aclose()
+    
+    async def unseeded_batch():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            return json.loads(await server.generate_images_batch(images=[{"prompt_text": "a cat"}] * 4, wait_for_completion=False))
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    async def cancel_leader():
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.05)
+            return handler(request)
+        
+        http = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            payload = {"model": "gen4_image", "promptText": "a grey fox", "ratio": "1920:1080", "seed": 3}
+            leader = asyncio.ensure_future(client.create_task("/images", payload))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(client.create_task("/images", dict(payload)))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            try:
+                task = await follower
+            except asyncio.CancelledError:
+                task = {}
+            return leader.cancelled(), task
+        finally:
+            await http.aclose()
+    
+    try:
+        tasks, later, coalesced, random_tasks = asyncio.run(create_many())
+        assert tasks[0]["id"] == tasks[1]["id"], "Duplicate creation started a second task"
+        assert tasks[2]["id"] != tasks[0]["id"], "Different payloads were coalesced"
+        assert coalesced == 1, f"Expected 1 coalesced call, got {coalesced}"
+        assert later["id"] == "task-4", "Window did not expire"
+        assert len({t["id"] for t in random_tasks}) == 3 and len(posts) == 7, "Unseeded duplicates were coalesced"
+        print_success("Duplicate seeded creations attach to the in-flight task; unseeded ones do not")
+        
+        posts.clear()
+        batch = asyncio.run(unseeded_batch())
+        task_ids = [r["task_id"] for r in batch["results"]]
+        assert len(set(task_ids)) == 4 and len(posts) == 4, f"Duplicate unseeded batch items shared tasks: {task_ids}"
+        print_success("Duplicate unseeded batch items produce separate tasks")
+        
+        posts.clear()
+        leader_cancelled, task = asyncio.run(cancel_leader())
+        assert leader_cancelled and task.get("id") == "task-1" and len(posts) == 1, "Cancelling the first caller cancelled its duplicate"
+        print_success("Duplicates keep the shared task when the caller that created it is cancelled")
+    except Exception as e:
+        print_failure(f"Single-flight check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_streaming_upload():
+    """Test 17: Verify local files are streamed to the upload endpoint"""
+    print_test_header("TEST 17: Streaming Local File Upload")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    class UploadTransport(httpx.AsyncBaseTransport):
+        """Fake Runway + storage that consumes upload bodies chunk by chunk"""
+        
+        def __init__(self):
+            self.largest_chunk = 0
+            self.uploaded_bytes = 0
+        
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/uploads"):
+                assert json.loads(await request.aread())["filename"] == "clip.mp4"
+                return httpx.Response(200, json={
+                    "uploadUrl": "https://storage.example/bucket",
+                    "fields": {"key": "uploads/clip.mp4"},
+                    "runwayUri": "runway://uploads/clip.mp4",
+                })
+            async for chunk in request.stream:
+                self.largest_chunk = max(self.largest_chunk, len(chunk))
+                self.uploaded_bytes += len(chunk)
+            return httpx.Response(204)
+    
+    async def upload(path):
+        transport = UploadTransport()
+        http = httpx.AsyncClient(transport=transport)
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            uri = await client.resolve_media(path)
+            passthrough = await client.resolve_media("https://example.com/video.mp4")
+            return uri, passthrough, transport
+        finally:
+            await http.aclose()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "clip.mp4"
+            size = 4 * 1024 * 1024
+            path.write_bytes(b"\0" * size)
+            uri, passthrough, transport = asyncio.run(upload(str(path)))
+        
+        assert uri == "runway://uploads/clip.mp4", f"Unexpected upload URI: {uri}"
+        assert passthrough == "https://example.com/video.mp4", "Remote URLs should not be uploaded"
+        assert transport.uploaded_bytes > size, "File contents were not uploaded"
+        assert transport.largest_chunk < size // 8, "File was not streamed in chunks"
+        print_success("Local files are streamed in chunks and replaced by their upload URI")
+    except Exception as e:
+        print_failure(f"Streaming upload check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    uploads = []
+    created = []
+    
+    def runway(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/uploads"):
+            uploads.append(request)
+            # Every upload gets a fresh ephemeral URI
+            return httpx.Response(200, json={"uploadUrl": "https://storage.example/bucket", "runwayUri": f"runway://uploads/{len(uploads)}"})
+        if request.url.host == "storage.example":
+            return httpx.Response(204)
+        if request.method == "POST":
+            created.append(json.loads(request.content))
+            return httpx.Response(200, json={"id": f"task-{len(created)}"})
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1], "status": "SUCCEEDED", "output": ["https://out"]})
+    
+    async def seeded_twice(path):
+        from runway_mcp_server.cache import ResultCache
+        http = httpx.AsyncClient(transport=httpx.MockTransport(runway))
+        saved = server.RUNWAY_API_KEY, server._shared_client, server._result_cache
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        server._result_cache = ResultCache()
+        try:
+            return [
+                json.loads(await server.generate_video_image_to_video(path, model="gen4_turbo", duration=5, seed=42))
+                for _ in range(2)
+            ]
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client, server._result_cache = saved
+            await http.aclose()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "frame.png"
+            path.write_bytes(b"\x89PNG" + b"\0" * 64)
+            first, second = asyncio.run(seeded_twice(str(path)))
+        assert created and created[0]["promptImage"] == "runway://uploads/1", "Local file was not uploaded"
+        assert not first["cached"] and second["cached"], "Seeded call with a local file missed the result cache"
+        assert len(uploads) == 1 and len(created) == 1, f"Cache hit still uploaded ({len(uploads)} uploads, {len(created)} tasks)"
+        print_success("Seeded requests with local files hit the result cache without uploading again")
+    except Exception as e:
+        print_failure(f"Local file cache check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_output_downloads():
+    """Test 18: Verify parallel, resumable, checksummed downloads"""
+    print_test_header("TEST 18: Output Downloader")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import hashlib
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server.downloads import OutputDownloader
+    
+    all_passed = True
+    
+    content = bytes(range(256)) * 12 * 1024  # 3 MB
+    chunk = 1024 * 1024
+    
+    def range_server(body, etag):
+        """Fake CDN serving `body` with Range support; records requested ranges"""
+        requested = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            start, end = request.headers["Range"][len("bytes="):].split("-")
+            start, end = int(start), int(end)
+            requested.append((start, end))
+            return httpx.Response(206, content=body[start:end + 1], headers={
+                "Content-Range": f"bytes {start}-{end}/{len(body)}",
+                "ETag": f'"{etag}"',
+            })
+        
+        return handler, requested
+    
+    async def download(handler, path):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await OutputDownloader(http, max_concurrency=3, chunk_size=chunk).download("https://cdn/out.mp4", path)
+        finally:
+            await http.aclose()
+    
+    md5 = hashlib.md5(content).hexdigest()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "out.mp4")
+            handler, requested = range_server(content, md5)
+            result = asyncio.run(download(handler, path))
+            assert Path(path).read_bytes() == content, "Downloaded file is corrupt"
+            assert result["sha256"] == hashlib.sha256(content).hexdigest(), "SHA-256 not reported"
+            assert len([r for r in requested if r != (0, 0)]) == 3, "File was not split into range chunks"
+            print_success("Files are downloaded as parallel range chunks")
+            
+            # Interrupted download: chunks 0 and 1 finished before the process stopped
+            path = str(Path(tmp) / "resume.mp4")
+            Path(path + ".part").write_bytes(content[:2 * chunk] + b"\0" * chunk)
+            Path(path + ".part.json").write_text(json.dumps({"size": len(content), "etag": f'"{md5}"', "done": [0, 1]}))
+            handler, requested = range_server(content, md5)
+            result = asyncio.run(download(handler, path))
+            assert result["resumed"] and Path(path).read_bytes() == content, "Download did not resume correctly"
+            assert [r for r in requested if r != (0, 0)] == [(2 * chunk, len(content) - 1)], "Finished chunks were downloaded again"
+            assert not Path(path + ".part.json").exists(), "Resume state was not cleaned up"
+            print_success("Interrupted downloads resume from completed chunks")
+            
+            # Same size as the real file but different contents
+            handler, requested = range_server(content, md5)
+            Path(path).write_bytes(b"\0" * len(content))
+            result = asyncio.run(download(handler, path))
+            assert not result["skipped"] and Path(path).read_bytes() == content, "File with a bad checksum was skipped"
+            result = asyncio.run(download(handler, path))
+            assert result["skipped"], "Intact file was downloaded again"
+            print_success("Existing files are skipped only when their checksum matches")
+            
+            path = str(Path(tmp) / "bad.mp4")
+            handler, _ = range_server(content, "0" * 32)
+            try:
+                asyncio.run(download(handler, path))
+                raise AssertionError("Checksum mismatch was not detected")
+            except Exception as e:
+                assert "MD5 mismatch" in str(e), f"Unexpected error: {e}"
+            assert not Path(path).exists(), "Corrupt file was kept"
+            print_success("Checksum mismatches are rejected")
+    except Exception as e:
+        print_failure(f"Downloader check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_progress_updates():
+    """Test 19: Verify task updates are streamed and forwarded as progress"""
+    print_test_header("TEST 19: Progress Notifications")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    def scripted_task(*states):
+        remaining = iter(states)
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(200, json={"id": "task-1"})
+            status, progress = next(remaining)
+            return httpx.Response(200, json={"id": "task-1", "status": status, "progress": progress, "output": ["https://out"], "failure": "bad prompt"})
+        
+        return handler
+    
+    class FakeContext:
+        """Records progress notifications the way FastMCP's Context would send them"""
+        
+        def __init__(self):
+            self.notifications = []
+        
+        async def report_progress(self, progress, total=None, message=None):
+            self.notifications.append((progress, total, message))
+    
+    async def iterate(handler):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("test-key", http_client=http)
+        updates = []
+        try:
+            async for update in client.poller.updates("task-1", poll_interval=0):
+                updates.append(update)
+        finally:
+            await http.aclose()
+        return updates
+    
+    try:
+        updates = asyncio.run(iterate(scripted_task(("RUNNING", 0.2), ("RUNNING", 0.6), ("SUCCEEDED", 1.0))))
+        assert [u["status"] for u in updates] == ["RUNNING", "RUNNING", "SUCCEEDED"], "Updates missing"
+        assert [u["progress"] for u in updates] == [0.2, 0.6, 1.0], "Progress not carried in updates"
+        assert all("elapsed" in u for u in updates), "Elapsed time not carried in updates"
+        print_success("Async iterator yields every status update")
+        
+        try:
+            asyncio.run(iterate(scripted_task(("RUNNING", 0.5), ("FAILED", None))))
+            raise AssertionError("Failed task did not raise")
+        except Exception as e:
+            assert "bad prompt" in str(e), f"Unexpected error: {e}"
+        print_success("Failed tasks raise from the iterator")
+    except Exception as e:
+        print_failure(f"Update iterator check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    async def run_tool(handler, ctx):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        # Skip the real polling schedule so the test runs instantly
+        original_updates = server._shared_client.poller.updates
+        server._shared_client.poller.updates = lambda task_id, **kwargs: original_updates(task_id, **dict(kwargs, poll_interval=0))
+        try:
+            return json.loads(await server.generate_video_text_to_video("waves at dusk", ctx=ctx))
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        ctx = FakeContext()
+        result = asyncio.run(run_tool(scripted_task(("PENDING", None), ("RUNNING", 0.5), ("SUCCEEDED", 1.0)), ctx))
+        assert result["status"] == "success", "Tool did not finish"
+        assert [n[0] for n in ctx.notifications] == [0.0, 0.5, 1.0], f"Unexpected progress: {ctx.notifications}"
+        assert ctx.notifications[1][2].startswith("RUNNING"), "Progress message should carry the status"
+        
+        ctx = FakeContext()
+        asyncio.run(run_tool(scripted_task(("RUNNING", 0.6), ("RUNNING", 0.4), ("SUCCEEDED", None)), ctx))
+        assert [n[0] for n in ctx.notifications] == [0.6, 0.6, 1.0], f"Progress went backwards: {ctx.notifications}"
+        print_success("Tools forward every update as an MCP progress notification")
+    except Exception as e:
+        print_failure(f"Progress notification check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_server_metrics():
+    """Test 20: Verify request latency, task and throttling metrics are recorded"""
+    print_test_header("TEST 20: Server Metrics")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.metrics import Histogram, endpoint_label
+    from runway_mcp_server.ratelimit import RateLimiter
+    
+    all_passed = True
+    
+    try:
+        histogram = Histogram((1, 2, 4, 8))
+        for value in (0.5, 1.5, 1.5, 3, 3, 3, 3, 6, 6, 20):
+            histogram.observe(value)
+        assert histogram.count == 10 and histogram.counts == [1, 2, 4, 2, 1], f"Bad buckets: {histogram.counts}"
+        assert 2 < histogram.quantile(0.5) <= 4, "Median should fall in the (2, 4] bucket"
+        assert histogram.quantile(0.99) == 8, "Open top bucket should report its lower bound"
+        assert endpoint_label("/tasks/abc-123/cancel") == "/tasks/{id}/cancel", "Task IDs must not become labels"
+        print_success("Histogram buckets, quantiles and endpoint labels")
+    except Exception as e:
+        print_failure(f"Histogram check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    polls = {"count": 0}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            if not polls.get("throttled"):
+                polls["throttled"] = True
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"id": "task-1"})
+        polls["count"] += 1
+        status = "SUCCEEDED" if polls["count"] >= 3 else "RUNNING"
+        return httpx.Response(200, json={"id": "task-1", "status": status, "output": ["https://out"]})
+    
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        client.rate_limiter = RateLimiter(100, 10, 100, 10)
+        try:
+            task = await client.create_task("/text_to_video", {"model": "gen4_turbo", "promptText": "waves"})
+            await client.wait_for_task(task["id"], poll_interval=0)
+            return (
+                client.metrics,
+                json.loads(await server.get_server_metrics()),
+                await server.get_server_metrics(format="prometheus")
+            )
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        metrics, snapshot, text = asyncio.run(run())
+        
+        latency = {
+            (s["labels"]["method"], s["labels"]["endpoint"]): s["count"]
+            for s in snapshot["histograms"]["runway_request_seconds"]
+        }
+        assert latency == {("POST", "/text_to_video"): 2, ("GET", "/tasks/{id}"): 3}, f"Bad latency series: {latency}"
+        assert metrics.value("runway_throttled_total", budget="create") == 1, "429 not counted"
+        assert metrics.value("runway_request_errors_total", endpoint="/text_to_video", kind="429") == 1, "Error not counted"
+        assert metrics.value("runway_tasks_total", model="gen4_turbo", status="SUCCEEDED") == 1, "Task not counted"
+        
+        polls_series = snapshot["histograms"]["runway_task_polls"][0]
+        assert polls_series["labels"] == {"model": "gen4_turbo"} and polls_series["sum"] == 3, f"Bad poll count: {polls_series}"
+        assert snapshot["histograms"]["runway_task_duration_seconds"][0]["count"] == 1, "Task duration not recorded"
+        assert snapshot["gauges"]["runway_tasks_in_flight"] == 0, "Finished task still counted as in flight"
+        print_success("Latency, errors, throttling, polls and task duration recorded")
+        
+        assert "# TYPE runway_request_seconds histogram" in text, "Prometheus TYPE line missing"
+        assert 'runway_request_seconds_bucket{endpoint="/tasks/{id}",method="GET",le="+Inf"} 3' in text, "Prometheus buckets missing"
+        assert 'runway_throttled_total{budget="create"} 1' in text, "Prometheus counter missing"
+        print_success("Prometheus text exposition format")
+    except Exception as e:
+        print_failure(f"Metrics check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_tracing():
+    """Test 21: Verify tool calls produce traces with create, poll and sleep spans"""
+    print_test_header("TEST 21: Tracing")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server import tracing
+    from runway_mcp_server.ratelimit import RateLimiter
+    
+    all_passed = True
+    
+    try:
+        noop = tracing.Tracer()
+        assert not noop.enabled and noop.current() is None, "Default tracer should be disabled"
+        assert noop.span("a") is noop.span("b", task_id="x"), "No-op spans should not allocate"
+        with noop.span("a") as span:
+            span.set_attribute("key", "value")
+        assert not tracing.build_tracer("off", "unused").enabled, "off should build a no-op tracer"
+        print_success("Disabled tracing is a shared no-op")
+    except Exception as e:
+        print_failure(f"No-op tracer check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    polls = {"count": 0}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "task-1"})
+        polls["count"] += 1
+        status = "SUCCEEDED" if polls["count"] >= 3 else "RUNNING"
+        return httpx.Response(200, json={"id": "task-1", "status": status, "output": ["https://out"]})
+    
+    async def run(trace_path):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        previous = tracing.set_tracer(tracing.JsonlTracer(trace_path))
+        server.RUNWAY_API_KEY = "test-key"
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        client.rate_limiter = RateLimiter(100, 10, 100, 10)
+        original_updates = client.poller.updates
+        client.poller.updates = lambda task_id, **kwargs: original_updates(task_id, **dict(kwargs, poll_interval=0.01))
+        try:
+            await server.mcp.call_tool("generate_video_text_to_video", {"prompt_text": "waves at dusk"})
+        finally:
+            tracing.set_tracer(previous).close()
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = os.path.join(tmp, "traces.jsonl")
+            asyncio.run(run(trace_path))
+            with open(trace_path) as f:
+                spans = [json.loads(line) for line in f]
+        
+        by_name = {}
+        for span in spans:
+            by_name.setdefault(span["name"], []).append(span)
+        
+        root = by_name["tool generate_video_text_to_video"][0]
+        assert root["parent_id"] is None, "Tool span should be the trace root"
+        assert {s["trace_id"] for s in spans} == {root["trace_id"]}, "All spans should share one trace"
+        
+        create = by_name["create_task"][0]
+        assert create["parent_id"] == root["span_id"] and create["attributes"]["task_id"] == "task-1", "Bad create span"
+        requests = [s for s in by_name["runway.request"] if s["parent_id"] == create["span_id"]]
+        assert requests and requests[0]["attributes"]["status_code"] == 200, "HTTP span missing under create_task"
+        
+        polls_spans = by_name["get_task"]
+        assert len(polls_spans) == 3 and all(s["parent_id"] == root["span_id"] for s in polls_spans), "Poll spans not under the tool"
+        assert polls_spans[-1]["attributes"]["status"] == "SUCCEEDED", "Poll span should carry the status"
+        assert len(by_name["poll.sleep"]) == 2, "Sleep between polls should be recorded"
+        assert all(s["duration_ms"] >= 5 for s in by_name["poll.sleep"]), "Sleep spans too short"
+        print_success(f"JSONL trace with {len(spans)} spans: tool -> create_task / get_task / poll.sleep")
+    except Exception as e:
+        print_failure(f"JSONL trace check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_benchmarks():
+    """Test 22: Verify the benchmark suite runs against the fake API and flags regressions"""
+    print_test_header("TEST 22: Benchmark Suite")
+    
+    sys.path.insert(0, str(Path("src")))
+    sys.path.insert(0, str(Path("benchmarks")))
+    
+    import asyncio
+    import run_benchmarks
+    
+    all_passed = True
+    
+    try:
+        for name, build in run_benchmarks.SCENARIOS.items():
+            result = asyncio.run(run_benchmarks.run_level(build, 4, 8, latency=0.001, jitter=0.0, trace_allocations=True))
+            assert result["operations"] == 8 and result["throughput_per_s"] > 0, f"{name}: no throughput"
+            assert result["p50_ms"] <= result["p99_ms"], f"{name}: percentiles out of order"
+            assert result["p50_ms"] >= 1, f"{name}: injected latency not applied"
+            assert result["alloc_kb_per_op"] > 0, f"{name}: allocations not measured"
+            print_success(f"{name}: {result['throughput_per_s']} ops/s, p99 {result['p99_ms']} ms")
+        
+        baseline = {"results": {"tool": {"10": {"throughput_per_s": 1000, "p99_ms": 10}}}}
+        assert not run_benchmarks.compare({"tool": {"10": {"throughput_per_s": 900, "p99_ms": 11}}}, baseline, 0.25)
+        regressions = run_benchmarks.compare({"tool": {"10": {"throughput_per_s": 500, "p99_ms": 20}}}, baseline, 0.25)
+        assert len(regressions) == 2, f"Expected throughput and p99 regressions, got {regressions}"
+        print_success("Baseline comparison flags regressions beyond the tolerance")
+    except Exception as e:
+        print_failure(f"Benchmark suite check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_simulator():
+    """Test 23: Verify the local Runway API simulator and simulator mode"""
+    print_test_header("TEST 23: API Simulator")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.simulator import RunwaySimulator, SimulatorConfig
+    from runway_mcp_server.downloads import OutputDownloader
+    
+    all_passed = True
+    
+    def make_simulator(**overrides):
+        config = SimulatorConfig.from_dict(dict({
+            "time_scale": 1000,
+            "seed": 1,
+            "default": {"queue_time": 5, "run_time": 20, "jitter": 0},
+            "models": {"broken": {"queue_time": 0, "run_time": 1, "failure_rate": 1.0}},
+        }, **overrides))
+        return RunwaySimulator(config)
+    
+    async def lifecycle():
+        simulator = make_simulator(output_bytes=100_000)
+        async with httpx.AsyncClient(transport=simulator.transport()) as http:
+            client = server.RunwayAPIClient("any-key", http_client=http)
+            task = await client.create_task("/text_to_video", {"model": "custom_model", "promptText": "waves"})
+            statuses = [(await client.get_task(task["id"]))["status"]]
+            await asyncio.sleep(0.01)
+            running = await client.get_task(task["id"])
+            statuses.append(running["status"])
+            done = await client.wait_for_task(task["id"], poll_interval=0.005)
+            statuses.append(done["status"])
+            
+            failing = await client.create_task("/images", {"model": "broken", "promptText": "x"})
+            try:
+                await client.wait_for_task(failing["id"], poll_interval=0.005)
+                failure = None
+            except Exception as e:
+                failure = str(e)
+            
+            cancelled = await client.create_task("/upscale", {"videoUri": "https://x"})
+            await client._request("POST", f"/tasks/{cancelled['id']}/cancel")
+            cancelled_status = (await client.get_task(cancelled["id"]))["status"]
+            
+            with tempfile.TemporaryDirectory() as tmp:
+                downloader = OutputDownloader(http, chunk_size=30_000)
+                downloaded = await downloader.download(done["output"][0], os.path.join(tmp, "out.mp4"))
+            
+            unauthorized = await http.get("https://api.dev.runwayml.com/v1/tasks/" + task["id"])
+            await client.aclose()
+            return statuses, running, failure, cancelled_status, downloaded, unauthorized.status_code
+    
+    try:
+        statuses, running, failure, cancelled_status, downloaded, unauthorized = asyncio.run(lifecycle())
+        assert statuses == ["PENDING", "RUNNING", "SUCCEEDED"], f"Unexpected lifecycle: {statuses}"
+        assert 0 < running["progress"] < 1, "RUNNING tasks should report progress"
+        assert failure and "Simulated failure" in failure, f"failure_rate=1 should fail the task: {failure}"
+        assert cancelled_status == "CANCELLED", "Cancel endpoint not simulated"
+        assert downloaded["bytes"] == 100_000, "Simulated outputs should support ranged downloads"
+        assert unauthorized == 401, "Requests without an API key should be rejected"
+        print_success("Tasks queue, run with progress, succeed, fail and cancel on schedule")
+    except Exception as e:
+        print_failure(f"Simulator lifecycle check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    async def throttling():
+        simulator = make_simulator(create_rate=1, create_burst=2, retry_after=5, time_scale=1)
+        async with httpx.AsyncClient(transport=simulator.transport(), headers={"Authorization": "Bearer k"}) as http:
+            codes = [
+                (await http.post("https://sim/v1/text_to_video", json={"promptText": str(i)})).status_code
+                for i in range(3)
+            ]
+            throttled = await http.post("https://sim/v1/text_to_video", json={"promptText": "again"})
+        return codes, throttled.headers.get("Retry-After"), simulator.throttled
+    
+    try:
+        codes, retry_after, throttled = asyncio.run(throttling())
+        assert codes == [200, 200, 429], f"Create burst not enforced: {codes}"
+        assert retry_after == "5" and throttled == 2, "429 responses should carry Retry-After"
+        print_success("Creation rate limit answers HTTP 429 with Retry-After")
+    except Exception as e:
+        print_failure(f"Simulator throttling check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    try:
+        from runway_mcp_server.capabilities import MODELS, ENDPOINT_DEFAULT_MODELS
+        from runway_mcp_server.simulator import DEFAULT_PROFILES, ENDPOINT_MODELS
+        missing = set(MODELS) - set(DEFAULT_PROFILES)
+        assert not missing, f"Models without a simulator profile: {sorted(missing)}"
+        for endpoint, model in ENDPOINT_MODELS.items():
+            assert endpoint in MODELS[model].endpoints, f"Simulator assumes {model} on {endpoint}"
+            assert ENDPOINT_DEFAULT_MODELS.get(endpoint, model) == model, f"Simulator default for {endpoint} differs from the registry"
+        print_success("Every registry model has a timing profile and endpoint defaults match the registry")
+    except Exception as e:
+        print_failure(f"Simulator profile check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    async def simulator_mode():
+        originals = (server.RUNWAY_SIMULATOR, server.RUNWAY_API_KEY, server._simulator, server._shared_client)
+        server.RUNWAY_SIMULATOR, server.RUNWAY_API_KEY = True, ""
+        # Finish before the first poll so the test does not wait out the polling schedule
+        instant = {"gen4_image": {"queue_time": 0, "run_time": 0.001, "jitter": 0}}
+        server._simulator, server._shared_client = make_simulator(models=instant), None
+        try:
+            client = server.get_client()
+            assert client.task_store is None, "Simulated tasks must not be persisted"
+            result = json.loads(await server.generate_image_gen4("a red fox", wait_for_completion=True))
+            info = json.loads(await server.get_api_info())
+            await client.aclose()
+            return result, info
+        finally:
+            server.RUNWAY_SIMULATOR, server.RUNWAY_API_KEY, server._simulator, server._shared_client = originals
+    
+    try:
+        result, info = asyncio.run(simulator_mode())
+        assert result["status"] == "success", f"Tool failed in simulator mode: {result}"
+        assert result["image_url"].endswith(".png"), "Image outputs should be PNG files"
+        assert info["simulator"] is True and info["api_configured"] is True, "get_api_info should report simulator mode"
+        print_success("RUNWAY_SIMULATOR serves tool calls without an API key")
+    except Exception as e:
+        print_failure(f"Simulator mode check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_pipeline():
+    """Test 24: Verify run_pipeline chains stage outputs and overlaps items"""
+    print_test_header("TEST 24: Multi-Stage Pipeline")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.ratelimit import RateLimiter
+    
+    all_passed = True
+    created = []
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            body = json.loads(request.content)
+            if body.get("promptText") == "explode":
+                return httpx.Response(400, json={"error": "bad prompt"})
+            # Every task takes a little while to create, so overlap shows up in the timings
+            await asyncio.sleep(0.02)
+            task_id = f"task-{len(created)}"
+            created.append((request.url.path, body))
+            return httpx.Response(200, json={"id": task_id})
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": [f"https://out/{task_id}"]})
+    
+    async def run(**kwargs):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        server._shared_client.rate_limiter = RateLimiter(1000, 100, 1000, 100)
+        try:
+            return json.loads(await server.run_pipeline(**kwargs))
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        result = asyncio.run(run(
+            items=[
+                {"prompt_text": "a lighthouse"},
+                {"prompt_text": "a fox", "prompts": {"animate": "the fox looks up"}},
+                {"prompt_text": "explode"},
+            ],
+            stages=[
+                {"type": "image", "model": "gen4_image_turbo"},
+                {"type": "image_to_video", "name": "animate", "duration": 5},
+                {"type": "upscale"},
+            ],
+        ))
+        assert result["status"] == "partial" and result["succeeded"] == 2, f"Unexpected status: {result['status']}"
+        by_path = {}
+        for path, body in created:
+            by_path.setdefault(path.rsplit("/", 1)[-1], []).append(body)
+        outputs = {r["stages"][0]["output_url"] for r in result["results"][:2]}
+        assert {b["promptImage"] for b in by_path["image_to_video"]} == outputs, "Image outputs not passed to the video stage"
+        assert "the fox looks up" in {b.get("promptText") for b in by_path["image_to_video"]}, "Per-stage prompt override ignored"
+        videos = {r["stages"][1]["output_url"] for r in result["results"][:2]}
+        assert {b["promptVideo"] for b in by_path["upscale"]} == videos, "Video outputs not passed to the upscale stage"
+        print_success("Each stage's output feeds the next stage inside the server")
+        
+        failed = result["results"][2]
+        assert failed["status"] == "error" and len(failed["stages"]) == 1, "Failing item should stop at its stage"
+        assert [t["completed"] for t in result["stage_timings"]] == [2, 2, 2], "Bad per-stage timing summary"
+        assert result["elapsed_seconds"] < result["sequential_seconds"], "Items should overlap across stages"
+        print_success(f"Items overlap: {result['elapsed_seconds']}s vs {result['sequential_seconds']}s sequential")
+        
+        invalid = asyncio.run(run(items=[{"prompt_text": "x"}], stages=[{"type": "teleport"}]))
+        assert invalid["status"] == "error" and "teleport" in invalid["error"], "Unknown stage types should be rejected"
+        print_success("Unknown stage types are rejected up front")
+        
+        created.clear()
+        with tempfile.NamedTemporaryFile(suffix=".png") as image:
+            ignored = asyncio.run(run(items=[{"prompt_text": "a cat", "input": image.name}], stages=[{"type": "image"}]))
+        assert ignored["status"] == "success", f"Unexpected result: {ignored}"
+        assert [path for path, _ in created] == ["/v1/images"], f"An input the first stage ignores was uploaded: {created}"
+        print_success("Inputs are only uploaded for stages that use them")
+    except Exception as e:
+        print_failure(f"Pipeline check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_storyboard():
+    """Test 25: Verify generate_storyboard fans transitions out concurrently and keeps their order"""
+    print_test_header("TEST 25: Storyboard Fan-Out")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import tempfile
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.ratelimit import RateLimiter
+    
+    all_passed = True
+    state = {"in_flight": 0, "peak": 0, "uploads": 0}
+    bodies = {}
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/uploads"):
+            state["uploads"] += 1
+            return httpx.Response(200, json={"uploadUrl": "https://upload.test/", "fields": {}, "runwayUri": f"runway://upload-{state['uploads']}"})
+        if request.url.host == "upload.test":
+            return httpx.Response(204)
+        if request.method == "POST":
+            body = json.loads(request.content)
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            # Later transitions finish first, so ordering has to come from the tool
+            await asyncio.sleep(0.05 - 0.01 * len(bodies))
+            task_id = f"task-{len(bodies)}"
+            bodies[task_id] = body
+            state["in_flight"] -= 1
+            if body.get("promptText") == "explode":
+                return httpx.Response(400, json={"error": "bad prompt"})
+            return httpx.Response(200, json={"id": task_id})
+        task_id = path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": [f"https://out/{task_id}.mp4"]})
+    
+    async def run(**kwargs):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        server._shared_client.rate_limiter = RateLimiter(1000, 100, 1000, 100)
+        try:
+            return json.loads(await server.generate_storyboard(**kwargs))
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            local = os.path.join(tmp, "middle.png")
+            with open(local, "wb") as f:
+                f.write(b"\x89PNG fake")
+            keyframes = ["https://k/0.png", local, "https://k/2.png", "https://k/3.png", "https://k/4.png"]
+            result = asyncio.run(run(keyframes=keyframes, prompts=["push in", None, "pan left"], max_concurrency=3))
+        
+        assert result["status"] == "success" and result["total"] == 4, f"Unexpected result: {result}"
+        assert [c["index"] for c in result["clips"]] == [0, 1, 2, 3], "Clips out of order"
+        assert state["peak"] == 3, f"Concurrency cap not applied (peak {state['peak']})"
+        assert state["uploads"] == 1, "A keyframe shared by two transitions should be uploaded once"
+        first, second = bodies[result["clips"][0]["task_id"]], bodies[result["clips"][1]["task_id"]]
+        assert first["lastFrame"] == second["firstFrame"] == "runway://upload-1", "Transitions should share keyframes"
+        assert first["promptText"] == "push in" and "promptText" not in second, "Prompts not matched to transitions"
+        assert result["elapsed_seconds"] < result["sequential_seconds"], "Transitions should run concurrently"
+        print_success(f"4 transitions in {result['elapsed_seconds']}s (vs {result['sequential_seconds']}s back to back)")
+        
+        partial = asyncio.run(run(keyframes=["https://a", "https://b", "https://c"], prompts=["fine", "explode"]))
+        assert partial["status"] == "partial" and partial["clips"][1]["status"] == "error", "Failed transition not reported"
+        too_short = asyncio.run(run(keyframes=["https://a"]))
+        assert too_short["status"] == "error", "A single keyframe should be rejected"
+        print_success("Failed transitions are reported per clip and bad input is rejected")
+        
+        from runway_mcp_server.cache import ResultCache
+        original_cache = server._result_cache
+        server._result_cache = ResultCache()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                frames = []
+                for name in ("a.png", "b.png", "c.png"):
+                    frames.append(os.path.join(tmp, name))
+                    with open(frames[-1], "wb") as f:
+                        f.write(name.encode())
+                state["uploads"] = 0
+                asyncio.run(run(keyframes=frames, seed=11))
+                first_uploads = state["uploads"]
+                cached = asyncio.run(run(keyframes=frames, seed=11))
+        finally:
+            server._result_cache = original_cache
+        assert first_uploads == 3, f"Expected one upload per keyframe, got {first_uploads}"
+        assert all(c["cached"] for c in cached["clips"]) and state["uploads"] == 3, "A cached storyboard uploaded its keyframes again"
+        print_success("A cached seeded storyboard uploads nothing")
+    except Exception as e:
+        print_failure(f"Storyboard check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_cold_start():
+    """Test 26: Verify heavy modules load lazily and startup stays within budget"""
+    print_test_header("TEST 26: Cold Start")
+    
+    sys.path.insert(0, str(Path("benchmarks")))
+    
+    import subprocess
+    import startup
+    
+    all_passed = True
+    
+    def loaded_modules(statement):
+        probe = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+        output = subprocess.run(
+            [sys.executable, "-c", probe], env=startup.child_env(), capture_output=True, text=True, check=True
+        ).stdout
+        return set(output.split())
+    
+    try:
+        package = loaded_modules("import runway_mcp_server")
+        assert not {"mcp", "httpx", "dotenv", "runway_mcp_server.server"} & package, "Package import should stay lightweight"
+        print_success("import runway_mcp_server loads neither the MCP SDK nor httpx")
+        
+        server_modules = loaded_modules("import runway_mcp_server.server")
+        assert "sqlite3" not in server_modules, "SQLite should load with the task store, not at import"
+        assert "runway_mcp_server.simulator" not in server_modules, "The simulator should load only in simulator mode"
+        lazy = loaded_modules("from runway_mcp_server import mcp")
+        assert "runway_mcp_server.server" in lazy, "Package attributes should still resolve the server"
+        print_success("Task store and simulator load on first use")
+        
+        elapsed = startup.time_first_tool_list()
+        print_success(f"First tools/list answered {elapsed:.0f} ms after spawn")
+        
+        results = {"first_tool_list": {"median_ms": elapsed}, "package_import": {"median_ms": 80.0}}
+        failures = startup.over_budget(results, {"first_tool_list": elapsed + 1, "package_import": 50})
+        assert failures == ["package_import: median 80.0 ms > budget 50 ms"], f"Unexpected budget check: {failures}"
+        print_success("Startup budgets flag regressions")
+    except Exception as e:
+        print_failure(f"Cold start check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_capability_registry():
+    """Test 27: Verify invalid requests are rejected locally from the capability registry"""
+    print_test_header("TEST 27: Capability Registry")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import time
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.capabilities import MODELS, RequestValidationError, validate_request
+    
+    all_passed = True
+    sent = []
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.path)
+        return httpx.Response(200, json={"id": "task-1", "status": "SUCCEEDED", "output": ["https://out/1"]})
+    
+    async def call(tool, *args, **kwargs):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            return await tool(*args, **kwargs)
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        bad_requests = {
+            "veo duration": ("/text_to_video", {"model": "veo3.1", "promptText": "waves", "ratio": "1280:720", "duration": 5}),
+            "veo ratio": ("/text_to_video", {"model": "veo3", "promptText": "waves", "ratio": "1104:832", "duration": 4}),
+            "aleph ratio": ("/video_to_video", {"model": "gen4_aleph", "videoUri": "https://v", "promptText": "x", "ratio": "1920:1080"}),
+            "wrong endpoint": ("/text_to_video", {"model": "gen4_aleph", "promptText": "waves"}),
+            "oversized data URI": ("/image_to_video", {
+                "model": "gen4_turbo", "promptImage": "data:image/png;base64," + "A" * (6 * 1024 * 1024), "duration": 5
+            }),
+            "long prompt": ("/images", {"model": "gen4_image", "promptText": "x" * 1001, "ratio": "1920:1080"}),
+        }
+        for label, (endpoint, data) in bad_requests.items():
+            try:
+                validate_request(endpoint, data)
+            except RequestValidationError:
+                continue
+            raise AssertionError(f"{label} was not rejected")
+        
+        validate_request("/text_to_video", {"model": "veo3.1", "promptText": "waves", "ratio": "1280:720", "duration": 8})
+        validate_request("/upscale", {"promptVideo": "https://v"})
+        validate_request("/unknown", {"anything": True})
+        print_success("Bad durations, ratios, endpoints, prompts and data URIs are rejected; valid ones pass")
+        
+        started = time.perf_counter()
+        for _ in range(1000):
+            try:
+                validate_request(*bad_requests["veo duration"])
+            except RequestValidationError:
+                pass
+        per_call_us = (time.perf_counter() - started) * 1000
+        assert per_call_us < 100, f"Validation took {per_call_us:.1f} us per request"
+        print_success(f"Rejection takes {per_call_us:.1f} us per request")
+    except Exception as e:
+        print_failure(f"Registry validation check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    try:
+        try:
+            asyncio.run(call(server.generate_video_text_to_video, "waves", ratio="1104:832"))
+            raise AssertionError("Tool accepted an unsupported ratio")
+        except RequestValidationError as e:
+            assert "1104:832" in str(e), f"Error does not name the bad value: {e}"
+        storyboard = json.loads(asyncio.run(call(server.generate_storyboard, ["a.png", "b.png"], duration=7)))
+        assert storyboard["status"] == "error" and "duration 7" in storyboard["error"], f"Storyboard not rejected: {storyboard}"
+        assert not sent, f"Invalid requests reached the network: {sent}"
+        print_success("Tools fail fast without sending any request")
+        
+        valid = json.loads(asyncio.run(call(server.generate_video_text_to_video, "waves")))
+        assert valid["status"] == "success" and sent, "A valid request should still be submitted"
+        print_success("Valid tool calls are still submitted")
+        
+        advertised = server.list_models()
+        schema = {tool.name: tool.inputSchema["properties"] for tool in asyncio.run(server.mcp.list_tools())}
+        assert schema["generate_image_gen4"]["ratio"]["enum"] == advertised["image_generation"]["gen4_image"]["ratios"], "Image ratios differ from the registry"
+        assert set(advertised["video_generation"]["veo3.1"]["ratios"]) == set(schema["generate_video_text_to_video"]["ratio"]["enum"]), "Veo ratios differ from the registry"
+        sent.clear()
+        asyncio.run(call(server.mcp.call_tool, "generate_image_gen4", {"prompt_text": "a fox", "ratio": "1360:768"}))
+        asyncio.run(call(server.mcp.call_tool, "generate_video_text_to_video", {"prompt_text": "waves", "ratio": "1920:1080"}))
+        assert sent.count("/v1/images") == 1 and sent.count("/v1/text_to_video") == 1, f"Advertised ratios were rejected: {sent}"
+        print_success("Tools accept every ratio list_available_models advertises")
+    except Exception as e:
+        print_failure(f"Tool validation check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    try:
+        listed = json.loads(asyncio.run(server.list_available_models()))
+        for name, capabilities in MODELS.items():
+            entry = listed[capabilities.category][name]
+            assert entry["ratios"] == list(capabilities.ratios), f"{name} ratios differ from the registry"
+            assert entry["durations"] == list(capabilities.durations), f"{name} durations differ from the registry"
+        assert listed["video_generation"]["veo3.1"]["durations"] == [4, 6, 8], "Veo durations missing"
+        print_success("list_available_models is generated from the registry")
+    except Exception as e:
+        print_failure(f"Model listing check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_response_serialization():
+    """Test 28: Verify compact responses, field selection and cached static responses"""
+    print_test_header("TEST 28: Response Serialization")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.serialization import ResponseEncoder, orjson
+    
+    all_passed = True
+    
+    try:
+        result = {"status": "success", "task_id": "t1", "clips": [{"status": "success", "video_url": "u", "cached": False}]}
+        compact, pretty = ResponseEncoder(), ResponseEncoder(pretty=True)
+        assert compact.encode(result) == json.dumps(result, separators=(",", ":")), "Default encoding is not compact"
+        assert json.loads(pretty.encode(result)) == result and "\n  " in pretty.encode(result), "Pretty encoding not indented"
+        assert len(compact.encode(result)) < len(json.dumps(result, indent=2)), "Compact output is not smaller"
+        if orjson is not None:
+            assert ResponseEncoder(backend="json").encode(result) == ResponseEncoder(backend="orjson").encode(result), "Backends disagree"
+            print_success("Compact by default; orjson and json backends emit the same text")
+        else:
+            print_success("Compact by default (orjson not installed)")
+        
+        selected = json.loads(compact.encode(result, ["clips.video_url"]))
+        assert selected == {"status": "success", "clips": [{"status": "success", "video_url": "u"}]}, f"Bad selection: {selected}"
+        print_success("Dotted field selection keeps status in every object")
+        
+        calls = []
+        def build():
+            calls.append(1)
+            return {"models": ["a"]}
+        first, second = compact.static("m", build), compact.static("m", build)
+        assert first is second and len(calls) == 1, "Static response was serialized more than once"
+        for i in range(20):
+            compact.static("m", build, fields=[f"field_{i}"])
+        assert json.loads(compact.static("m", build, fields=["models"])) == {"models": ["a"]}, "Selection from the cached response failed"
+        assert len(calls) == 1 and len(compact._static) == 1, "Field selections grew the static cache"
+        models = json.loads(asyncio.run(server.list_available_models(fields=["video_editing"])))
+        assert list(models) == ["video_editing"], f"list_available_models ignored fields: {list(models)}"
+        print_success("Static responses are built and serialized once")
+    except Exception as e:
+        print_failure(f"Encoder check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": "task-1"})
+        return httpx.Response(200, json={"id": "task-1", "status": "SUCCEEDED", "output": ["https://out/1.mp4"]})
+    
+    async def call_tool():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        try:
+            return await server.generate_video_text_to_video("waves", fields=["video_url"])
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        text = asyncio.run(call_tool())
+        assert json.loads(text) == {"status": "success", "video_url": "https://out/1.mp4"}, f"Unexpected tool result: {text}"
+        assert "\n" not in text, "Tool response is not compact"
+        print_success(f"Tool result trimmed to {len(text)} bytes")
+    except Exception as e:
+        print_failure(f"Tool field selection check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_api_key_pool():
+    """Test 29: Verify the API key pool balances, cools down and pins tasks to their key"""
+    print_test_header("TEST 29: API Key Pool")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import tempfile
+    import itertools
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.keypool import KeyPool, key_id
+    from runway_mcp_server.ratelimit import RateLimiter
+    from runway_mcp_server.task_store import TaskStore
+    
+    all_passed = True
+    
+    try:
+        pool = KeyPool(["a", "b", "c", "a"], {})
+        assert len(pool) == 3, "Duplicate keys were not removed"
+        pool.pin("t1", pool.keys[0])
+        pool.pin("t2", pool.keys[1])
+        assert pool.choose() is pool.keys[2], "New work did not go to the idle key"
+        pool.finished("t1")
+        assert pool.choose() in (pool.keys[0], pool.keys[2]), "Finished task still counted as in flight"
+        pool.cool_down(pool.keys[0], 60)
+        assert all(pool.choose() is pool.keys[2] for _ in range(5)), "Cooling key was chosen while others were free"
+        assert pool.for_task("t2") is pool.keys[1] and pool.for_task("unknown") is pool.primary, "Bad task pinning"
+        pool.pin_by_id("t3", key_id("c"))
+        assert pool.for_task("t3") is pool.keys[2], "Stored key fingerprint was not re-pinned"
+        print_success("Least in-flight selection, cool-down and pinning")
+    except Exception as e:
+        print_failure(f"Key pool check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    ids = itertools.count(1)
+    owners = {}
+    seen = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = request.headers["Authorization"].split()[-1]
+        seen.append((request.method, request.url.path, key))
+        if request.method == "POST" and not request.url.path.endswith("/cancel"):
+            if key == "key-1":
+                return httpx.Response(429, headers={"Retry-After": "30"}, json={"error": "Too many tasks"})
+            task_id = f"task-{next(ids)}"
+            owners[task_id] = key
+            return httpx.Response(200, json={"id": task_id})
+        task_id = request.url.path.split("/")[3]
+        if owners.get(task_id) != key:
+            return httpx.Response(404, json={"error": "Task not found"})
+        if request.url.path.endswith("/cancel"):
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": ["https://out"]})
+    
+    async def run_pool(path):
+        store = TaskStore(path, flush_interval=0.01)
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = server.RunwayAPIClient("key-1", http_client=http, task_store=store, extra_api_keys=["key-2", "key-3"])
+        client.rate_limiter = RateLimiter(1000, 100, 1000, 100)
+        tasks = [await client.create_task("/images", {"promptText": f"image {i}"}) for i in range(4)]
+        in_flight = {k["key"]: k["in_flight"] for k in client.keys.stats()}
+        await asyncio.gather(*(client.wait_for_task(t["id"], poll_interval=0.001) for t in tasks[:3]))
+        await client.cancel_task(tasks[3]["id"])
+        stats = client.keys.stats()
+        await client.aclose()
+        await store.aclose()
+        await http.aclose()
+        return tasks, in_flight, stats
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "tasks.db")
+            tasks, in_flight, stats = asyncio.run(run_pool(path))
+            store = TaskStore(path)
+            stored = {t["id"]: store.get(t["id"])["api_key_id"] for t in tasks}
+            asyncio.run(store.aclose())
+        
+        creators = [owners[t["id"]] for t in tasks]
+        assert sorted(creators) == ["key-2", "key-2", "key-3", "key-3"], f"Creates were not balanced: {creators}"
+        assert in_flight == {key_id("key-1"): 0, key_id("key-2"): 2, key_id("key-3"): 2}, f"Bad in-flight counts: {in_flight}"
+        creates_on_key_1 = [s for s in seen if s[0] == "POST" and s[2] == "key-1"]
+        assert len(creates_on_key_1) == 1, f"Throttled key was used again during its cool-down: {creates_on_key_1}"
+        print_success("A throttled key cools down and creates move to the least busy keys")
+        
+        task_requests = [(path.split("/")[3], key) for _, path, key in seen if path.startswith("/v1/tasks/")]
+        assert len(task_requests) >= 4, f"Expected polls and a cancel: {task_requests}"
+        assert all(owners[task_id] == key for task_id, key in task_requests), "A poll or cancel used the wrong key"
+        assert all(k["in_flight"] == 0 for k in stats), f"Finished tasks still in flight: {stats}"
+        assert stored == {t["id"]: key_id(owners[t["id"]]) for t in tasks}, "Task store did not record the creating key"
+        print_success("Polls and cancels use the creating key; finished tasks free their key")
+    except Exception as e:
+        print_failure(f"Pooled client check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    throttled_polls = []
+    
+    def pinned_handler(request: httpx.Request) -> httpx.Response:
+        key = request.headers["Authorization"].split()[-1]
+        task_id = request.url.path.split("/")[3]
+        # The first poll on key-1 is throttled; key-2 is never throttled
+        if key == "key-1" and not throttled_polls:
+            throttled_polls.append(task_id)
+            return httpx.Response(429, headers={"Retry-After": "0.3"})
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": ["https://out"]})
+    
+    async def throttled_poll():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(pinned_handler))
+        client = server.RunwayAPIClient("key-1", http_client=http, extra_api_keys=["key-2"])
+        client.keys.pin("task-a", client.keys.keys[0])
+        client.keys.pin("task-b", client.keys.keys[1])
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        async def timed(task_id):
+            await client.get_task(task_id)
+            return loop.time() - started
+        
+        times = await asyncio.gather(timed("task-a"), timed("task-b"))
+        stats = client.rate_limiter.stats()["poll"]
+        await client.aclose()
+        await http.aclose()
+        return times, stats
+    
+    try:
+        (slow, fast), poll_stats = asyncio.run(throttled_poll())
+        assert slow >= 0.3, "The throttled key did not wait out its cool-down"
+        assert fast < 0.2, f"Polls on another key waited for the throttled key ({fast:.2f}s)"
+        assert poll_stats["throttled"] == 0, "One throttled key paused polling for the whole pool"
+        print_success("A 429 on a pinned poll cools down only that task's key")
+    except Exception as e:
+        print_failure(f"Pinned throttling check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_scheduler():
+    """Test 30: Verify scheduler lanes, priorities, session fairness and queue-wait metrics"""
+    print_test_header("TEST 30: Priority Scheduler")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.scheduler import Scheduler, parse_lane_limits
+    from runway_mcp_server.capabilities import lane_for
+    
+    all_passed = True
+    
+    async def lanes_and_priorities():
+        scheduler = Scheduler({"aleph": 2, "gen4": 2}, interactive_reserve=1)
+        # A bulk backlog fills the aleph lane as far as bulk work may
+        await scheduler.acquire("aleph", "bulk", "batch")
+        blocked = asyncio.ensure_future(scheduler.acquire("aleph", "bulk", "batch"))
+        await asyncio.sleep(0)
+        assert not blocked.done(), "Bulk work took the interactive reserve"
+        # Another lane and the reserved slot are both free for interactive calls
+        assert await scheduler.acquire("gen4", "interactive", "user") == 0.0, "gen4 waited behind the aleph lane"
+        assert await scheduler.acquire("aleph", "interactive", "user") == 0.0, "Interactive call could not use the reserve"
+        
+        late = asyncio.ensure_future(scheduler.acquire("aleph", "interactive", "user"))
+        await asyncio.sleep(0)
+        scheduler.release("aleph", "bulk")
+        await asyncio.sleep(0)
+        assert late.done() and not blocked.done(), "Queued interactive call did not start before queued bulk work"
+        stats = scheduler.stats()["aleph"]
+        assert stats["running"] == 2 and stats["queued_bulk"] == 1, f"Bad lane stats: {stats}"
+        blocked.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.queued == 0, "Cancelled waiter is still queued"
+    
+    async def fairness():
+        scheduler = Scheduler({}, default_limit=1, interactive_reserve=0)
+        order = []
+        
+        async def job(session, name):
+            async with scheduler.slot("gen4", "bulk", session):
+                order.append(name)
+                await asyncio.sleep(0.001)
+        
+        await asyncio.gather(job("a", "a1"), job("a", "a2"), job("a", "a3"), job("a", "a4"), job("b", "b1"), job("b", "b2"))
+        return order
+    
+    try:
+        asyncio.run(lanes_and_priorities())
+        assert parse_lane_limits("gen4=8, veo=4") == {"gen4": 8, "veo": 4}, "Lane limits not parsed"
+        assert (lane_for("/images", "gen4_image"), lane_for("/text_to_video", "veo3.1"), lane_for("/video_to_video", "gen4_aleph"), lane_for("/upscale")) == ("gen4", "veo", "aleph", "upscale"), "Wrong lane for model family"
+        print_success("Lanes are independent; interactive calls skip the bulk queue and keep a reserved slot")
+        
+        order = asyncio.run(fairness())
+        assert order == ["a1", "a2", "b1", "a3", "b2", "a4"], f"Sessions did not take turns: {order}"
+        print_success("Sessions take turns within a priority")
+    except Exception as e:
+        print_failure(f"Scheduler check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    created = []
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            await asyncio.sleep(0.01)
+            created.append(request)
+            return httpx.Response(200, json={"id": f"task-{len(created)}"})
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": ["https://out"]})
+    
+    async def tools():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        client.scheduler = Scheduler({"veo": 1}, interactive_reserve=0)
+        try:
+            await asyncio.gather(*(server.generate_video_text_to_video(f"waves {i}") for i in range(3)))
+            return client.metrics.snapshot()["histograms"]["runway_queue_wait_seconds"], json.loads(await server.get_api_info())
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        waits, info = asyncio.run(tools())
+        series = waits[0]
+        assert series["labels"] == {"lane": "veo", "priority": "interactive"} and series["count"] == 3, f"Bad wait series: {series}"
+        assert series["sum"] > 0, "Queued tool calls recorded no wait"
+        assert info["scheduler"]["veo"]["limit"] == 1, "get_api_info does not report lanes"
+        print_success("Queue wait is recorded per lane and priority")
+    except Exception as e:
+        print_failure(f"Scheduler metrics check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    finished = set()
+    submitted = []
+    
+    def lazy_handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/cancel"):
+            return httpx.Response(200, json={})
+        if request.method == "POST":
+            submitted.append(request)
+            return httpx.Response(200, json={"id": f"task-{len(submitted)}"})
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        status = "SUCCEEDED" if task_id in finished else "RUNNING"
+        return httpx.Response(200, json={"id": task_id, "status": status, "output": ["https://out"]})
+    
+    async def submit_without_waiting():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(lazy_handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        client.scheduler = Scheduler({"veo": 1}, interactive_reserve=0)
+        # Skip the real polling schedule so the test runs quickly
+        original_wait = client.poller.wait
+        client.poller.wait = lambda task_id, **kwargs: original_wait(task_id, **dict(kwargs, poll_interval=0.01))
+        counts = []
+        try:
+            calls = [asyncio.ensure_future(server.generate_video_text_to_video(f"waves {i}", wait_for_completion=False)) for i in range(5)]
+            await asyncio.sleep(0.05)
+            counts.append(len(submitted))
+            finished.add("task-1")
+            await asyncio.sleep(0.05)
+            counts.append(len(submitted))
+            # A cancelled task frees its slot without waiting for the next poll
+            await server.cancel_task("task-2")
+            await asyncio.sleep(0.05)
+            counts.append(len(submitted))
+            for call in calls:
+                call.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+            return counts
+        finally:
+            await client.aclose()
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    try:
+        counts = asyncio.run(submit_without_waiting())
+        assert counts == [1, 2, 3], f"Tasks started without waiting did not hold their lane slot: {counts}"
+        print_success("Tasks started without waiting hold their slot until they finish or are cancelled")
+    except Exception as e:
+        print_failure(f"Held slot check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_wait_for_tasks():
+    """Test 31: Verify wait_for_tasks returns tasks in completion order with a deadline"""
+    print_test_header("TEST 31: Waiting on Many Tasks")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    
+    all_passed = True
+    
+    # Polls each task needs before it finishes; "stuck" never does
+    finish_after = {"fast": 2, "broken": 3, "mid": 4, "slow": 6}
+    polls = {}
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        polls[task_id] = polls.get(task_id, 0) + 1
+        if polls[task_id] < finish_after.get(task_id, float("inf")):
+            return httpx.Response(200, json={"id": task_id, "status": "RUNNING"})
+        if task_id == "broken":
+            return httpx.Response(200, json={"id": task_id, "status": "FAILED", "failure": "bad prompt"})
+        return httpx.Response(200, json={"id": task_id, "status": "SUCCEEDED", "output": [f"https://out/{task_id}"]})
+    
+    async def wait(*calls):
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        original_key, original_client = server.RUNWAY_API_KEY, server._shared_client
+        server.RUNWAY_API_KEY = "test-key"
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        # Skip the real polling schedule so the test runs quickly
+        original_wait = client.poller.wait
+        client.poller.wait = lambda task_id, **kwargs: original_wait(task_id, **dict(kwargs, poll_interval=0.01))
+        try:
+            results = []
+            for kwargs in calls:
+                polls.clear()
+                results.append(json.loads(await server.wait_for_tasks(**kwargs)))
+            return results, client.poller.watched
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client = original_key, original_client
+            await http.aclose()
+    
+    ids = ["slow", "mid", "fast", "broken", "fast"]
+    try:
+        (every, first, first_two), watched = asyncio.run(wait(
+            dict(task_ids=ids, mode="all"),
+            dict(task_ids=ids, mode="any"),
+            dict(task_ids=ids, mode="first_n", count=2),
+        ))
+        assert every["status"] == "complete" and every["pending"] == [], f"Not every task finished: {every}"
+        assert [t["task_id"] for t in every["completed"]] == ["fast", "broken", "mid", "slow"], f"Wrong completion order: {every['completed']}"
+        assert every["completed"][1]["status"] == "FAILED" and every["completed"][1]["failure"] == "bad prompt", "Failed task not reported"
+        assert every["completed"][0]["output"] == ["https://out/fast"], "Output missing"
+        print_success("mode=all returns every task in completion order, failures included")
+        
+        assert [t["task_id"] for t in first["completed"]] == ["fast"] and first["status"] == "complete", f"mode=any: {first}"
+        assert [t["task_id"] for t in first_two["completed"]] == ["fast", "broken"], f"mode=first_n: {first_two}"
+        assert first_two["pending"] == ["slow", "mid"], "Pending tasks not listed"
+        assert watched == 0, "Abandoned waits are still being polled"
+        print_success("mode=any and first_n return early and stop polling the rest")
+        
+        (late,), _ = asyncio.run(wait(dict(task_ids=["fast", "stuck"], timeout=0.3)))
+        assert late["status"] == "timeout" and late["pending"] == ["stuck"], f"Deadline not applied: {late}"
+        assert [t["task_id"] for t in late["completed"]] == ["fast"], "Finished task lost on timeout"
+        
+        (bad,), _ = asyncio.run(wait(dict(task_ids=["fast"], mode="first_n", count=3)))
+        assert bad["status"] == "error", "Invalid count accepted"
+        print_success("The deadline returns what has finished and lists the rest as pending")
+    except Exception as e:
+        print_failure(f"wait_for_tasks check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
+def test_cancel_abandoned():
+    """Test 32: Verify abandoned tasks are cancelled on Runway and free their lane slot"""
+    print_test_header("TEST 32: Cancelling Abandoned Tasks")
+    
+    sys.path.insert(0, str(Path("src")))
+    
+    import asyncio
+    import json
+    import httpx
+    from runway_mcp_server import server
+    from runway_mcp_server.scheduler import Scheduler
+    
+    all_passed = True
+    
+    created = []
+    cancelled = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/cancel"):
+            cancelled.append(request.url.path.split("/")[-2])
+            return httpx.Response(200, json={})
+        if request.method == "POST":
+            created.append(request)
+            return httpx.Response(200, json={"id": f"task-{len(created)}"})
+        task_id = request.url.path.rsplit("/", 1)[-1]
+        # Tasks never finish on their own
+        return httpx.Response(200, json={"id": task_id, "status": "RUNNING", "progress": 0.1})
+    
+    async def scenario(body, **policy):
+        created.clear()
+        cancelled.clear()
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        originals = (server.RUNWAY_API_KEY, server._shared_client, server.RUNWAY_CANCEL_ON_ABORT, server.RUNWAY_CANCEL_ON_TIMEOUT, server.RUNWAY_CANCEL_GRACE)
+        server.RUNWAY_API_KEY = "test-key"
+        server.RUNWAY_CANCEL_ON_ABORT = policy.get("on_abort", True)
+        server.RUNWAY_CANCEL_ON_TIMEOUT = policy.get("on_timeout", False)
+        server.RUNWAY_CANCEL_GRACE = policy.get("grace", 0)
+        client = server._shared_client = server.RunwayAPIClient("test-key", http_client=http)
+        client.scheduler = Scheduler({"veo": policy.get("lane_limit", 1)}, interactive_reserve=0)
+        # Skip the real polling schedule so the test runs quickly
+        original_wait = client.poller.wait
+        client.poller.wait = lambda task_id, **kwargs: original_wait(task_id, **dict(kwargs, poll_interval=0.01))
+        try:
+            result = await body(client)
+            await asyncio.gather(*client._cancelling)
+            return client, result
+        finally:
+            server.RUNWAY_API_KEY, server._shared_client, server.RUNWAY_CANCEL_ON_ABORT, server.RUNWAY_CANCEL_ON_TIMEOUT, server.RUNWAY_CANCEL_GRACE = originals
+            await http.aclose()
+    
+    async def abort_while_another_queues(client):
+        first = asyncio.ensure_future(server.generate_video_text_to_video("waves"))
+        second = asyncio.ensure_future(server.generate_video_text_to_video("dunes"))
+        await asyncio.sleep(0.05)
+        queued = len(created)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        status = json.loads(await server.get_task_status("task-1"))
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        return queued, len(created), status
+    
+    async def time_out(client):
+        try:
+            await server.run_generation(client, "/text_to_video", {"promptText": "waves", "model": "veo3.1"}, True, max_wait=0.05)
+        except TimeoutError:
+            return True
+        return False
+    
+    async def abort_shared(client):
+        # Only seeded requests are coalesced
+        calls = [asyncio.ensure_future(server.generate_image_gen4("waves", seed=7)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        calls[0].cancel()
+        await asyncio.gather(calls[0], return_exceptions=True)
+        shared_cancels = len(cancelled)
+        calls[1].cancel()
+        await asyncio.gather(calls[1], return_exceptions=True)
+        return shared_cancels
+    
+    async def shut_down_mid_call(client):
+        from mcp import ClientSession
+        from mcp.shared.memory import create_client_server_memory_streams
+        lowlevel = server.mcp._mcp_server
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            running = asyncio.ensure_future(lowlevel.run(*server_streams, lowlevel.create_initialization_options()))
+            async with ClientSession(*client_streams) as session:
+                await session.initialize()
+                call = asyncio.ensure_future(session.call_tool("generate_video_text_to_video", {"prompt_text": "waves"}))
+                await asyncio.sleep(0.1)
+                started = len(created)
+            call.cancel()
+            await asyncio.gather(call, return_exceptions=True)
+        # The transport is closed: the server cancels the call and its lifespan closes the client
+        await running
+        client.abandon("task-late", "aborted")
+        return started, client._http, len(client._cancelling)
+    
+    try:
+        client, (queued, started, status) = asyncio.run(scenario(abort_while_another_queues))
+        assert queued == 1 and started == 2, f"Queued work did not take the freed slot ({queued} -> {started} created)"
+        assert cancelled == ["task-1", "task-2"], f"Aborted calls did not cancel their tasks: {cancelled}"
+        assert status["status"] == "CANCELLED", f"Cancellation not recorded: {status}"
+        assert client.metrics.value("runway_abandoned_tasks_total", reason="aborted", result="cancelled") == 2, "Cancellations not counted"
+        assert all(not k["in_flight"] for k in client.keys.stats()), "Cancelled tasks still count against their key"
+        print_success("A cancelled tool call cancels its task and its slot goes to queued work")
+        
+        client, _ = asyncio.run(scenario(abort_while_another_queues, on_abort=False))
+        assert cancelled == [], "Tasks cancelled with the policy switched off"
+        print_success("RUNWAY_CANCEL_ON_ABORT=false leaves tasks running")
+        
+        _, timed_out = asyncio.run(scenario(time_out))
+        assert timed_out and cancelled == [], "Timed out task cancelled by default"
+        _, timed_out = asyncio.run(scenario(time_out, on_timeout=True))
+        assert timed_out and cancelled == ["task-1"], "RUNWAY_CANCEL_ON_TIMEOUT did not cancel the task"
+        print_success("Timeouts cancel the task only when RUNWAY_CANCEL_ON_TIMEOUT is set")
+        
+        _, shared_cancels = asyncio.run(scenario(abort_shared, lane_limit=2))
+        assert len(created) == 1 and shared_cancels == 0, "A coalesced task was cancelled while another caller waited on it"
+        print_success("Tasks shared by coalesced creates are not cancelled for one caller")
+        
+        _, (started, http_after, late) = asyncio.run(scenario(shut_down_mid_call, grace=1))
+        assert started == 1 and cancelled == [], f"Server shutdown cancelled the running task: {cancelled}"
+        assert http_after is None and late == 0, "An abandon after close started a cancellation"
+        print_success("Calls cut off by a server shutdown leave their tasks running to be resumed")
+    except Exception as e:
+        print_failure(f"Abandoned task check failed: {e}")
+        all_passed = False
+        test_results["failed"] += 1
+    
+    if all_passed:
+        test_results["passed"] += 1
+    
+    return all_passed
+
+
 def print_summary():
     """Print final test summary"""
     print_test_header("TEST SUMMARY")
@@ -454,6 +2784,31 @@ def main():
     test_server_structure()
     test_documentation()
     test_type_safety()
+    test_shared_http_client()
+    test_polling_schedule()
+    test_task_poller()
+    test_image_batch()
+    test_rate_limiter()
+    test_retry_policy()
+    test_task_store()
+    test_result_cache()
+    test_create_coalescing()
+    test_streaming_upload()
+    test_output_downloads()
+    test_progress_updates()
+    test_server_metrics()
+    test_tracing()
+    test_benchmarks()
+    test_simulator()
+    test_pipeline()
+    test_storyboard()
+    test_cold_start()
+    test_capability_registry()
+    test_response_serialization()
+    test_api_key_pool()
+    test_scheduler()
+    test_wait_for_tasks()
+    test_cancel_abandoned()
     
     # Print summary
     print_summary()